@@ -5,23 +5,31 @@ Controls:
   - Left paddle: W (up), S (down)
   - Right paddle: Up Arrow, Down Arrow
   - P to pause, R to reset scores
+  - F3 to show frame timings (--profile-dump frames.csv saves them on exit)
+  - --balls N for party mode with N colliding balls (needs numpy, see pong_multiball.py)
   - Escape or close window to quit
 
 Requirements:
   - Python 3.8+
   - pygame (pip install pygame)
+  - numpy, only for --telemetry DIR (session logging, see telemetry.py)
 
 Run:
   python pong_game.py
 
-This is a single-file, self-contained implementation with basic sound effects (requires SDL mixer
-support available in pygame). It uses simple collision, scoring, and gradual speed increase.
+This is a single-file implementation with basic sound effects (synthesized by pong_audio.py; needs
+numpy and SDL mixer support in pygame, otherwise the game runs silently). It uses simple collision,
+scoring, and gradual speed increase.
 """
 
 import pygame
 import sys
 import random
 
+import frame_profiler
+import telemetry
+from loop_scheduler import LoopScheduler
+
 # ---- Configuration ----
 WIDTH, HEIGHT = 900, 600
 FPS = 60
@@ -107,21 +115,26 @@ class Ball:
 
 # ---- Sound helper ----
 SOUNDS = {}
+CHANNELS = None
 
 def load_sounds():
+    global CHANNELS
     try:
-        SOUNDS['paddle'] = pygame.mixer.Sound(pygame.mixer.Sound.get_length)
+        import pong_audio
+        SOUNDS.update(pong_audio.build_sounds())
+        CHANNELS = pong_audio.ChannelPool()
     except Exception:
-        # If loading real files isn't desired, we'll skip. Sound optional.
-        pass
+        # Sound is optional (needs numpy and a working mixer).
+        SOUNDS.clear()
+        CHANNELS = None
 
 
 def play_sound(name):
-    # Keep non-fatal: if sound present, play it. We intentionally keep this minimal.
+    # Keep non-fatal: if sound present, play it on the next reserved channel.
     s = SOUNDS.get(name)
-    if s:
+    if s is not None and CHANNELS is not None:
         try:
-            s.play()
+            CHANNELS.play(s)
         except Exception:
             pass
 
@@ -133,16 +146,39 @@ def draw_center_line(surface):
         pygame.draw.rect(surface, WHITE, (WIDTH // 2 - 1, y, 2, 12))
 
 
-def main():
+def draw_scores(surface, font, score_left, score_right):
+    left_surf = font.render(str(score_left), True, WHITE)
+    right_surf = font.render(str(score_right), True, WHITE)
+    surface.blit(left_surf, (WIDTH // 4 - left_surf.get_width() // 2, 20))
+    surface.blit(right_surf, (WIDTH * 3 // 4 - right_surf.get_width() // 2, 20))
+
+
+def parse_args(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Ping Pong')
+    parser.add_argument('--balls', type=int, default=1, help='party mode with this many balls (needs numpy)')
+    frame_profiler.add_arguments(parser)
+    telemetry.add_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    profiler = frame_profiler.from_args(args)
+    log = telemetry.from_args(args, 'pong')
+
     pygame.init()
     try:
         pygame.mixer.init()
+        load_sounds()
     except Exception:
         pass
 
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption('Ping Pong - Python (pygame)')
     clock = pygame.time.Clock()
+    scheduler = LoopScheduler(clock, FPS)
 
     # Score
     score_left = 0
@@ -152,6 +188,10 @@ def main():
     left_paddle = Paddle(30, (HEIGHT - PADDLE_HEIGHT) // 2)
     right_paddle = Paddle(WIDTH - 30 - PADDLE_WIDTH, (HEIGHT - PADDLE_HEIGHT) // 2)
     ball = Ball()
+    balls = None
+    if args.balls > 1:
+        import pong_multiball
+        balls = pong_multiball.MultiBall(args.balls, WIDTH, HEIGHT, BALL_SIZE, BALL_START_SPEED)
 
     font = pygame.font.Font(None, SCORE_FONT_SIZE)
     small_font = pygame.font.Font(None, 24)
@@ -162,7 +202,12 @@ def main():
     ai_enabled = False
 
     while True:
-        for event in pygame.event.get():
+        # While paused, after game over or without focus the scheduler sleeps
+        # between low-rate redraws; the physics are per frame, so they are
+        # frozen then instead of running at the idle rate.
+        _, events = scheduler.next_frame(idle=paused)
+        profiler.begin()
+        for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
@@ -176,8 +221,12 @@ def main():
                     score_left = 0
                     score_right = 0
                     ball.reset()
+                    if balls is not None:
+                        balls.reset()
                 if event.key == pygame.K_a:
                     ai_enabled = not ai_enabled
+                if event.key == pygame.K_F3:
+                    profiler.toggle_overlay()
 
         # Input handling
         keys = pygame.key.get_pressed()
@@ -195,26 +244,49 @@ def main():
                 right_speed = PADDLE_SPEED
         else:
             # Very simple AI: follow ball with some damping
-            if ball.rect.centery < right_paddle.rect.centery - 10:
+            target_y = ball.rect.centery if balls is None else balls.lead_y(1)
+            if target_y < right_paddle.rect.centery - 10:
                 right_speed = -PADDLE_SPEED
-            elif ball.rect.centery > right_paddle.rect.centery + 10:
+            elif target_y > right_paddle.rect.centery + 10:
                 right_speed = PADDLE_SPEED
             else:
                 right_speed = 0
 
-        if not paused:
+        profiler.mark('input')
+
+        frozen = paused or not scheduler.focused
+        if not frozen and balls is not None:
+            left_paddle.move(left_speed)
+            right_paddle.move(right_speed)
+            points_left, points_right, paddle_hits, wall_hits = balls.update(left_paddle, right_paddle)
+            if wall_hits:
+                play_sound('wall')
+            if paddle_hits:
+                play_sound('paddle')
+            if points_left or points_right:
+                score_left += points_left
+                score_right += points_right
+                log.pong(telemetry.PONG_SCORE, 0, 0, 0.0, 0.0, score_left, score_right)
+                play_sound('score')
+            if score_left >= WINNING_SCORE or score_right >= WINNING_SCORE:
+                paused = True
+
+        elif not frozen:
             left_paddle.move(left_speed)
             right_paddle.move(right_speed)
             ball.update(left_paddle, right_paddle)
+            log.pong(telemetry.PONG_FRAME, ball.rect.x, ball.rect.y, ball.vx, ball.vy, score_left, score_right)
 
             # Check scoring
             if ball.rect.right < 0:
                 score_right += 1
+                log.pong(telemetry.PONG_SCORE, ball.rect.x, ball.rect.y, ball.vx, ball.vy, score_left, score_right)
                 ball.reset(serveto=1)
                 play_sound('score')
 
             if ball.rect.left > WIDTH:
                 score_left += 1
+                log.pong(telemetry.PONG_SCORE, ball.rect.x, ball.rect.y, ball.vx, ball.vy, score_left, score_right)
                 ball.reset(serveto=-1)
                 play_sound('score')
 
@@ -222,18 +294,19 @@ def main():
             if score_left >= WINNING_SCORE or score_right >= WINNING_SCORE:
                 paused = True
 
+        profiler.mark('update')
+
         # Draw
         screen.fill(BLACK)
         draw_center_line(screen)
         left_paddle.draw(screen)
         right_paddle.draw(screen)
-        ball.draw(screen)
+        if balls is None:
+            ball.draw(screen)
+        else:
+            balls.draw(screen)
 
-        # Scores
-        left_surf = font.render(str(score_left), True, WHITE)
-        right_surf = font.render(str(score_right), True, WHITE)
-        screen.blit(left_surf, (WIDTH // 4 - left_surf.get_width() // 2, 20))
-        screen.blit(right_surf, (WIDTH * 3 // 4 - right_surf.get_width() // 2, 20))
+        draw_scores(screen, font, score_left, score_right)
 
         # Hints
         hint = small_font.render("W/S: left  |  Up/Down: right  |  P: pause  |  R: reset  |  A: toggle AI", True, WHITE)
@@ -247,8 +320,9 @@ def main():
                 win_surf = small_font.render(f"{winner} player wins! Press R to restart.", True, WHITE)
                 screen.blit(win_surf, (WIDTH // 2 - win_surf.get_width() // 2, HEIGHT // 2 + 40))
 
+        profiler.draw_overlay(screen)
         pygame.display.flip()
-        clock.tick(FPS)
+        profiler.mark('render')
 
 
 if __name__ == '__main__':
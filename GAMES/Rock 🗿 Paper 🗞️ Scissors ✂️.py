@@ -1,10 +1,18 @@
+"""
 Rock 🗿 Paper 🗞️ Scissors ✂️ - the classic hand game where:
 
 Rock beats Scissors (crushes them)
 Scissors beat Paper (cut it)
 Paper beats Rock (wraps it)
 
-enhanced version of Rock–Paper–Scissors in Python where you can play multiple rounds, keep score, and even choose when to quit:
+enhanced version of Rock–Paper–Scissors in Python where you can play multiple rounds, keep score, and even choose when to quit.
+
+✅ Features:
+
+Multiple rounds until the user quits.
+Keeps track of your score and the computer’s score.
+Declares the overall winner at the end.
+"""
 
 import random
 
@@ -67,12 +75,9 @@ def play_game():
     else:
         print("It's a tie overall!")
 
-# Start the game
-play_game()
-
-
-✅ Features:
+def main():
+    play_game()
 
-Multiple rounds until the user quits.
-Keeps track of your score and the computer’s score.
-Declares the overall winner at the end.
+# Start the game
+if __name__ == "__main__":
+    main()
@@ -1,42 +1,22 @@
 #before running the game please do install dependencies in requirements.txt file
+# (only needed for the default PostgreSQL backend; use --backend sqlite or --offline to play without a server)
 
 import os
 import sys
 
-# Use psycopg2 only (simpler for beginners)
-try:
-    import psycopg2 as pg
-except ImportError:
-    print("Missing dependency: psycopg2-binary")
-    print("Please run: pip install psycopg2-binary")
-    sys.exit(1)
-
-DB_PARAMS = {
-    'dbname': os.getenv('PGDATABASE', 'postgres'),
-    'user': os.getenv('PGUSER', 'postgres'),
-    'password': os.getenv('PGPASSWORD', 'postgres'),
-    'host': os.getenv('PGHOST', 'localhost'),
-    'port': int(os.getenv('PGPORT', '5432')),
-}
+import telemetry
+from snake_backend import BACKENDS, make_backend
 
-def connect():
-    return pg.connect(**DB_PARAMS)
+BACKEND = None
 
 def init_game(rows=10, cols=20):
-    with connect() as conn, conn.cursor() as cur:
-        cur.execute("SELECT init_game(%s,%s)", (rows, cols))
-        gid = cur.fetchone()[0]
-        return gid
+    return BACKEND.init_game(rows, cols)
 
 def get_board(gid):
-    with connect() as conn, conn.cursor() as cur:
-        cur.execute("SELECT get_board(%s)", (gid,))
-        return cur.fetchone()[0]
+    return BACKEND.get_board(gid)
 
 def step(gid, direction):
-    with connect() as conn, conn.cursor() as cur:
-        cur.execute("SELECT step(%s,%s)::text", (gid, direction))
-        return cur.fetchone()[0]
+    return BACKEND.step(gid, direction)
 
 KEY_TO_DIR = {
     'w': 'U',
@@ -57,11 +37,86 @@ def read_key():
         termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
     return ch
 
-def main():
+def parse_args(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='SQL Snake')
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='postgres',
+                        help='where the game logic runs (default: postgres)')
+    parser.add_argument('--offline', action='store_const', dest='backend', const='native',
+                        help='use the in-process native engine (same as --backend native)')
+    parser.add_argument('--db', default=':memory:', help='database file for the sqlite backend')
+    parser.add_argument('--rows', type=int, default=10)
+    parser.add_argument('--cols', type=int, default=20)
+    parser.add_argument('--autopilot', action='store_true',
+                        help='let snake_autopilot.py play instead of the keyboard')
+    parser.add_argument('--delay', type=float, default=0.05,
+                        help='seconds between autopilot moves; 0 plays without drawing and reports steps/s')
+    telemetry.add_arguments(parser)
+    return parser.parse_args(argv)
+
+def autopilot(gid, log, delay):
+    import time
+
+    from snake_autopilot import Autopilot
+
+    pilot = Autopilot(get_board(gid))
+    moves = 0
+    start = time.perf_counter()
+    while True:
+        if delay:
+            os.system('clear')
+            print(get_board(gid))
+            print("Autopilot, Ctrl+C to stop.")
+            time.sleep(delay)
+        if pilot.stalled:
+            status = 'stalled, no food for a while'
+            break
+        direction = pilot.choose()
+        if direction is None:
+            status = 'trapped, no move left that survives'
+            break
+        status = step(gid, direction)
+        moves += 1
+        log.snake(telemetry.SNAKE_STEP, gid, telemetry.SNAKE_DIRECTIONS[direction],
+                  telemetry.SNAKE_STATUS.get(status, 255))
+        if status in ('dead', 'won'):
+            break
+        pilot.update(direction, status, get_board(gid) if status == 'ate' else None)
+    elapsed = time.perf_counter() - start
+    if delay:
+        os.system('clear')
+    print(get_board(gid))
+    print("Game over! Final status:", status)
+    if not delay:
+        print(f"{moves:,} moves in {elapsed:.2f}s ({moves / elapsed:,.0f} steps/s)")
+
+def main(argv=None):
+    global BACKEND
+    args = parse_args(argv)
+    options = {'path': args.db} if args.backend == 'sqlite' else {}
+    try:
+        BACKEND = make_backend(args.backend, **options)
+    except ImportError:
+        print("Missing dependency: psycopg2-binary")
+        print("Please run: pip install psycopg2-binary")
+        sys.exit(1)
+
+    log = telemetry.from_args(args, 'snake')
+
     print("Starting new SQL Snake game...")
-    gid = init_game(10, 20)
+    gid = init_game(args.rows, args.cols)
     print(f"Game id: {gid}\n")
 
+    if args.autopilot:
+        try:
+            autopilot(gid, log, args.delay)
+        except KeyboardInterrupt:
+            print("Stopped.")
+        log.close()
+        BACKEND.close()
+        return
+
     current_dir = 'R'
 
     while True:
@@ -77,11 +132,16 @@ def main():
             current_dir = KEY_TO_DIR[ch]
 
         status = step(gid, current_dir)
+        log.snake(telemetry.SNAKE_STEP, gid, telemetry.SNAKE_DIRECTIONS[current_dir],
+                  telemetry.SNAKE_STATUS.get(status, 255))
         if 'dead' in status:
             os.system('clear')
             print(get_board(gid))
             print("Game over! Final status:", status)
             break
 
+    log.close()
+    BACKEND.close()
+
 if __name__ == "__main__":
     main()
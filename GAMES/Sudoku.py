@@ -1,5 +1,7 @@
 import random
 
+import telemetry
+
 def print_grid(grid):
     for i in range(9):
         if i % 3 == 0 and i != 0:
@@ -51,20 +53,36 @@ def generate_sudoku():
     return grid
 
 # Game
-grid = generate_sudoku()
-print("Welcome to Sudoku!")
-print_grid(grid)
+def parse_args(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Sudoku')
+    telemetry.add_arguments(parser)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    log = telemetry.from_args(args, 'sudoku')
+    grid = generate_sudoku()
+    print("Welcome to Sudoku!")
+    print_grid(grid)
 
-while True:
-    try:
-        row = int(input("Row (0-8): "))
-        col = int(input("Col (0-8): "))
-        num = int(input("Number (1-9): "))
+    while True:
+        try:
+            row = int(input("Row (0-8): "))
+            col = int(input("Col (0-8): "))
+            num = int(input("Number (1-9): "))
         
-        if grid[row][col] == 0 and is_valid(grid, row, col, num):
-            grid[row][col] = num
-            print_grid(grid)
-        else:
-            print("Invalid move!")
-    except ValueError:
-        print("Please enter valid integers.")
+            if grid[row][col] == 0 and is_valid(grid, row, col, num):
+                grid[row][col] = num
+                log.sudoku(telemetry.SUDOKU_MOVE, row, col, num)
+                print_grid(grid)
+            else:
+                if 0 <= row < 9 and 0 <= col < 9 and 0 <= num <= 9:
+                    log.sudoku(telemetry.SUDOKU_INVALID, row, col, num)
+                print("Invalid move!")
+        except ValueError:
+            print("Please enter valid integers.")
+
+if __name__ == "__main__":
+    main()
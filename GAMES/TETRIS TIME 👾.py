@@ -15,11 +15,13 @@ Controls:
 - Space: hard drop
 - C: hold piece
 - P: pause
+- F3: frame-time overlay
 - Esc / Q: quit
 
 Requirements:
 - Python 3.8+
 - pygame (pip install pygame)
+- numpy, only for --telemetry DIR (session logging, see telemetry.py)
 
 Save as tetris.py and run: python tetris.py
 """
@@ -28,6 +30,12 @@ import pygame
 import random
 import sys
 from copy import deepcopy
+from functools import lru_cache
+
+import frame_profiler
+import telemetry
+from loop_scheduler import LoopScheduler
+from tetris_renderer import BoardRenderer
 
 # ---------- Configuration ----------
 FPS = 60
@@ -265,94 +273,106 @@ def clear_rows(grid, locked):
 
 # ---------- Drawing Helpers ----------
 
-def draw_text_middle(surface, text, size, y_offset=0):
-    font = pygame.font.SysFont('comicsans', size, bold=True)
-    label = font.render(text, 1, WHITE)
+_RENDERER = None
 
-    surface.blit(label, (TOP_LEFT_X + PLAY_WIDTH/2 - (label.get_width()/2), TOP_LEFT_Y + PLAY_HEIGHT/2 - label.get_height()/2 + y_offset))
 
+def get_renderer():
+    """The BoardRenderer for the current board settings, with its tiles rendered on first use."""
+    global _RENDERER
+    if _RENDERER is None:
+        _RENDERER = BoardRenderer(COLS, ROWS, CELL_SIZE, (TOP_LEFT_X, TOP_LEFT_Y), SHAPE_COLORS, BLACK, GRAY)
+    return _RENDERER
+
+
+@lru_cache(maxsize=None)
+def get_font(size, bold=False):
+    # SysFont searches the system fonts on every call
+    return pygame.font.SysFont('comicsans', size, bold=bold)
 
-def draw_grid(surface, grid):
-    sx = TOP_LEFT_X
-    sy = TOP_LEFT_Y
-    for i in range(ROWS):
-        pygame.draw.line(surface, GRAY, (sx, sy + i * CELL_SIZE), (sx + PLAY_WIDTH, sy + i * CELL_SIZE))
-        for j in range(COLS):
-            pygame.draw.line(surface, GRAY, (sx + j * CELL_SIZE, sy), (sx + j * CELL_SIZE, sy + PLAY_HEIGHT))
+
+@lru_cache(maxsize=64)
+def render_text(text, size, bold=False):
+    return get_font(size, bold).render(text, 1, WHITE)
+
+
+def shape_cells(shape):
+    """(column, row) offsets of the blocks in the piece's 5x5 image."""
+    return [(j, i) for i, line in enumerate(shape.image()) for j, column in enumerate(line) if column == '0']
+
+
+def draw_text_middle(surface, text, size, y_offset=0):
+    label = render_text(text, size, True)
+
+    surface.blit(label, (TOP_LEFT_X + PLAY_WIDTH/2 - (label.get_width()/2), TOP_LEFT_Y + PLAY_HEIGHT/2 - label.get_height()/2 + y_offset))
 
 
 def draw_window(surface, grid, score=0, level=1):
     surface.fill(BLACK)
 
     # Title
-    font = pygame.font.SysFont('comicsans', 40)
-    label = font.render('TETRIS', 1, WHITE)
+    label = render_text('TETRIS', 40)
 
     surface.blit(label, (TOP_LEFT_X + PLAY_WIDTH/2 - label.get_width()/2, 5))
 
     # Score
-    font_small = pygame.font.SysFont('comicsans', 24)
-    score_label = font_small.render(f'Score: {score}', 1, WHITE)
-    level_label = font_small.render(f'Level: {level}', 1, WHITE)
+    score_label = render_text(f'Score: {score}', 24)
+    level_label = render_text(f'Level: {level}', 24)
     surface.blit(score_label, (TOP_LEFT_X + PLAY_WIDTH + 20, TOP_LEFT_Y + 50))
     surface.blit(level_label, (TOP_LEFT_X + PLAY_WIDTH + 20, TOP_LEFT_Y + 90))
 
-    # draw play area
+    # draw play area: changed cells as one batch of pre-rendered tiles, grid lines included
     sx = TOP_LEFT_X
     sy = TOP_LEFT_Y
 
-    for i in range(ROWS):
-        for j in range(COLS):
-            pygame.draw.rect(surface, grid[i][j], (sx + j * CELL_SIZE, sy + i * CELL_SIZE, CELL_SIZE, CELL_SIZE), 0)
-
-    # draw grid lines
-    draw_grid(surface, grid)
+    get_renderer().draw_board(surface, grid)
 
     # border
     pygame.draw.rect(surface, WHITE, (sx, sy, PLAY_WIDTH, PLAY_HEIGHT), 4)
 
 
 def draw_next_shape(surface, shape):
-    font = pygame.font.SysFont('comicsans', 24)
-    label = font.render('Next', 1, WHITE)
+    label = render_text('Next', 24)
     surface.blit(label, (TOP_LEFT_X + PLAY_WIDTH + 20, TOP_LEFT_Y + 140))
 
-    format = shape.image()
     sx = TOP_LEFT_X + PLAY_WIDTH + 50
     sy = TOP_LEFT_Y + 170
 
-    for i, line in enumerate(format):
-        row = list(line)
-        for j, column in enumerate(row):
-            if column == '0':
-                pygame.draw.rect(surface, SHAPE_COLORS[shape.shape_index], (sx + j * CELL_SIZE, sy + i * CELL_SIZE, CELL_SIZE, CELL_SIZE), 0)
+    get_renderer().draw_cells(surface, shape_cells(shape), SHAPE_COLORS[shape.shape_index], sx, sy)
 
 
 def draw_hold_shape(surface, shape):
-    font = pygame.font.SysFont('comicsans', 24)
-    label = font.render('Hold', 1, WHITE)
+    label = render_text('Hold', 24)
     surface.blit(label, (TOP_LEFT_X + PLAY_WIDTH + 20, TOP_LEFT_Y + 260))
 
     if not shape:
         return
 
-    format = shape.image()
     sx = TOP_LEFT_X + PLAY_WIDTH + 50
     sy = TOP_LEFT_Y + 300
 
-    for i, line in enumerate(format):
-        row = list(line)
-        for j, column in enumerate(row):
-            if column == '0':
-                pygame.draw.rect(surface, SHAPE_COLORS[shape.shape_index], (sx + j * CELL_SIZE, sy + i * CELL_SIZE, CELL_SIZE, CELL_SIZE), 0)
+    get_renderer().draw_cells(surface, shape_cells(shape), SHAPE_COLORS[shape.shape_index], sx, sy)
 
 # ---------- Main Game Loop ----------
 
-def main():
+def parse_args(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Tetris')
+    frame_profiler.add_arguments(parser)
+    telemetry.add_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    profiler = frame_profiler.from_args(args)
+    log = telemetry.from_args(args, 'tetris')
+
     pygame.init()
     win = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption('Tetris')
     clock = pygame.time.Clock()
+    scheduler = LoopScheduler(clock, FPS)
 
     locked_positions = {}
     grid = create_grid(locked_positions)
@@ -372,15 +392,16 @@ def main():
 
     while run:
         grid = create_grid(locked_positions)
-        dt = clock.tick(FPS) / 1000.0
+        dt, events = scheduler.next_frame()
         fall_time += dt
+        profiler.begin()
 
         # handle fall speed acceleration by level
         if lines_cleared_total >= level * 10:
             level += 1
             fall_speed = max(0.05, fall_speed * 0.9)
 
-        for event in pygame.event.get():
+        for event in events:
             if event.type == pygame.QUIT:
                 run = False
                 pygame.quit()
@@ -436,15 +457,23 @@ def main():
                             hold_piece = Piece(COLS//2 - 2, -2, temp.shape_index)
                         hold_locked = True
 
+                elif event.key == pygame.K_F3:
+                    profiler.toggle_overlay()
+
                 elif event.key == pygame.K_p:
                     paused = True
                     while paused:
-                        for e in pygame.event.get():
+                        # sleeps until the next event or the next idle redraw
+                        for e in scheduler.wait_events():
                             if e.type == pygame.QUIT:
                                 pygame.quit()
                                 sys.exit()
                             if e.type == pygame.KEYDOWN and e.key == pygame.K_p:
                                 paused = False
+                        pygame.display.update()
+                    scheduler.restart()
+
+        profiler.mark('input')
 
         # automatic piece fall
         if fall_time >= fall_speed:
@@ -467,6 +496,8 @@ def main():
             for pos in shape_pos:
                 p = (pos[0], pos[1])
                 locked_positions[p] = SHAPE_COLORS[current_piece.shape_index]
+            log.tetris(telemetry.TETRIS_PLACE, current_piece.shape_index, current_piece.x, current_piece.y,
+                       current_piece.rotation % len(current_piece.shape), 0, score, level)
             current_piece = next_piece
             next_piece = get_shape()
             change_piece = False
@@ -485,6 +516,9 @@ def main():
                     score += 300 * level
                 elif cleared >= 4:
                     score += 1200 * level
+                log.tetris(telemetry.TETRIS_CLEAR, 0, 0, 0, 0, cleared, score, level)
+
+        profiler.mark('update')
 
         draw_window(win, grid, score, level)
         draw_next_shape(win, next_piece)
@@ -496,7 +530,9 @@ def main():
             pygame.time.delay(1500)
             run = False
 
+        profiler.draw_overlay(win)
         pygame.display.update()
+        profiler.mark('render')
 
     pygame.quit()
 
@@ -539,5 +575,7 @@ C: hold piece
 
 P: pause
 
+F3: frame-time overlay (run with --profile-dump frames.csv to save timings)
+
 Esc or Q: quit
 """
@@ -59,5 +59,9 @@ def tic_tac_toe():
         # Switch player
         current_player = "O" if current_player == "X" else "X"
 
+def main():
+    tic_tac_toe()
+
 # Start the game
-tic_tac_toe()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+"""Entry point for `python -m GAMES`; see launcher.py."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import launcher  # noqa: E402
+
+sys.exit(launcher.main())
@@ -0,0 +1,453 @@
+"""
+Microbenchmarks and regression check for the game hot paths
+
+Covers valid_space / clear_rows / create_grid and frame drawing (Tetris),
+Sudoku.solve on easy and hard puzzles and is_valid, check_winner (Tic Tac
+Toe), Ball.update / _bounce and the 1,000-ball party mode tick (Pong),
+determine_winner (Rock Paper Scissors) and the launcher's import time
+(measured with `python -X importtime`).
+Games are imported through game_modules, so no window is opened and
+nothing reads stdin. Every workload is built from a fixed seed, so runs are
+comparable.
+
+Run:
+    python bench_hotpaths.py --save            # record bench_baseline.json
+    python bench_hotpaths.py                   # compare against it
+    python bench_hotpaths.py --threshold 0.10  # fail on >10% slowdowns
+    python bench_hotpaths.py -k tetris         # only matching benchmarks
+    python bench_hotpaths.py --relative        # on another machine: compare
+                                               # against the median slowdown
+
+The exit status is 1 when any benchmark is slower than the baseline by more
+than the threshold, when there is no baseline to compare with, or when the
+launcher imports a heavy dependency. Pygame
+benchmarks are skipped when pygame is missing.
+"""
+
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+import game_modules
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(HERE, 'bench_baseline.json')
+DEFAULT_THRESHOLD = 0.25
+SEED = 2024
+
+# Puzzles the plain backtracking Sudoku.solve finishes in well under a second.
+SUDOKU_SET = [
+    '003020600900305001001806400008102900700000008006708200002609500800203009005010300',
+    '200080300060070084030500209000105408000000000402706000301007040720040060004010003',
+    '000000907000420180000705026100904000050000040000507009920108000034059000507000000',
+    '030050040008010500460000012070502080000603000040109030250000098001020600080060020',
+]
+
+# Hard puzzles (17-21 clues, built against naive solvers) that still finish in
+# about a second: the backtracking worst case, timed on its own.
+SUDOKU_HARD = [
+    '8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..',
+    '..53.....8......2..7..1.5..4....53...1..7...6..32...8..6.5....9..4....3......97..',
+]
+
+# Modules the launcher must not pull in before a game is picked.
+HEAVY_MODULES = ('pygame', 'numpy', 'psycopg2')
+
+BENCHMARKS = {}
+METRICS = {}
+
+
+class Skip(Exception):
+    pass
+
+
+def benchmark(name):
+    """Register a workload factory; it returns the zero-argument callable to time."""
+    def register(factory):
+        BENCHMARKS[name] = factory
+        return factory
+    return register
+
+
+def metric(name):
+    """Register a function that measures itself and returns seconds."""
+    def register(func):
+        METRICS[name] = func
+        return func
+    return register
+
+
+def _parse_sudoku(text):
+    return [[int(ch) if ch.isdigit() else 0 for ch in text[r * 9:r * 9 + 9]] for r in range(9)]
+
+
+def _load_pygame_game(name):
+    try:
+        return game_modules.load(name)
+    except ImportError as exc:
+        raise Skip(str(exc))
+
+
+# ---- Tetris ----
+
+def _tetris_boards(tetris, count=20, drops=40):
+    """Record boards (locked-position dicts) from seeded random hard drops."""
+    rng = random.Random(SEED)
+    boards = []
+    locked = {}
+    while len(boards) < count:
+        piece = tetris.Piece(rng.randrange(1, tetris.COLS - 1), 0, rng.randrange(len(tetris.SHAPES)))
+        piece.rotation = rng.randrange(4)
+        grid = tetris.create_grid(locked)
+        if not tetris.valid_space(piece, grid):
+            locked = {}
+            continue
+        while tetris.valid_space(piece, grid):
+            piece.y += 1
+        piece.y -= 1
+        for pos in tetris.convert_shape_format(piece):
+            locked[pos] = tetris.SHAPE_COLORS[piece.shape_index]
+        if tetris.check_lost(locked):
+            locked = {}
+            continue
+        tetris.clear_rows(tetris.create_grid(locked), locked)
+        if len(locked) > drops:
+            boards.append(dict(locked))
+    return boards
+
+
+@benchmark('tetris.create_grid')
+def bench_create_grid():
+    tetris = _load_pygame_game('tetris')
+    boards = _tetris_boards(tetris)
+
+    def run():
+        for locked in boards:
+            tetris.create_grid(locked)
+    return run
+
+
+@benchmark('tetris.valid_space')
+def bench_valid_space():
+    tetris = _load_pygame_game('tetris')
+    rng = random.Random(SEED)
+    cases = []
+    for locked in _tetris_boards(tetris):
+        grid = tetris.create_grid(locked)
+        for _ in range(10):
+            piece = tetris.Piece(rng.randrange(tetris.COLS), rng.randrange(tetris.ROWS), rng.randrange(7))
+            piece.rotation = rng.randrange(4)
+            cases.append((piece, grid))
+
+    def run():
+        for piece, grid in cases:
+            tetris.valid_space(piece, grid)
+    return run
+
+
+@benchmark('tetris.clear_rows')
+def bench_clear_rows():
+    tetris = _load_pygame_game('tetris')
+    boards = []
+    for locked in _tetris_boards(tetris):
+        # fill the bottom two rows so every call has work to do
+        for y in (tetris.ROWS - 1, tetris.ROWS - 2):
+            for x in range(tetris.COLS):
+                locked[(x, y)] = tetris.SHAPE_COLORS[0]
+        boards.append((tetris.create_grid(locked), locked))
+
+    def run():
+        for grid, locked in boards:
+            tetris.clear_rows(grid, dict(locked))
+    return run
+
+
+@benchmark('tetris.draw_frame')
+def bench_draw_frame():
+    tetris = _load_pygame_game('tetris')
+    import pygame
+
+    pygame.font.init()
+    surface = pygame.Surface((tetris.WIDTH, tetris.HEIGHT))
+    grids = [tetris.create_grid(locked) for locked in _tetris_boards(tetris)]
+    next_piece, hold_piece = tetris.Piece(0, 0, 2), tetris.Piece(0, 0, 5)
+
+    def run():
+        # everything the game draws per frame, over 20 different boards
+        for grid in grids:
+            tetris.draw_window(surface, grid, 1200, 3)
+            tetris.draw_next_shape(surface, next_piece)
+            tetris.draw_hold_shape(surface, hold_piece)
+    return run
+
+
+# ---- Sudoku ----
+
+@benchmark('sudoku.solve')
+def bench_sudoku_solve():
+    sudoku = game_modules.load('sudoku')
+    puzzles = [_parse_sudoku(p) for p in SUDOKU_SET]
+
+    def run():
+        for puzzle in puzzles:
+            sudoku.solve([row[:] for row in puzzle])
+    return run
+
+
+@benchmark('sudoku.solve_hard')
+def bench_sudoku_solve_hard():
+    sudoku = game_modules.load('sudoku')
+    puzzles = [_parse_sudoku(p) for p in SUDOKU_HARD]
+
+    def run():
+        for puzzle in puzzles:
+            sudoku.solve([row[:] for row in puzzle])
+    return run
+
+
+@benchmark('sudoku.is_valid')
+def bench_sudoku_is_valid():
+    sudoku = game_modules.load('sudoku')
+    rng = random.Random(SEED)
+    puzzles = [_parse_sudoku(p) for p in SUDOKU_SET]
+    cases = [(rng.choice(puzzles), rng.randrange(9), rng.randrange(9), rng.randrange(1, 10))
+             for _ in range(2000)]
+
+    def run():
+        for grid, row, col, num in cases:
+            sudoku.is_valid(grid, row, col, num)
+    return run
+
+
+# ---- Tic Tac Toe ----
+
+@benchmark('tictactoe.check_winner')
+def bench_check_winner():
+    ttt = game_modules.load('tictactoe')
+    rng = random.Random(SEED)
+    boards = [[[rng.choice('XO ') for _ in range(3)] for _ in range(3)] for _ in range(1000)]
+
+    def run():
+        for board in boards:
+            ttt.check_winner(board, 'X')
+            ttt.check_winner(board, 'O')
+    return run
+
+
+# ---- Pong ----
+
+@benchmark('pong.ball_rally')
+def bench_ball_rally():
+    pong = _load_pygame_game('pong')
+
+    def run():
+        random.seed(SEED)
+        left = pong.Paddle(30, (pong.HEIGHT - pong.PADDLE_HEIGHT) // 2)
+        right = pong.Paddle(pong.WIDTH - 30 - pong.PADDLE_WIDTH, (pong.HEIGHT - pong.PADDLE_HEIGHT) // 2)
+        ball = pong.Ball()
+        for _ in range(5000):
+            # both paddles track the ball, so the rally never ends
+            left.rect.centery = right.rect.centery = ball.rect.centery
+            ball.update(left, right)
+            if ball.speed > 20:
+                ball.reset()
+    return run
+
+
+@benchmark('pong.bounce')
+def bench_bounce():
+    pong = _load_pygame_game('pong')
+    paddle = pong.Paddle(30, (pong.HEIGHT - pong.PADDLE_HEIGHT) // 2)
+    random.seed(SEED)
+    ball = pong.Ball()
+    offsets = [random.randint(-60, 60) for _ in range(5000)]
+
+    def run():
+        for dy in offsets:
+            ball.speed = pong.BALL_START_SPEED
+            ball.vx = -ball.speed
+            ball.rect.centery = paddle.rect.centery + dy
+            ball._bounce(paddle)
+    return run
+
+
+@benchmark('pong.multiball_1000')
+def bench_multiball():
+    pong = _load_pygame_game('pong')
+    try:
+        import pong_multiball
+    except ImportError as exc:
+        raise Skip(str(exc))
+    import pygame
+
+    surface = pygame.Surface((pong.WIDTH, pong.HEIGHT))
+    left = pong.Paddle(30, (pong.HEIGHT - pong.PADDLE_HEIGHT) // 2)
+    right = pong.Paddle(pong.WIDTH - 30 - pong.PADDLE_WIDTH, (pong.HEIGHT - pong.PADDLE_HEIGHT) // 2)
+    balls = pong_multiball.MultiBall(1000, pong.WIDTH, pong.HEIGHT, pong.BALL_SIZE, pong.BALL_START_SPEED, SEED)
+
+    def run():
+        # one frame: physics and drawing; must stay well under 16.7 ms
+        balls.update(left, right)
+        surface.fill(pong.BLACK)
+        balls.draw(surface)
+    return run
+
+
+# ---- Rock Paper Scissors ----
+
+@benchmark('rps.determine_winner')
+def bench_determine_winner():
+    rps = game_modules.load('rps')
+    rng = random.Random(SEED)
+    rounds = [(rng.choice(rps.choices), rng.choice(rps.choices)) for _ in range(10000)]
+
+    def run():
+        for user, computer in rounds:
+            rps.determine_winner(user, computer)
+    return run
+
+
+# ---- Launcher ----
+
+def import_time(module):
+    """Cumulative import time of `module` in a fresh interpreter, from -X importtime.
+
+    Returns (seconds, names of every module imported along the way).
+    """
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                          cwd=HERE, capture_output=True, text=True, check=True)
+    total = None
+    imported = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        imported.append(name.strip())
+        if name.strip() == module and not name.startswith('  '):
+            total = int(cumulative) / 1e6
+    return total, imported
+
+
+@metric('launcher.import_time')
+def launcher_import_time():
+    seconds, imported = import_time('launcher')
+    heavy = sorted({name.split('.')[0] for name in imported} & set(HEAVY_MODULES))
+    if heavy:
+        raise RuntimeError(f"launcher imports {', '.join(heavy)} at startup")
+    return seconds
+
+
+# ---- Runner ----
+
+def measure(func, repeat=5, min_time=0.2):
+    """Best seconds per call, calling `func` enough times per repeat to last `min_time`."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def run_all(pattern=None, repeat=5):
+    """Run the selected benchmarks and metrics. Returns (results, failed names)."""
+    results = {}
+    failed = []
+    for name, func in METRICS.items():
+        if pattern and pattern not in name:
+            continue
+        try:
+            results[name] = min(func() for _ in range(repeat))
+        except RuntimeError as exc:
+            print(f'{name:<28} FAILED: {exc}')
+            failed.append(name)
+            continue
+        print(f'{name:<28} {results[name] * 1000:10.3f} ms')
+    for name, factory in BENCHMARKS.items():
+        if pattern and pattern not in name:
+            continue
+        try:
+            func = factory()
+        except Skip as exc:
+            print(f'{name:<28} skipped ({exc})')
+            continue
+        results[name] = measure(func, repeat=repeat)
+        print(f'{name:<28} {results[name] * 1000:10.3f} ms')
+    return results, failed
+
+
+def compare(results, baseline, threshold, relative=False):
+    """Return the names that got slower than baseline * (1 + threshold).
+
+    With relative=True every ratio is divided by the median ratio first, so a
+    machine that is uniformly faster or slower than the baseline's does not
+    count; only benchmarks that slowed down against the others are flagged.
+    """
+    ratios = {name: seconds / baseline[name] for name, seconds in results.items() if name in baseline}
+    scale = statistics.median(ratios.values()) if relative and ratios else 1.0
+    if relative:
+        print(f'machine speed relative to the baseline: {1 / scale:.2f}x')
+    regressions = []
+    for name, ratio in ratios.items():
+        change = ratio / scale - 1
+        flag = 'REGRESSION' if change > threshold else ''
+        print(f'{name:<28} {change:+8.1%} {flag}')
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Game hot path benchmarks')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='baseline JSON file')
+    parser.add_argument('--save', action='store_true', help='write the results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='allowed slowdown as a fraction (default 0.25)')
+    parser.add_argument('--relative', action='store_true',
+                        help='compare against the median ratio instead of absolute times')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('-k', dest='pattern', help='only run benchmarks whose name contains this')
+    args = parser.parse_args(argv)
+
+    results, failed = run_all(args.pattern, args.repeat)
+    if failed:
+        return 1
+
+    if args.save:
+        with open(args.baseline, 'w') as f:
+            json.dump({'python': platform.python_version(), 'machine': platform.machine(),
+                       'results': results}, f, indent=2, sort_keys=True)
+        print(f'baseline saved to {args.baseline}')
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f'no baseline at {args.baseline}; run with --save first')
+        return 1
+    with open(args.baseline) as f:
+        baseline = json.load(f)['results']
+    regressions = compare(results, baseline, args.threshold, args.relative)
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) slower than {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
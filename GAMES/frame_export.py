@@ -0,0 +1,313 @@
+"""
+Headless frame exporter for Tetris and Pong replays
+
+Renders replay frames with the games' own drawing code (draw_window,
+draw_next_shape, draw_hold_shape for Tetris; draw_center_line, Paddle.draw,
+Ball.draw and draw_scores for Pong) onto a plain Surface. The SDL dummy video
+driver is selected before pygame is imported, so no display or GPU is
+needed.
+
+A replay is a JSON-lines file with one frame per line:
+
+    tetris: {"locked": [[x, y, shape], ...], "piece": [x, y, shape, rotation],
+             "next": shape, "hold": shape or null, "score": 0, "level": 1}
+    pong:   {"left": y, "right": y, "ball": [x, y], "score": [left, right]}
+
+Without --replay a seeded demo replay is generated.
+
+Frames go to a PNG sequence or to a raw video stream. The raw stream is the
+surface's own pixel buffer (32-bit, written without copying), e.g.
+
+    python frame_export.py pong --demo 600 --raw - | \\
+        ffmpeg -f rawvideo -pix_fmt bgr0 -s 900x600 -r 60 -i - pong.mp4
+    python frame_export.py tetris --replay game.jsonl --png frames/ --workers 4
+
+With --workers > 1 the frames are split into chunks that are rendered by a
+process pool; PNG workers write their files themselves and raw workers send
+the pixel bytes back in order. Renderer.pixels() gives the current frame as
+a zero-copy (width, height, 3) array from pygame.surfarray for in-process
+consumers such as thumbnail or analysis code.
+"""
+
+import os
+import sys
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import json
+import random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import pygame
+
+import game_modules
+
+GAMES = ('tetris', 'pong')
+CHUNK_SIZE = 64
+SEED = 2024
+
+# 32-bit surfaces with these masks are laid out B, G, R, X in memory on
+# little-endian machines, which ffmpeg calls bgr0
+MASKS = (0xFF0000, 0x00FF00, 0x0000FF, 0)
+PIX_FMT = 'bgr0' if sys.byteorder == 'little' else '0rgb'
+
+
+def load_replay(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def save_replay(path, frames):
+    with open(path, 'w') as f:
+        for frame in frames:
+            f.write(json.dumps(frame, separators=(',', ':')) + '\n')
+
+
+# ---- Demo replays ----
+
+def demo_tetris(count, seed=SEED):
+    """Seeded random hard drops, one frame per row the falling piece moves."""
+    tetris = game_modules.load('tetris')
+    rng = random.Random(seed)
+    locked = {}
+    score, level, lines = 0, 1, 0
+    next_shape = rng.randrange(len(tetris.SHAPES))
+    frames = []
+    while len(frames) < count:
+        shape, next_shape = next_shape, rng.randrange(len(tetris.SHAPES))
+        piece = tetris.Piece(rng.randrange(1, tetris.COLS - 1), 0, shape)
+        piece.rotation = rng.randrange(4)
+        grid = tetris.create_grid(locked)
+        if not tetris.valid_space(piece, grid):
+            locked = {}
+            continue
+        while tetris.valid_space(piece, grid) and len(frames) < count:
+            frames.append({
+                'locked': [[x, y, tetris.SHAPE_COLORS.index(c)] for (x, y), c in locked.items()],
+                'piece': [piece.x, piece.y, shape, piece.rotation],
+                'next': next_shape, 'hold': None, 'score': score, 'level': level,
+            })
+            piece.y += 1
+        piece.y -= 1
+        for pos in tetris.convert_shape_format(piece):
+            locked[pos] = tetris.SHAPE_COLORS[shape]
+        if tetris.check_lost(locked):
+            locked = {}
+            continue
+        cleared = tetris.clear_rows(tetris.create_grid(locked), locked)
+        lines += cleared
+        score += (0, 40, 100, 300, 1200)[min(cleared, 4)] * level
+        level = 1 + lines // 10
+    return frames
+
+
+def demo_pong(count, seed=SEED):
+    """A rally between two paddles that follow the ball, as with the game's AI toggle."""
+    pong = game_modules.load('pong')
+    random.seed(seed)
+    left = pong.Paddle(30, (pong.HEIGHT - pong.PADDLE_HEIGHT) // 2)
+    right = pong.Paddle(pong.WIDTH - 30 - pong.PADDLE_WIDTH, (pong.HEIGHT - pong.PADDLE_HEIGHT) // 2)
+    ball = pong.Ball()
+    score = [0, 0]
+    frames = []
+    for _ in range(count):
+        for paddle in (left, right):
+            # a little slower than the ball, so points are scored now and then
+            if ball.rect.centery < paddle.rect.centery - 10:
+                paddle.move(-pong.PADDLE_SPEED + 1)
+            elif ball.rect.centery > paddle.rect.centery + 10:
+                paddle.move(pong.PADDLE_SPEED - 1)
+        ball.update(left, right)
+        if ball.rect.right < 0:
+            score[1] += 1
+            ball.reset(serveto=1)
+        elif ball.rect.left > pong.WIDTH:
+            score[0] += 1
+            ball.reset(serveto=-1)
+        frames.append({'left': left.rect.y, 'right': right.rect.y,
+                       'ball': [ball.rect.x, ball.rect.y], 'score': list(score)})
+    return frames
+
+
+DEMOS = {'tetris': demo_tetris, 'pong': demo_pong}
+
+
+# ---- Rendering ----
+
+class Renderer:
+    """Draws replay frames of one game onto an offscreen Surface."""
+
+    def __init__(self, game):
+        if game not in GAMES:
+            raise ValueError(f"no renderer for {game!r}; choose from {', '.join(GAMES)}")
+        pygame.display.init()
+        pygame.font.init()
+        self.game = game
+        self.module = game_modules.load(game)
+        self.size = (self.module.WIDTH, self.module.HEIGHT)
+        self.surface = pygame.Surface(self.size, 0, 32, MASKS)
+        if game == 'pong':
+            pong = self.module
+            self.left = pong.Paddle(30, 0)
+            self.right = pong.Paddle(pong.WIDTH - 30 - pong.PADDLE_WIDTH, 0)
+            self.ball = pong.Ball()
+            self.font = pygame.font.Font(None, pong.SCORE_FONT_SIZE)
+
+    def render(self, frame):
+        if self.game == 'tetris':
+            self._render_tetris(frame)
+        else:
+            self._render_pong(frame)
+        return self.surface
+
+    def _render_tetris(self, frame):
+        tetris = self.module
+        colors = tetris.SHAPE_COLORS
+        grid = tetris.create_grid({(x, y): colors[c] for x, y, c in frame['locked']})
+        x, y, shape, rotation = frame['piece']
+        piece = tetris.Piece(x, y, shape)
+        piece.rotation = rotation
+        for px, py in tetris.convert_shape_format(piece):
+            if py >= 0:
+                grid[py][px] = colors[shape]
+        tetris.draw_window(self.surface, grid, frame.get('score', 0), frame.get('level', 1))
+        tetris.draw_next_shape(self.surface, tetris.Piece(0, 0, frame['next']))
+        hold = frame.get('hold')
+        tetris.draw_hold_shape(self.surface, None if hold is None else tetris.Piece(0, 0, hold))
+
+    def _render_pong(self, frame):
+        pong = self.module
+        self.left.rect.y = frame['left']
+        self.right.rect.y = frame['right']
+        self.ball.rect.topleft = frame['ball']
+        self.surface.fill(pong.BLACK)
+        pong.draw_center_line(self.surface)
+        self.left.draw(self.surface)
+        self.right.draw(self.surface)
+        self.ball.draw(self.surface)
+        pong.draw_scores(self.surface, self.font, *frame['score'])
+
+    def pixels(self):
+        """The current frame as a (width, height, 3) array view; no pixels are copied.
+
+        The view locks the surface; delete it before rendering the next frame.
+        """
+        return pygame.surfarray.pixels3d(self.surface)
+
+    def raw(self):
+        """The surface's pixel buffer (PIX_FMT, rows top to bottom), without copying."""
+        return self.surface.get_view('0')
+
+
+def _png_path(directory, index):
+    return os.path.join(directory, f'frame_{index:06d}.png')
+
+
+def render_png(renderer, frames, directory, start=0):
+    for i, frame in enumerate(frames, start):
+        pygame.image.save(renderer.render(frame), _png_path(directory, i))
+    return len(frames)
+
+
+def render_raw(renderer, frames, stream):
+    for frame in frames:
+        renderer.render(frame)
+        stream.write(renderer.raw())
+    return len(frames)
+
+
+# ---- Process pool ----
+
+_WORKER = None
+
+
+def _init_worker(game):
+    global _WORKER
+    _WORKER = Renderer(game)
+
+
+def _png_chunk(args):
+    frames, directory, start = args
+    return render_png(_WORKER, frames, directory, start)
+
+
+def _raw_chunk(frames):
+    out = bytearray()
+    for frame in frames:
+        _WORKER.render(frame)
+        out += _WORKER.raw()
+    return bytes(out)
+
+
+def _chunks(frames, size):
+    for start in range(0, len(frames), size):
+        yield start, frames[start:start + size]
+
+
+def export(game, frames, png_dir=None, raw_stream=None, workers=1, chunk_size=CHUNK_SIZE):
+    """Render `frames` to PNG files in `png_dir` or to `raw_stream`. Returns the frame count."""
+    if (png_dir is None) == (raw_stream is None):
+        raise ValueError('pass exactly one of png_dir and raw_stream')
+    if png_dir is not None:
+        os.makedirs(png_dir, exist_ok=True)
+
+    if workers <= 1:
+        renderer = Renderer(game)
+        if png_dir is not None:
+            return render_png(renderer, frames, png_dir)
+        return render_raw(renderer, frames, raw_stream)
+
+    # spawn, so the workers do not inherit an initialised SDL from this process
+    with ProcessPoolExecutor(workers, mp_context=get_context('spawn'),
+                             initializer=_init_worker, initargs=(game,)) as pool:
+        if png_dir is not None:
+            jobs = ((chunk, png_dir, start) for start, chunk in _chunks(frames, chunk_size))
+            return sum(pool.map(_png_chunk, jobs))
+        # map() yields in submission order, so frames reach the stream in order
+        for data in pool.map(_raw_chunk, (chunk for _, chunk in _chunks(frames, chunk_size))):
+            raw_stream.write(data)
+        return len(frames)
+
+
+def main(argv=None):
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description='Render Tetris / Pong replays without a display')
+    parser.add_argument('game', choices=GAMES)
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--replay', help='JSON-lines replay file')
+    source.add_argument('--demo', type=int, default=300, metavar='FRAMES',
+                        help='generate a seeded demo replay of this many frames (default)')
+    parser.add_argument('--save-replay', metavar='PATH', help='also write the frames as a replay file')
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--png', metavar='DIR', help='write frame_000000.png, ...')
+    target.add_argument('--raw', metavar='PATH', help=f"write raw {PIX_FMT} video ('-' for stdout)")
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--chunk', type=int, default=CHUNK_SIZE, help='frames per pool task')
+    args = parser.parse_args(argv)
+
+    frames = load_replay(args.replay) if args.replay else DEMOS[args.game](args.demo)
+    if args.save_replay:
+        save_replay(args.save_replay, frames)
+
+    module = game_modules.load(args.game)
+    start = time.perf_counter()
+    if args.png:
+        count = export(args.game, frames, png_dir=args.png, workers=args.workers, chunk_size=args.chunk)
+    elif args.raw == '-':
+        count = export(args.game, frames, raw_stream=sys.stdout.buffer, workers=args.workers,
+                       chunk_size=args.chunk)
+    else:
+        with open(args.raw, 'wb') as f:
+            count = export(args.game, frames, raw_stream=f, workers=args.workers, chunk_size=args.chunk)
+    elapsed = time.perf_counter() - start
+    # stderr, so the summary does not end up in a piped video stream
+    print(f'{count} frames ({module.WIDTH}x{module.HEIGHT}, {PIX_FMT}) in {elapsed:.2f}s '
+          f'({count / elapsed:.0f} fps)', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
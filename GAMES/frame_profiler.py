@@ -0,0 +1,175 @@
+"""
+Per-phase frame timing for the pygame games
+
+Usage inside a main loop:
+
+    profiler = FrameProfiler(enabled=True)
+    while running:
+        profiler.begin()
+        ...handle events...
+        profiler.mark('input')
+        ...move things...
+        profiler.mark('update')
+        ...draw...
+        profiler.draw_overlay(screen)
+        pygame.display.flip()
+        profiler.mark('render')
+
+Timings go into fixed-size ring buffers (one array per phase, no per-frame
+allocation) and `stats()` reports p50 / p99 / max in milliseconds. 'frame'
+is the wall time between two begin() calls, so it includes clock.tick()
+sleeps and shows dropped frames directly.
+
+When the profiler is disabled, begin() and mark() are rebound to a no-op, so
+the cost in the frame loop is one empty call per phase.
+"""
+
+import atexit
+import csv
+import json
+import time
+from array import array
+
+PHASES = ('input', 'update', 'render')
+COLUMNS = PHASES + ('frame',)
+OVERLAY_REFRESH = 30  # frames between overlay text updates
+
+
+def _noop(*args):
+    pass
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    i = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[i]
+
+
+class FrameProfiler:
+    def __init__(self, size=600, enabled=False, overlay=False):
+        self.size = size
+        self.samples = {name: array('d', bytes(8 * size)) for name in COLUMNS}
+        self.index = 0
+        self.count = 0
+        self.overlay = overlay
+        self._frame_start = None
+        self._last_mark = 0.0
+        self._last_begin = None
+        self._overlay_lines = []
+        self._overlay_age = OVERLAY_REFRESH
+        self._font = None
+        self.set_enabled(enabled or overlay)
+
+    # ---- switching ----
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        if enabled:
+            # drop instance overrides so the real methods are used again
+            self.__dict__.pop('begin', None)
+            self.__dict__.pop('mark', None)
+        else:
+            self.begin = _noop
+            self.mark = _noop
+            self._last_begin = None
+
+    def toggle_overlay(self):
+        """Show/hide the overlay; collecting is switched on with it."""
+        self.overlay = not self.overlay
+        if self.overlay and not self.enabled:
+            self.set_enabled(True)
+
+    # ---- recording ----
+
+    def begin(self):
+        now = time.perf_counter()
+        if self._last_begin is not None:
+            self.samples['frame'][self.index] = (now - self._last_begin) * 1000.0
+        self._last_begin = now
+        self._frame_start = self._last_mark = now
+
+    def mark(self, phase):
+        if self._frame_start is None:
+            return
+        now = time.perf_counter()
+        self.samples[phase][self.index] = (now - self._last_mark) * 1000.0
+        self._last_mark = now
+        if phase == PHASES[-1]:
+            self.index = (self.index + 1) % self.size
+            if self.count < self.size:
+                self.count += 1
+            self._frame_start = None
+
+    # ---- reporting ----
+
+    def ordered(self, name):
+        """Samples of one column, oldest first."""
+        column = self.samples[name]
+        if self.count < self.size:
+            return column[:self.count].tolist()
+        return column[self.index:].tolist() + column[:self.index].tolist()
+
+    def stats(self):
+        """{column: {'p50': ms, 'p99': ms, 'max': ms}} over the buffered frames."""
+        result = {}
+        for name in COLUMNS:
+            values = sorted(self.ordered(name))
+            result[name] = {
+                'p50': _percentile(values, 0.50),
+                'p99': _percentile(values, 0.99),
+                'max': values[-1] if values else 0.0,
+            }
+        return result
+
+    def dump(self, path):
+        """Write the buffered frames to CSV or JSON, chosen by the file extension."""
+        columns = {name: self.ordered(name) for name in COLUMNS}
+        if path.endswith('.json'):
+            with open(path, 'w') as f:
+                json.dump({'unit': 'ms', 'stats': self.stats(), 'frames': columns}, f, indent=2)
+            return
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(('frame',) + tuple(f'{name}_ms' for name in COLUMNS))
+            for i, row in enumerate(zip(*(columns[name] for name in COLUMNS))):
+                writer.writerow((i,) + tuple(f'{v:.3f}' for v in row))
+
+    def dump_on_exit(self, path):
+        """Dump the buffer when the interpreter exits (the games call sys.exit from several places)."""
+        atexit.register(self.dump, path)
+
+    def draw_overlay(self, surface, pos=(8, 8)):
+        if not self.overlay:
+            return
+        import pygame
+
+        if self._font is None:
+            self._font = pygame.font.Font(None, 20)
+        self._overlay_age += 1
+        if self._overlay_age >= OVERLAY_REFRESH:
+            self._overlay_age = 0
+            stats = self.stats()
+            text = [f'{name:>6}  p50 {s["p50"]:5.2f}  p99 {s["p99"]:5.2f}  max {s["max"]:6.2f} ms'
+                    for name, s in stats.items()]
+            self._overlay_lines = [self._font.render(line, True, (255, 255, 0), (0, 0, 0))
+                                   for line in text]
+        x, y = pos
+        for line in self._overlay_lines:
+            surface.blit(line, (x, y))
+            y += line.get_height()
+
+
+def add_arguments(parser):
+    """Add the shared --profile / --profile-dump options to an argparse parser."""
+    parser.add_argument('--profile', action='store_true',
+                        help='show the frame-time overlay from the start (F3 toggles it)')
+    parser.add_argument('--profile-dump', metavar='PATH',
+                        help='record frame times and write them to PATH (.csv or .json) on exit')
+
+
+def from_args(args):
+    profiler = FrameProfiler(enabled=bool(args.profile_dump), overlay=args.profile)
+    if args.profile_dump:
+        profiler.dump_on_exit(args.profile_dump)
+    return profiler
@@ -0,0 +1,73 @@
+"""
+Import the game scripts as modules
+
+The game files have names like 'TETRIS TIME 👾.py' that the import statement
+cannot spell, so this module loads them by path under short names:
+
+    tetris = load('tetris')
+    tetris.valid_space(piece, grid)
+
+Loaded modules are cached in sys.modules as 'game_<name>'. This module only
+uses the standard library, so listing the games never imports pygame,
+numpy or psycopg2; a game's dependencies are imported when it is loaded.
+"""
+
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+GAME_FILES = {
+    'pong': 'Ping Pong 🏓.py',
+    'rps': 'Rock 🗿 Paper 🗞️ Scissors ✂️.py',
+    'snake': 'Snake Game 🐍.py',
+    'sudoku': 'Sudoku.py',
+    'tetris': 'TETRIS TIME 👾.py',
+    'tictactoe': 'Tic Tac Toe#️⃣❎0️⃣.py',
+}
+
+TITLES = {
+    'pong': 'Ping Pong (pygame)',
+    'rps': 'Rock Paper Scissors',
+    'snake': 'SQL Snake',
+    'sudoku': 'Sudoku',
+    'tetris': 'Tetris (pygame)',
+    'tictactoe': 'Tic Tac Toe',
+}
+
+
+def find(name):
+    """Resolve a possibly abbreviated or differently spelled game name, e.g. 'Tic-Tac-Toe' -> 'tictactoe'."""
+    key = ''.join(ch for ch in name.lower() if ch.isalnum())
+    if key in GAME_FILES:
+        return key
+    matches = [game for game in GAME_FILES if game.startswith(key)]
+    if len(matches) == 1:
+        return matches[0]
+    raise ValueError(f"unknown game {name!r}; choose from {', '.join(sorted(GAME_FILES))}")
+
+
+def load(name):
+    """Import a game module by its short name (see GAME_FILES)."""
+    module_name = f'game_{name}'
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    try:
+        filename = GAME_FILES[name]
+    except KeyError:
+        raise ValueError(f"unknown game {name!r}; choose from {', '.join(sorted(GAME_FILES))}") from None
+
+    import importlib.util  # not needed just to list the games
+
+    # the games import helpers such as frame_profiler from their own folder
+    if HERE not in sys.path:
+        sys.path.insert(0, HERE)
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(HERE, filename))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[module_name]
+        raise
+    return module
@@ -0,0 +1,84 @@
+"""
+Game launcher
+
+    python -m GAMES                 # menu (from the repository root)
+    python -m GAMES tetris --profile
+    python -m GAMES --list
+    python launcher.py snake --offline
+
+The menu only imports the standard library. A game module, and pygame /
+numpy / psycopg2 with it, is imported when that game is picked. Arguments
+after the game name are handed to the game as if it had been run as a
+script.
+"""
+
+import sys
+
+import game_modules
+
+
+def list_games():
+    for i, name in enumerate(sorted(game_modules.GAME_FILES), start=1):
+        print(f'{i}. {name:<10} {game_modules.TITLES[name]}')
+
+
+def choose():
+    names = sorted(game_modules.GAME_FILES)
+    list_games()
+    while True:
+        try:
+            answer = input('Pick a game (number or name, q to quit): ').strip()
+        except EOFError:
+            return None
+        if answer.lower() in ('q', 'quit', ''):
+            return None
+        if answer.isdigit() and 1 <= int(answer) <= len(names):
+            return names[int(answer) - 1]
+        try:
+            return game_modules.find(answer)
+        except ValueError as exc:
+            print(exc)
+
+
+def run(name, args=()):
+    """Import and start a game with the given command line arguments."""
+    module = game_modules.load(name)
+    saved = sys.argv
+    sys.argv = [game_modules.GAME_FILES[name]] + list(args)
+    try:
+        return module.main()
+    finally:
+        sys.argv = saved
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in ('-h', '--help'):
+        print(__doc__.strip())
+        return 0
+    if argv and argv[0] == '--list':
+        list_games()
+        return 0
+
+    if argv:
+        try:
+            name = game_modules.find(argv[0])
+        except ValueError as exc:
+            print(exc)
+            return 2
+        args = argv[1:]
+    else:
+        name = choose()
+        args = []
+        if name is None:
+            return 0
+
+    try:
+        run(name, args)
+    except (KeyboardInterrupt, EOFError):
+        print()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""
+Frame pacing for the pygame games that sleeps instead of spinning
+
+While a game is running and its window has focus, a frame is the usual
+`clock.tick(FPS)` followed by `pygame.event.get()`. While it is paused, over,
+or the window has lost focus, the scheduler blocks in `pygame.event.wait()`
+with a timeout instead, so the process sleeps until input arrives or until
+the next low-rate redraw is due. Any event wakes it immediately, and
+regaining focus returns to full FPS.
+
+    scheduler = LoopScheduler(clock, FPS)
+    while running:
+        dt, events = scheduler.next_frame(idle=paused)
+        for event in events:
+            ...
+"""
+
+import pygame
+
+IDLE_FPS = 4
+
+# pygame 2 sends WINDOWFOCUS*, older SDL versions only ACTIVEEVENT
+_FOCUS_LOST = getattr(pygame, 'WINDOWFOCUSLOST', None)
+_FOCUS_GAINED = getattr(pygame, 'WINDOWFOCUSGAINED', None)
+_INPUT_EVENTS = {pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN}
+
+
+class LoopScheduler:
+    def __init__(self, clock, fps, idle_fps=IDLE_FPS):
+        self.clock = clock
+        self.fps = fps
+        self.idle_timeout = max(1, 1000 // idle_fps)
+        self.focused = True
+
+    def _observe(self, events):
+        for event in events:
+            if event.type == _FOCUS_LOST:
+                self.focused = False
+            elif event.type == _FOCUS_GAINED or event.type in _INPUT_EVENTS:
+                self.focused = True
+            elif event.type == pygame.ACTIVEEVENT and getattr(event, 'state', 0) & 2:
+                # state bit 2 is SDL_APPINPUTFOCUS
+                self.focused = bool(event.gain)
+        return events
+
+    def _wait(self, timeout):
+        event = pygame.event.wait(timeout)
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+
+    def next_frame(self, idle=False):
+        """Wait for the next frame. Returns (seconds since the last frame, events).
+
+        With idle=True or an unfocused window this blocks on the event queue
+        for at most 1 / idle_fps seconds and may return no events.
+        """
+        if self.focused and not idle:
+            dt = self.clock.tick(self.fps)
+            events = pygame.event.get()
+        else:
+            events = self._wait(self.idle_timeout)
+            dt = self.clock.tick()
+        return dt / 1000.0, self._observe(events)
+
+    def wait_events(self, timeout=None):
+        """Block until an event arrives or `timeout` ms pass (1 / idle_fps by default).
+
+        May return no events, so the caller gets a chance to redraw.
+        """
+        return self._observe(self._wait(self.idle_timeout if timeout is None else timeout))
+
+    def restart(self):
+        """Forget the time spent blocked, so the next dt does not include a pause."""
+        self.clock.tick()
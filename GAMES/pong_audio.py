@@ -0,0 +1,125 @@
+"""
+Synthesized sound effects for Ping Pong 🏓.py
+
+The 'paddle', 'wall' and 'score' effects are generated once at startup with
+NumPy, straight into each Sound's own sample buffer (pygame.sndarray.samples
+is a view, so no intermediate buffer is copied into the mixer). The samples
+are cached on disk, keyed by the mixer format, and later runs read the file
+directly into the Sound buffer.
+
+Playback goes through a ChannelPool of reserved mixer channels: playing a
+sound is a round-robin pick of a channel, with no allocation and no search
+for a free channel in the frame loop.
+
+Requires numpy and an initialised pygame.mixer.
+"""
+
+import os
+
+import numpy as np
+import pygame
+
+CACHE_VERSION = 1
+CACHE_DIR = os.getenv('PONG_AUDIO_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'pong_audio'))
+VOLUME = 0.4
+
+# name -> (duration in seconds, start frequency Hz, end frequency Hz, waveform)
+EFFECTS = {
+    'paddle': (0.06, 880.0, 880.0, 'square'),
+    'wall': (0.05, 440.0, 440.0, 'square'),
+    'score': (0.35, 660.0, 220.0, 'sine'),
+}
+
+
+def _waveform(duration, f0, f1, kind, rate):
+    """Mono float waveform in [-1, 1] with a linear pitch sweep and a short decay."""
+    n = max(1, int(duration * rate))
+    t = np.arange(n) / rate
+    freq = np.linspace(f0, f1, n)
+    phase = 2 * np.pi * np.cumsum(freq) / rate
+    wave = np.sin(phase)
+    if kind == 'square':
+        wave = np.sign(wave)
+    envelope = np.exp(-4.0 * t / duration)
+    envelope[: min(n, int(0.003 * rate))] *= np.linspace(0, 1, min(n, int(0.003 * rate)))
+    return wave * envelope
+
+
+def _fill(samples, wave):
+    """Write a float waveform into a sndarray view, in whatever sample type the mixer uses."""
+    dtype = samples.dtype
+    if dtype.kind == 'f':
+        scaled = wave * VOLUME
+    elif dtype.kind == 'i':
+        scaled = wave * (np.iinfo(dtype).max * VOLUME)
+    else:
+        mid = (int(np.iinfo(dtype).max) + 1) // 2
+        scaled = mid + wave * ((mid - 1) * VOLUME)
+    if samples.ndim == 2:
+        samples[...] = scaled[:, None]
+    else:
+        samples[...] = scaled
+
+
+def _cache_path(name, mixer_format):
+    frequency, fmt, channels = mixer_format
+    return os.path.join(CACHE_DIR, f'{name}-v{CACHE_VERSION}-{frequency}Hz-fmt{fmt}-{channels}ch.raw')
+
+
+def _empty_sound(n_frames, mixer_format):
+    _, fmt, channels = mixer_format
+    sample_bytes = (abs(fmt) & 0xFF) // 8
+    return pygame.mixer.Sound(buffer=bytes(n_frames * channels * sample_bytes))
+
+
+def build_sound(name, mixer_format=None, use_cache=True):
+    """Return a pygame Sound for one of EFFECTS, from the disk cache when possible."""
+    mixer_format = mixer_format or pygame.mixer.get_init()
+    if mixer_format is None:
+        raise RuntimeError('pygame.mixer is not initialised')
+    duration, f0, f1, kind = EFFECTS[name]
+    rate = mixer_format[0]
+    n_frames = max(1, int(duration * rate))
+
+    sound = _empty_sound(n_frames, mixer_format)
+    samples = pygame.sndarray.samples(sound)
+    raw = samples.reshape(-1).view(np.uint8)
+
+    path = _cache_path(name, mixer_format)
+    if use_cache and os.path.exists(path) and os.path.getsize(path) == raw.nbytes:
+        with open(path, 'rb') as f:
+            if f.readinto(raw) == raw.nbytes:
+                return sound
+
+    _fill(samples, _waveform(duration, f0, f1, kind, rate))
+    if use_cache:
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(path + '.tmp', 'wb') as f:
+                f.write(raw)
+            os.replace(path + '.tmp', path)
+        except OSError:
+            pass  # caching is an optimisation only
+    return sound
+
+
+def build_sounds(use_cache=True):
+    """Return {'paddle': Sound, 'wall': Sound, 'score': Sound}."""
+    mixer_format = pygame.mixer.get_init()
+    return {name: build_sound(name, mixer_format, use_cache) for name in EFFECTS}
+
+
+class ChannelPool:
+    """A fixed set of reserved mixer channels used round-robin."""
+
+    def __init__(self, size=4):
+        if pygame.mixer.get_num_channels() < size:
+            pygame.mixer.set_num_channels(size)
+        pygame.mixer.set_reserved(size)
+        self.channels = [pygame.mixer.Channel(i) for i in range(size)]
+        self.next = 0
+
+    def play(self, sound):
+        channel = self.channels[self.next]
+        self.next = (self.next + 1) % len(self.channels)
+        channel.play(sound)
@@ -0,0 +1,232 @@
+"""
+Multi-ball party mode for Ping Pong 🏓
+
+All balls live in flat numpy arrays (position, velocity, speed). Every tick:
+
+  1. move, bounce off the top and bottom walls
+  2. paddle hits for all balls at once, with the rules of Ball._bounce:
+     speed * 1.05, vx flipped and scaled by (1 - 0.5 * |rel|), vy = speed * rel,
+     where rel is the hit position on the paddle clamped to [-1, 1]
+  3. ball-ball collisions: the balls are binned into a uniform grid with one
+     ball diameter per cell, sorted by cell key, and candidate pairs are
+     taken from each ball's own cell and four of its eight neighbours (the
+     other four are covered from the other side). The narrowphase is one
+     vectorized distance test over all candidate pairs; colliding pairs that
+     are approaching exchange their velocity along the contact normal, like
+     equal-mass elastic spheres.
+  4. balls past the left or right edge score and are served again from the
+     centre line, as Ball.reset does
+
+The grid is rebuilt from scratch each tick (argsort + bincount), so there is
+nothing to update incrementally. Drawing blits one pre-rendered ball sprite
+per ball in a single Surface.blits call.
+
+    python "Ping Pong 🏓.py" --balls 300
+    python pong_multiball.py --balls 1000      # ticks per second vs. the 60 FPS budget
+"""
+
+import numpy as np
+import pygame
+
+NEIGHBOURS = ((1, 0), (-1, 1), (0, 1), (1, 1))
+MIN_VX = 1.0  # keeps balls from bouncing vertically forever after a glancing collision
+
+
+def _ranges(lo, hi):
+    """Concatenate arange(lo[k], hi[k]) for all k; also return the k each value came from."""
+    counts = np.maximum(hi - lo, 0)
+    total = int(counts.sum())
+    owner = np.repeat(np.arange(len(lo)), counts)
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    return owner, np.repeat(lo, counts) + offsets
+
+
+class MultiBall:
+    def __init__(self, count, width, height, size, start_speed, seed=None):
+        self.count = count
+        self.width = width
+        self.height = height
+        self.size = size
+        self.start_speed = start_speed
+        self.rng = np.random.default_rng(seed)
+        # top-left corners, like Ball.rect
+        self.x = np.empty(count)
+        self.y = np.empty(count)
+        self.vx = np.empty(count)
+        self.vy = np.empty(count)
+        self.speed = np.empty(count)
+        self.grid_w = width // size + 1
+        self.grid_h = height // size + 1
+        self.sprite = None
+        self.reset()
+
+    def reset(self):
+        self._serve(np.arange(self.count), None)
+        # spread the first serve over the width so the balls do not start in one clump
+        self.x[:] = self.rng.uniform(self.width * 0.25, self.width * 0.75 - self.size, self.count)
+
+    def _serve(self, idx, direction):
+        n = len(idx)
+        if not n:
+            return
+        angle = self.rng.uniform(-0.4, 0.4, n)
+        if direction is None:
+            direction = self.rng.choice((-1.0, 1.0), n)
+        self.x[idx] = (self.width - self.size) / 2
+        self.y[idx] = self.rng.uniform(0, self.height - self.size, n)
+        self.speed[idx] = self.start_speed
+        self.vx[idx] = direction * self.start_speed * (1 - np.abs(angle))
+        self.vy[idx] = self.start_speed * angle
+
+    # ---- physics ----
+
+    def _paddle(self, rect, moving):
+        """Bounce the balls that overlap `rect` while moving towards it (mask `moving`)."""
+        x, y, s = self.x, self.y, self.size
+        hit = moving & (x < rect.right) & (x + s > rect.left) & (y < rect.bottom) & (y + s > rect.top)
+        if not hit.any():
+            return 0
+        idx = np.flatnonzero(hit)
+        rel = np.clip((y[idx] + s / 2 - rect.centery) / (rect.height / 2), -1, 1)
+        speed = self.speed[idx] * 1.05
+        self.speed[idx] = speed
+        self.vx[idx] = -np.sign(self.vx[idx]) * speed * (1 - 0.5 * np.abs(rel))
+        self.vy[idx] = speed * rel
+        return len(idx)
+
+    def candidate_pairs(self):
+        """Pairs (i, j) of balls in the same or adjacent grid cells, each pair once."""
+        s = self.size
+        gw, gh = self.grid_w, self.grid_h
+        gx = np.clip(((self.x + s / 2) // s).astype(np.intp), 0, gw - 1)
+        gy = np.clip(((self.y + s / 2) // s).astype(np.intp), 0, gh - 1)
+        key = gy * gw + gx
+        order = np.argsort(key, kind='stable')
+        counts = np.bincount(key, minlength=gw * gh)
+        start = np.cumsum(counts) - counts
+
+        # work in sorted order: position p holds ball order[p]
+        sgx, sgy, skey = gx[order], gy[order], key[order]
+        positions = np.arange(self.count)
+        firsts, seconds = [], []
+
+        # same cell: the balls after p in that cell's run
+        owner, other = _ranges(positions + 1, start[skey] + counts[skey])
+        firsts.append(owner)
+        seconds.append(other)
+
+        for dx, dy in NEIGHBOURS:
+            nx, ny = sgx + dx, sgy + dy
+            valid = (nx >= 0) & (nx < gw) & (ny < gh)
+            nkey = np.where(valid, ny * gw + nx, 0)
+            lo = start[nkey]
+            hi = np.where(valid, lo + counts[nkey], lo)
+            owner, other = _ranges(lo, hi)
+            firsts.append(owner)
+            seconds.append(other)
+
+        i = order[np.concatenate(firsts)]
+        j = order[np.concatenate(seconds)]
+        return i, j
+
+    def _collide(self):
+        i, j = self.candidate_pairs()
+        if not len(i):
+            return 0
+        x, y, vx, vy = self.x, self.y, self.vx, self.vy
+        dx = x[j] - x[i]
+        dy = y[j] - y[i]
+        d2 = dx * dx + dy * dy
+        dvx = vx[j] - vx[i]
+        dvy = vy[j] - vy[i]
+        closing = dvx * dx + dvy * dy
+        hit = (d2 < self.size * self.size) & (d2 > 0) & (closing < 0)
+        if not hit.any():
+            return 0
+        i, j = i[hit], j[hit]
+        d = np.sqrt(d2[hit])
+        nx, ny = dx[hit] / d, dy[hit] / d
+        # normal component of the relative velocity moves from j to i and back
+        p = closing[hit] / d
+        n = self.count
+        vx += np.bincount(i, p * nx, n) - np.bincount(j, p * nx, n)
+        vy += np.bincount(i, p * ny, n) - np.bincount(j, p * ny, n)
+        slow = np.abs(vx) < MIN_VX
+        vx[slow] = np.where(vx[slow] < 0, -MIN_VX, MIN_VX)
+        return len(i)
+
+    def update(self, left_paddle, right_paddle):
+        """Advance one tick. Returns (points left, points right, paddle hits, wall hits)."""
+        self.x += self.vx
+        self.y += self.vy
+
+        walls = (self.y <= 0) | (self.y + self.size >= self.height)
+        self.vy[walls] = -self.vy[walls]
+
+        hits = self._paddle(left_paddle.rect, self.vx < 0)
+        hits += self._paddle(right_paddle.rect, self.vx > 0)
+        self._collide()
+
+        out_left = np.flatnonzero(self.x + self.size < 0)
+        out_right = np.flatnonzero(self.x > self.width)
+        self._serve(out_left, 1.0)
+        self._serve(out_right, -1.0)
+        return len(out_right), len(out_left), hits, int(np.count_nonzero(walls))
+
+    def lead_y(self, side):
+        """Centre y of the ball closest to the paddle on `side` (-1 left, 1 right) that is heading its way."""
+        towards = self.vx * side > 0
+        if not towards.any():
+            return self.height / 2
+        idx = np.flatnonzero(towards)
+        k = idx[np.argmax(self.x[idx] * side)]
+        return self.y[k] + self.size / 2
+
+    # ---- drawing ----
+
+    def draw(self, surface, color=(255, 255, 255)):
+        if self.sprite is None:
+            self.sprite = pygame.Surface((self.size, self.size), pygame.SRCALPHA)
+            pygame.draw.ellipse(self.sprite, color, self.sprite.get_rect())
+        sprite = self.sprite
+        surface.blits([(sprite, pos) for pos in zip(self.x.astype(np.intp).tolist(),
+                                                   self.y.astype(np.intp).tolist())], False)
+
+
+def benchmark(count=1000, ticks=600, seed=0):
+    """Average ms per tick (physics + drawing) with `count` balls and two tracking paddles."""
+    import time
+
+    import game_modules
+
+    pong = game_modules.load('pong')
+    surface = pygame.Surface((pong.WIDTH, pong.HEIGHT))
+    left = pong.Paddle(30, (pong.HEIGHT - pong.PADDLE_HEIGHT) // 2)
+    right = pong.Paddle(pong.WIDTH - 30 - pong.PADDLE_WIDTH, (pong.HEIGHT - pong.PADDLE_HEIGHT) // 2)
+    balls = MultiBall(count, pong.WIDTH, pong.HEIGHT, pong.BALL_SIZE, pong.BALL_START_SPEED, seed)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        left.rect.centery = int(balls.lead_y(-1))
+        right.rect.centery = int(balls.lead_y(1))
+        balls.update(left, right)
+        surface.fill(pong.BLACK)
+        balls.draw(surface)
+    return (time.perf_counter() - start) / ticks * 1000
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Multi-ball Pong tick benchmark')
+    parser.add_argument('--balls', type=int, default=1000)
+    parser.add_argument('--ticks', type=int, default=600)
+    args = parser.parse_args(argv)
+
+    ms = benchmark(args.balls, args.ticks)
+    budget = 1000 / 60
+    print(f'{args.balls} balls: {ms:.2f} ms per tick (physics + draw), '
+          f'{ms / budget:.0%} of the 60 FPS budget')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,504 @@
+"""
+Autopilot for SQL Snake (Snake Game 🐍.py)
+
+Drives any backend through the same calls a player makes. The board text
+from get_board() is parsed once at the start and again after each meal (to
+find the new food); in between, the autopilot tracks the body itself from
+the moves it made and the status strings step() returned.
+
+Move choice:
+
+  - Safety comes from a Hamiltonian cycle over the board (one exists when
+    rows or cols is even). Once the body lies on the cycle in order from
+    tail to head, the cells from the head forward to the tail along the
+    cycle are all free, so the snake can always reach its tail by following
+    the cycle. A neighbour of the head is a safe shortcut if it lies in that
+    free stretch (and does not skip past the food); of the safe neighbours
+    the one with the least of the cycle left to the food is taken. That is
+    O(1) per neighbour, so a move costs a few microseconds whatever the
+    board size, and the snake dives straight across rows while it is short
+    and settles into the cycle as it fills the board.
+  - When both sides are odd there is no such cycle, but there is one through
+    every cell except the top-left corner, the spare. The corner and the cell
+    diagonally inside it sit between the same two neighbours on that cycle,
+    so when food lands on the spare it is swapped onto the cycle as soon as
+    its stand-in is free, and the stand-in becomes the spare. The last meal
+    is eaten from wherever the head is when it is the only free cell.
+  - Until the body lies on the cycle (the first few moves), and on boards one
+    row high, moves are chosen by a BFS distance field from the food over
+    the free cells, and each candidate is checked with a BFS that the tail
+    can still be reached afterwards; that check never runs once the snake is
+    on the cycle. The field is rebuilt only when the food moves. When the
+    snake moves, the new head blocks one cell and the old tail frees one,
+    and only the cells whose distance depended on them are repaired: freeing
+    a cell spreads shorter distances outwards from it, and blocking one
+    invalidates the cells that had no other neighbour one step closer, then
+    refills them from their valid boundary. Without a cycle there is no
+    guarantee against trapping (a snake on a one-row board cannot turn).
+  - choose() returns None when every move would be fatal, and `stalled` is
+    set after STALL_ROUNDS times the board size moves without food; drive()
+    stops and reports 'trapped' or 'stalled' instead of walking into a wall
+    or circling forever.
+
+    pilot = Autopilot(backend.get_board(gid))
+    while not pilot.stalled:
+        direction = pilot.choose()
+        if direction is None:
+            break   # trapped
+        status = backend.step(gid, direction)
+        if status in ('dead', 'won'):
+            break
+        pilot.update(direction, status, backend.get_board(gid) if status == 'ate' else None)
+
+Watch it play, or play a whole game flat out:
+    python "Snake Game 🐍.py" --offline --autopilot
+    python "Snake Game 🐍.py" --backend sqlite --autopilot --delay 0
+
+Soak-test a backend at full step rate:
+    python snake_autopilot.py --backend native --rows 100 --cols 200 --steps 200000
+"""
+
+import heapq
+from array import array
+from collections import deque
+
+from snake_backend import BODY, FOOD, HEAD
+
+INF = 1 << 30
+STALL_ROUNDS = 4
+_DELTA_NAMES = {(0, 1): 'R', (0, -1): 'L', (1, 0): 'D', (-1, 0): 'U'}
+
+
+def hamiltonian_cycle(rows, cols):
+    """Cells r * cols + c in the order of a Hamiltonian cycle, or None if the board has none."""
+    if rows % 2 == 0 and cols >= 2:
+        order = [c for c in range(cols)]
+        for r in range(1, rows):
+            run = range(cols - 1, 0, -1) if r % 2 else range(1, cols)
+            order.extend(r * cols + c for c in run)
+        order.extend(r * cols for r in range(rows - 1, 0, -1))
+        return order
+    if cols % 2 == 0 and rows >= 2:
+        # same construction on the transposed board
+        return [(cell % rows) * cols + cell // rows for cell in hamiltonian_cycle(cols, rows)]
+    return None
+
+
+def near_hamiltonian_cycle(rows, cols):
+    """For odd rows and cols (both at least 3): a cycle through every cell but the corner 0.
+
+    The rows below the first take the even-board cycle, whose first stretch
+    runs along row 1; the cells (0, c), (0, c + 1) of the top row are spliced
+    in between (1, c) and (1, c + 1) for odd c. That leaves the corner out.
+    The corner and (1, 1) have the same two neighbours on the cycle, (1, 0)
+    and (0, 1), so either can stand in for the other at the same position.
+    """
+    lower = [cols + cell for cell in hamiltonian_cycle(rows - 1, cols)]
+    order = []
+    for cell in lower[:cols]:
+        order.append(cell)
+        c = cell - cols
+        if c % 2:
+            order.extend((c, c + 1))
+    order.extend(lower[cols:])
+    return order
+
+
+def parse_board(text):
+    """Return (rows, cols, body cells tail first, food cell or None) from get_board() text.
+
+    The order of the body is recovered by walking from the head through
+    neighbouring body cells, which is unambiguous for a fresh game's straight
+    snake.
+    """
+    lines = text.split('\n')
+    rows, cols = len(lines), len(lines[0])
+    flat = ''.join(lines)
+    head = flat.index(HEAD)
+    food = flat.find(FOOD)
+    body_cells = {i for i, ch in enumerate(flat) if ch == BODY}
+    body = [head]
+    cell = head
+    while body_cells:
+        r, c = divmod(cell, cols)
+        for dr, dc in _DELTA_NAMES:
+            rr, cc = r + dr, c + dc
+            n = rr * cols + cc
+            if 0 <= rr < rows and 0 <= cc < cols and n in body_cells:
+                body_cells.discard(n)
+                body.append(n)
+                cell = n
+                break
+        else:
+            raise ValueError('body cells are not connected to the head')
+    body.reverse()
+    return rows, cols, body, (food if food >= 0 else None)
+
+
+class Autopilot:
+    def __init__(self, board_text):
+        rows, cols, body, food = parse_board(board_text)
+        self.rows, self.cols = rows, cols
+        size = rows * cols
+        self.size = size
+        self.adj = []
+        self.move_name = {}
+        for cell in range(size):
+            r, c = divmod(cell, cols)
+            neighbours = []
+            for (dr, dc), name in _DELTA_NAMES.items():
+                rr, cc = r + dr, c + dc
+                if 0 <= rr < rows and 0 <= cc < cols:
+                    n = rr * cols + cc
+                    neighbours.append(n)
+                    self.move_name[cell, n] = name
+            self.adj.append(tuple(neighbours))
+
+        self.body = deque(body)
+        self.blocked = bytearray(size)
+        for cell in body:
+            self.blocked[cell] = 1
+        self.food = food
+
+        self.cycle = hamiltonian_cycle(rows, cols)
+        self.spare = None   # the cell left off a near-Hamiltonian cycle
+        if self.cycle is None and rows >= 3 and cols >= 3:
+            self.cycle = near_hamiltonian_cycle(rows, cols)
+            self.spare = 0
+        self.pos = None
+        self.on_cycle = False
+        if self.cycle is not None:
+            self.pos = self._cycle_pos(self.cycle)
+            # run the cycle in the direction that does not lead back into the neck
+            if len(body) > 1 and self.pos[body[-2]] == (self.pos[body[-1]] + 1) % len(self.cycle):
+                self.cycle.reverse()
+                self.pos = self._cycle_pos(self.cycle)
+            self.on_cycle = self._body_on_cycle()
+
+        # moves since the last meal; a cycle reaches the food within two rounds (one
+        # to free the spare's stand-in), so STALL_ROUNDS rounds without food is a stall
+        self.idle = 0
+        self.stall_limit = STALL_ROUNDS * size
+        self.dist = None
+        if not self.on_cycle:
+            self._rebuild()
+
+    def _cycle_pos(self, cycle):
+        """Position of every cell on the cycle, -1 for the cell left off it."""
+        pos = array('i', [-1]) * self.size
+        for i, cell in enumerate(cycle):
+            pos[cell] = i
+        return pos
+
+    def _body_on_cycle(self):
+        """True when the body cells appear along the cycle in order, tail first."""
+        pos, length = self.pos, len(self.cycle)
+        tail = pos[self.body[0]]
+        if tail < 0:
+            return False
+        last = 0
+        for cell in list(self.body)[1:]:
+            if pos[cell] < 0:
+                return False
+            rel = (pos[cell] - tail) % length
+            if rel <= last:
+                return False
+            last = rel
+        return True
+
+    def _take_in_spare(self):
+        """When the food is on the spare cell, swap it onto the cycle in place of its stand-in.
+
+        Only done while the stand-in is free: the two sit between the same
+        neighbours, so the body stays on the cycle in order and the stand-in
+        becomes the spare.
+        """
+        spare = self.spare
+        other = self.cols + 1 if spare == 0 else 0
+        if self.blocked[other]:
+            return
+        i = self.pos[other]
+        self.cycle[i] = spare
+        self.pos[spare], self.pos[other] = i, -1
+        self.spare = other
+
+    @property
+    def stalled(self):
+        """True once the snake has gone stall_limit moves without eating."""
+        return self.idle >= self.stall_limit
+
+    # ---- distance field ----
+
+    def _rebuild(self):
+        """Full BFS from the food over the free cells, one layer at a time."""
+        dist = array('i', [INF]) * self.size
+        self.dist = dist
+        if self.food is None:
+            return
+        adj = self.adj
+        seen = bytearray(self.blocked)
+        seen[self.food] = 1
+        dist[self.food] = 0
+        layer, d = [self.food], 0
+        while layer:
+            d += 1
+            following = []
+            for cell in layer:
+                for n in adj[cell]:
+                    if not seen[n]:
+                        seen[n] = 1
+                        dist[n] = d
+                        following.append(n)
+            layer = following
+
+    def _block(self, cell):
+        """Repair the field after `cell` (not the food) became blocked."""
+        dist, adj, blocked = self.dist, self.adj, self.blocked
+        old = dist[cell]
+        dist[cell] = INF
+        if old == INF:
+            return
+        # invalidate cells that relied on a lost cell and have no other support;
+        # a cell is rechecked each time one of its supporters is lost
+        lost = [(cell, old)]
+        for p, d in lost:
+            for n in adj[p]:
+                if blocked[n] or dist[n] != d + 1:
+                    continue
+                for m in adj[n]:
+                    if not blocked[m] and dist[m] == d:
+                        break
+                else:
+                    lost.append((n, d + 1))
+                    dist[n] = INF
+        if len(lost) == 1:
+            return
+        # refill the lost cells from their valid neighbours, nearest first
+        heap = []
+        for p, _ in lost[1:]:
+            best = min((dist[m] for m in adj[p] if not blocked[m]), default=INF)
+            if best < INF:
+                heap.append((best + 1, p))
+        heapq.heapify(heap)
+        while heap:
+            d, p = heapq.heappop(heap)
+            if d >= dist[p]:
+                continue
+            dist[p] = d
+            for n in adj[p]:
+                if not blocked[n] and dist[n] > d + 1:
+                    heapq.heappush(heap, (d + 1, n))
+
+    def _unblock(self, cell):
+        """Repair the field after `cell` became free."""
+        dist, adj, blocked = self.dist, self.adj, self.blocked
+        best = min((dist[m] for m in adj[cell] if not blocked[m]), default=INF)
+        if best == INF:
+            return
+        dist[cell] = best + 1
+        queue = [cell]
+        for p in queue:
+            d = dist[p] + 1
+            for n in adj[p]:
+                if not blocked[n] and dist[n] > d:
+                    dist[n] = d
+                    queue.append(n)
+
+    # ---- safety ----
+
+    def tail_reachable(self, cell):
+        """BFS check: after moving the head to `cell`, can the head still reach the tail?"""
+        body, blocked, adj = self.body, self.blocked, self.adj
+        eating = cell == self.food
+        tail = body[0]
+        target = tail if eating else body[1]
+        if not eating:
+            blocked[tail] = 0
+        blocked[cell] = 1
+        try:
+            seen = {cell}
+            queue = [cell]
+            for p in queue:
+                for n in adj[p]:
+                    if n == target:
+                        return True
+                    if n not in seen and not blocked[n]:
+                        seen.add(n)
+                        queue.append(n)
+            return False
+        finally:
+            blocked[cell] = 0
+            if not eating:
+                blocked[tail] = 1
+
+    def _choose_on_cycle(self, head):
+        pos, blocked = self.pos, self.blocked
+        size = len(self.cycle)
+        tail_pos = pos[self.body[0]]
+        rel_head = (pos[head] - tail_pos) % size
+        best = self.cycle[(pos[head] + 1) % size]
+        if self.food is None or pos[self.food] < 0:
+            return best
+        food_pos = pos[self.food]
+        rel_food = (food_pos - tail_pos) % size
+        # do not jump past the food when it is ahead of the head
+        limit = rel_food if rel_food > rel_head else size - 1
+        best_left = (food_pos - pos[best]) % size
+        for n in self.adj[head]:
+            if blocked[n] or pos[n] < 0:
+                continue
+            rel = (pos[n] - tail_pos) % size
+            if rel_head < rel <= limit:
+                left = (food_pos - pos[n]) % size
+                if left < best_left:
+                    best, best_left = n, left
+        return best
+
+    def _choose_checked(self, head):
+        """Closest free neighbour that keeps the tail reachable (the cycle successor first), or
+        None if every move is fatal."""
+        candidates = [n for n in self.adj[head] if not self.blocked[n] or n == self.body[0]]
+        if not candidates:
+            return None
+        candidates.sort(key=lambda n: self.dist[n])
+        if self.cycle is not None and self.pos[head] >= 0:
+            nxt = self.cycle[(self.pos[head] + 1) % len(self.cycle)]
+            if nxt in candidates:
+                candidates.remove(nxt)
+                candidates.insert(0, nxt)
+        for n in candidates:
+            if n == self.body[0] or self.tail_reachable(n):
+                return n
+        return candidates[0]
+
+    def choose(self):
+        """Direction ('U', 'D', 'L' or 'R') for the next step, or None when the snake is trapped
+        and every move would kill it."""
+        head = self.body[-1]
+        food = self.food
+        if food is not None and len(self.body) == self.size - 1 and food in self.adj[head]:
+            n = food    # the last meal fills the board
+        else:
+            if food is not None and food == self.spare:
+                self._take_in_spare()
+            if self.on_cycle:
+                n = self._choose_on_cycle(head)
+            else:
+                n = self._choose_checked(head)
+                if n is None:
+                    return None
+        return self.move_name[head, n]
+
+    def update(self, direction, status, board_text=None):
+        """Record the step just taken. After 'ate', pass the new get_board() text."""
+        if status in ('dead', 'won'):
+            return
+        head = self.body[-1]
+        r, c = divmod(head, self.cols)
+        dr, dc = next(d for d, name in _DELTA_NAMES.items() if name == direction)
+        cell = (r + dr) * self.cols + c + dc
+
+        if status == 'ate':
+            self.idle = 0
+            self.body.append(cell)
+            self.blocked[cell] = 1
+            if board_text is None:
+                raise ValueError("the board is needed after 'ate' to find the new food")
+            flat = board_text.replace('\n', '')
+            food = flat.find(FOOD)
+            self.food = food if food >= 0 else None
+            if not self.on_cycle:
+                self._rebuild()
+        else:
+            self.idle += 1
+            tail = self.body.popleft()
+            self.body.append(cell)
+            if cell != tail:
+                self.blocked[tail] = 0
+                self.blocked[cell] = 1
+                if not self.on_cycle:
+                    self._block(cell)
+                    self._unblock(tail)
+
+        if self.cycle is not None and not self.on_cycle:
+            self.on_cycle = self._body_on_cycle()
+            if self.on_cycle:
+                self.dist = None  # the cycle rule does not need the field
+
+
+def drive(backend, gid, steps=None, on_step=None):
+    """Play `gid` until it ends or `steps` moves are made. Returns (moves, meals, final status).
+
+    Besides the backend's statuses the result can be 'trapped' (every move
+    would kill the snake, so none is made) or 'stalled' (no food for
+    pilot.stall_limit moves).
+    """
+    pilot = Autopilot(backend.get_board(gid))
+    moves = meals = 0
+    status = 'ok'
+    while steps is None or moves < steps:
+        if pilot.stalled:
+            return moves, meals, 'stalled'
+        direction = pilot.choose()
+        if direction is None:
+            return moves, meals, 'trapped'
+        status = backend.step(gid, direction)
+        moves += 1
+        if status in ('dead', 'won'):
+            break
+        if status == 'ate':
+            meals += 1
+            pilot.update(direction, status, backend.get_board(gid))
+        else:
+            pilot.update(direction, status)
+        if on_step is not None:
+            on_step(status)
+    return moves, meals, status
+
+
+def main(argv=None):
+    import argparse
+    import time
+
+    from snake_backend import BACKENDS, make_backend
+
+    parser = argparse.ArgumentParser(description='Soak-test a Snake backend with the autopilot')
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='native')
+    parser.add_argument('--rows', type=int, default=100)
+    parser.add_argument('--cols', type=int, default=200)
+    parser.add_argument('--steps', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    options = {'seed': args.seed} if args.backend in ('native', 'sqlite') else {}
+    backend = make_backend(args.backend, **options)
+    gid = backend.init_game(args.rows, args.cols)
+
+    # time the autopilot on its own: wrap the backend calls and subtract them
+    backend_time = 0.0
+    step, get_board = backend.step, backend.get_board
+
+    def timed(func):
+        def call(*a):
+            nonlocal backend_time
+            start = time.perf_counter()
+            try:
+                return func(*a)
+            finally:
+                backend_time += time.perf_counter() - start
+        return call
+
+    backend.step, backend.get_board = timed(step), timed(get_board)
+    start = time.perf_counter()
+    moves, meals, status = drive(backend, gid, args.steps)
+    total = time.perf_counter() - start
+    backend.close()
+    pilot_us = (total - backend_time) / moves * 1e6
+    print(f'{args.rows}x{args.cols} on {args.backend}: {moves:,} moves, {meals:,} meals, '
+          f'final status {status!r}')
+    print(f'{moves / total:,.0f} steps/s overall; autopilot {pilot_us:.1f} us per move, '
+          f'backend {backend_time / moves * 1e6:.1f} us')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,307 @@
+"""
+Pluggable storage backends for SQL Snake (Snake Game 🐍.py)
+
+Every backend implements the same three operations the client uses:
+
+    init_game(rows, cols) -> gid
+    get_board(gid)        -> str   (one line per row)
+    step(gid, direction)  -> str   ('ok', 'ate', 'won' or 'dead')
+
+Backends:
+  - postgres: calls the `init_game` / `get_board` / `step` stored functions
+              on a live PostgreSQL server (needs psycopg2).
+  - sqlite:   the same game schema and rules in an embedded SQLite database,
+              either in memory or in a WAL-mode file. No server needed.
+  - native:   pure-Python in-memory engine (snake_engine.py), O(1) per move.
+
+Board characters: '.' empty, 'o' body, '@' head, '*' food.
+
+Benchmark a backend:
+    python snake_backend.py --backend sqlite --steps 20000
+"""
+
+import os
+import random
+import sqlite3
+import time
+
+DIRECTIONS = {
+    'U': (-1, 0),
+    'D': (1, 0),
+    'L': (0, -1),
+    'R': (0, 1),
+}
+OPPOSITE = {'U': 'D', 'D': 'U', 'L': 'R', 'R': 'L'}
+
+EMPTY, BODY, HEAD, FOOD = '.', 'o', '@', '*'
+
+
+def render_board(rows, cols, body, food):
+    """Render a board from body cells [(r, c), ...] (tail first, head last) and food (r, c) or None."""
+    board = [[EMPTY] * cols for _ in range(rows)]
+    for r, c in body:
+        board[r][c] = BODY
+    if body:
+        hr, hc = body[-1]
+        board[hr][hc] = HEAD
+    if food is not None:
+        board[food[0]][food[1]] = FOOD
+    return '\n'.join(''.join(row) for row in board)
+
+
+class SnakeBackend:
+    """Interface shared by all backends."""
+
+    def init_game(self, rows=10, cols=20):
+        raise NotImplementedError
+
+    def get_board(self, gid):
+        raise NotImplementedError
+
+    def step(self, gid, direction):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+# ---- PostgreSQL ----
+
+DB_PARAMS = {
+    'dbname': os.getenv('PGDATABASE', 'postgres'),
+    'user': os.getenv('PGUSER', 'postgres'),
+    'password': os.getenv('PGPASSWORD', 'postgres'),
+    'host': os.getenv('PGHOST', 'localhost'),
+    'port': int(os.getenv('PGPORT', '5432')),
+}
+
+
+class PostgresBackend(SnakeBackend):
+    """Server-side game logic in PostgreSQL stored functions."""
+
+    def __init__(self, **params):
+        import psycopg2 as pg
+        self.conn = pg.connect(**{**DB_PARAMS, **params})
+        self.conn.autocommit = True
+
+    def _call(self, sql, args):
+        with self.conn.cursor() as cur:
+            cur.execute(sql, args)
+            return cur.fetchone()[0]
+
+    def init_game(self, rows=10, cols=20):
+        return self._call("SELECT init_game(%s,%s)", (rows, cols))
+
+    def get_board(self, gid):
+        return self._call("SELECT get_board(%s)", (gid,))
+
+    def step(self, gid, direction):
+        return self._call("SELECT step(%s,%s)::text", (gid, direction))
+
+    def close(self):
+        self.conn.close()
+
+
+# ---- SQLite ----
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    gid INTEGER PRIMARY KEY,
+    rows INT NOT NULL,
+    cols INT NOT NULL,
+    dir CHAR(1) NOT NULL,
+    status VARCHAR(10) NOT NULL,
+    food_r INT,
+    food_c INT,
+    head_seq INT NOT NULL,
+    tail_seq INT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snake_cells (
+    gid INT NOT NULL,
+    seq INT NOT NULL,
+    r INT NOT NULL,
+    c INT NOT NULL,
+    PRIMARY KEY (gid, seq)
+);
+CREATE INDEX IF NOT EXISTS idx_snake_cells_pos ON snake_cells (gid, r, c);
+"""
+
+# Fixed statement texts so sqlite3's statement cache reuses the prepared statements.
+SQL_NEW_GAME = "INSERT INTO games (rows, cols, dir, status, head_seq, tail_seq) VALUES (?, ?, 'R', 'ok', 2, 0)"
+SQL_ADD_CELL = "INSERT INTO snake_cells (gid, seq, r, c) VALUES (?, ?, ?, ?)"
+SQL_GAME = "SELECT rows, cols, dir, status, food_r, food_c, head_seq, tail_seq FROM games WHERE gid = ?"
+SQL_CELL_AT_SEQ = "SELECT r, c FROM snake_cells WHERE gid = ? AND seq = ?"
+SQL_OCCUPIED = "SELECT seq FROM snake_cells WHERE gid = ? AND r = ? AND c = ?"
+SQL_DROP_TAIL = "DELETE FROM snake_cells WHERE gid = ? AND seq = ?"
+SQL_BODY = "SELECT r, c FROM snake_cells WHERE gid = ? ORDER BY seq"
+SQL_SET_FOOD = "UPDATE games SET food_r = ?, food_c = ? WHERE gid = ?"
+SQL_SET_STATUS = "UPDATE games SET status = ? WHERE gid = ?"
+SQL_MOVE = "UPDATE games SET dir = ?, status = ?, head_seq = ?, tail_seq = ? WHERE gid = ?"
+
+
+class SQLiteBackend(SnakeBackend):
+    """Embedded game logic on top of SQLite.
+
+    `path=':memory:'` keeps everything in process memory; a file path uses
+    WAL journaling so readers (e.g. a board viewer) don't block the stepper.
+    """
+
+    def __init__(self, path=':memory:', seed=None):
+        self.conn = sqlite3.connect(path, isolation_level=None, cached_statements=64)
+        if path != ':memory:':
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SQLITE_SCHEMA)
+        self.random = random.Random(seed)
+
+    def _place_food(self, gid, rows, cols, length):
+        if length >= rows * cols:
+            self.conn.execute(SQL_SET_FOOD, (None, None, gid))
+            return False
+        execute = self.conn.execute
+        while True:
+            r, c = self.random.randrange(rows), self.random.randrange(cols)
+            if execute(SQL_OCCUPIED, (gid, r, c)).fetchone() is None:
+                execute(SQL_SET_FOOD, (r, c, gid))
+                return True
+
+    def init_game(self, rows=10, cols=20):
+        if rows < 1 or cols < 3:
+            raise ValueError('board must be at least 1x3')
+        execute = self.conn.execute
+        execute('BEGIN')
+        gid = execute(SQL_NEW_GAME, (rows, cols)).lastrowid
+        r, c = rows // 2, max(2, cols // 2)
+        for seq in range(3):
+            execute(SQL_ADD_CELL, (gid, seq, r, c - 2 + seq))
+        self._place_food(gid, rows, cols, 3)
+        execute('COMMIT')
+        return gid
+
+    def get_board(self, gid):
+        execute = self.conn.execute
+        row = execute(SQL_GAME, (gid,)).fetchone()
+        if row is None:
+            raise KeyError(gid)
+        rows, cols, _, _, food_r, food_c, _, _ = row
+        body = execute(SQL_BODY, (gid,)).fetchall()
+        food = (food_r, food_c) if food_r is not None else None
+        return render_board(rows, cols, body, food)
+
+    def step(self, gid, direction):
+        execute = self.conn.execute
+        execute('BEGIN')
+        try:
+            status = self._step(gid, direction)
+        except BaseException:
+            execute('ROLLBACK')
+            raise
+        execute('COMMIT')
+        return status
+
+    def _step(self, gid, direction):
+        execute = self.conn.execute
+        row = execute(SQL_GAME, (gid,)).fetchone()
+        if row is None:
+            raise KeyError(gid)
+        rows, cols, current, status, food_r, food_c, head_seq, tail_seq = row
+        if status in ('dead', 'won'):
+            return status
+
+        if direction not in DIRECTIONS or direction == OPPOSITE[current]:
+            direction = current
+        dr, dc = DIRECTIONS[direction]
+        hr, hc = execute(SQL_CELL_AT_SEQ, (gid, head_seq)).fetchone()
+        nr, nc = hr + dr, hc + dc
+
+        if not (0 <= nr < rows and 0 <= nc < cols):
+            execute(SQL_SET_STATUS, ('dead', gid))
+            return 'dead'
+
+        ate = (nr, nc) == (food_r, food_c)
+        hit = execute(SQL_OCCUPIED, (gid, nr, nc)).fetchone()
+        # Moving into the cell the tail is leaving is fine unless we grow.
+        if hit is not None and (ate or hit[0] != tail_seq):
+            execute(SQL_SET_STATUS, ('dead', gid))
+            return 'dead'
+
+        if not ate:
+            execute(SQL_DROP_TAIL, (gid, tail_seq))
+            tail_seq += 1
+        head_seq += 1
+        execute(SQL_ADD_CELL, (gid, head_seq, nr, nc))
+
+        status = 'ok'
+        if ate:
+            status = 'ate' if self._place_food(gid, rows, cols, head_seq - tail_seq + 1) else 'won'
+        execute(SQL_MOVE, (direction, status, head_seq, tail_seq, gid))
+        return status
+
+    def close(self):
+        self.conn.close()
+
+
+def NativeBackend(seed=None):
+    from snake_engine import SnakeEngine
+    return SnakeEngine(seed=seed)
+
+
+BACKENDS = {
+    'postgres': PostgresBackend,
+    'sqlite': SQLiteBackend,
+    'native': NativeBackend,
+}
+
+
+def make_backend(name, **options):
+    """Instantiate a backend by name, e.g. make_backend('sqlite', path=':memory:')."""
+    try:
+        cls = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"unknown backend {name!r}; choose from {', '.join(BACKENDS)}") from None
+    return cls(**options)
+
+
+# ---- Benchmark ----
+
+def benchmark(backend, steps=10000, rows=10, cols=20, seed=0):
+    """Drive `backend` with pseudo-random moves; return mean seconds per step and per get_board."""
+    rng = random.Random(seed)
+    gid = backend.init_game(rows, cols)
+    step_time = board_time = 0.0
+    for i in range(steps):
+        direction = rng.choice('UDLR')
+        start = time.perf_counter()
+        status = backend.step(gid, direction)
+        step_time += time.perf_counter() - start
+        if i % 10 == 0:
+            start = time.perf_counter()
+            backend.get_board(gid)
+            board_time += time.perf_counter() - start
+        if status in ('dead', 'won'):
+            gid = backend.init_game(rows, cols)
+    return step_time / steps, board_time / ((steps + 9) // 10)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark Snake backends')
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='sqlite')
+    parser.add_argument('--db', default=':memory:', help='SQLite database path')
+    parser.add_argument('--steps', type=int, default=10000)
+    parser.add_argument('--rows', type=int, default=10)
+    parser.add_argument('--cols', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    options = {'path': args.db} if args.backend == 'sqlite' else {}
+    backend = make_backend(args.backend, **options)
+    try:
+        per_step, per_board = benchmark(backend, args.steps, args.rows, args.cols)
+    finally:
+        backend.close()
+    print(f'{args.backend}: step {per_step * 1e6:.1f} us, get_board {per_board * 1e6:.1f} us')
+
+
+if __name__ == '__main__':
+    main()
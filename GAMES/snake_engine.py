@@ -0,0 +1,143 @@
+"""
+Native in-memory Snake engine
+
+Same contract as the SQL backends in snake_backend.py:
+
+    init_game(rows, cols) -> gid
+    step(gid, direction)  -> 'ok' | 'ate' | 'won' | 'dead'
+    get_board(gid)        -> str
+
+Cells are numbered r * cols + c. Per game the engine keeps
+
+  - the body as a deque of cell numbers (tail at the left, head at the right),
+  - an occupancy bytearray, so self-collision is one index lookup,
+  - a free-cell index (a list of free cells plus each cell's position in that
+    list), so a cell is taken or released with a swap-remove and food is
+    placed with one random index instead of retry sampling.
+
+Every move is O(1). One engine hosts any number of games keyed by gid, which
+makes it suitable for offline play and for bots stepping thousands of games.
+"""
+
+import random
+from collections import deque
+from itertools import count
+
+from snake_backend import DIRECTIONS, OPPOSITE, SnakeBackend, EMPTY, BODY, HEAD, FOOD
+
+_EMPTY, _BODY, _HEAD, _FOOD = (ord(ch) for ch in (EMPTY, BODY, HEAD, FOOD))
+
+
+class _Game:
+    __slots__ = ('rows', 'cols', 'body', 'occupied', 'free', 'free_pos',
+                 'food', 'dir', 'status')
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        size = rows * cols
+        self.body = deque()
+        self.occupied = bytearray(size)
+        self.free = list(range(size))
+        self.free_pos = list(range(size))
+        self.food = None
+        self.dir = 'R'
+        self.status = 'ok'
+
+    def take(self, cell):
+        free, free_pos = self.free, self.free_pos
+        i = free_pos[cell]
+        last = free.pop()
+        if last != cell:
+            free[i] = last
+            free_pos[last] = i
+        self.occupied[cell] = 1
+
+    def release(self, cell):
+        self.free_pos[cell] = len(self.free)
+        self.free.append(cell)
+        self.occupied[cell] = 0
+
+
+class SnakeEngine(SnakeBackend):
+    """Many Snake games in one process, O(1) per move."""
+
+    def __init__(self, seed=None):
+        self.games = {}
+        self.random = random.Random(seed)
+        self._ids = count(1)
+
+    def _place_food(self, game):
+        if not game.free:
+            game.food = None
+            return False
+        game.food = game.free[int(self.random.random() * len(game.free))]
+        return True
+
+    def init_game(self, rows=10, cols=20):
+        if rows < 1 or cols < 3:
+            raise ValueError('board must be at least 1x3')
+        game = _Game(rows, cols)
+        r, c = rows // 2, max(2, cols // 2)
+        for cc in range(c - 2, c + 1):
+            cell = r * cols + cc
+            game.take(cell)
+            game.body.append(cell)
+        self._place_food(game)
+        gid = next(self._ids)
+        self.games[gid] = game
+        return gid
+
+    def drop_game(self, gid):
+        """Forget a finished game."""
+        del self.games[gid]
+
+    def step(self, gid, direction):
+        game = self.games[gid]
+        if game.status in ('dead', 'won'):
+            return game.status
+
+        if direction not in DIRECTIONS or direction == OPPOSITE[game.dir]:
+            direction = game.dir
+        game.dir = direction
+        dr, dc = DIRECTIONS[direction]
+
+        cols = game.cols
+        head = game.body[-1]
+        r, c = divmod(head, cols)
+        r += dr
+        c += dc
+        if not (0 <= r < game.rows and 0 <= c < cols):
+            game.status = 'dead'
+            return 'dead'
+
+        cell = r * cols + c
+        ate = cell == game.food
+        # The tail moves out first unless we grow, so chasing it is allowed.
+        tail = game.body[0]
+        if game.occupied[cell] and (ate or cell != tail):
+            game.status = 'dead'
+            return 'dead'
+        if not ate:
+            game.body.popleft()
+            game.release(tail)
+
+        game.take(cell)
+        game.body.append(cell)
+        if ate:
+            game.status = 'ate' if self._place_food(game) else 'won'
+        else:
+            game.status = 'ok'
+        return game.status
+
+    def get_board(self, gid):
+        game = self.games[gid]
+        cols = game.cols
+        board = bytearray([_EMPTY]) * (game.rows * cols)
+        for cell in game.body:
+            board[cell] = _BODY
+        board[game.body[-1]] = _HEAD
+        if game.food is not None:
+            board[game.food] = _FOOD
+        text = board.decode('ascii')
+        return '\n'.join(text[i:i + cols] for i in range(0, len(text), cols))
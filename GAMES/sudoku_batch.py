@@ -0,0 +1,303 @@
+"""
+Batch Sudoku validation and solving with NumPy
+
+`Sudoku.py` checks and solves one list-of-lists grid at a time. For puzzle
+dumps with millions of grids this module works on a whole (N, 9, 9) uint8
+array at once:
+
+  - validate():  one-hot encode every cell and count digits per row, column
+                 and 3x3 box for all grids in a few array operations.
+  - propagate(): constraint propagation (naked and hidden singles) across
+                 the whole batch until nothing changes.
+  - solve():     propagate, then fall back to a per-puzzle bitmask search
+                 only for the grids that propagation left unsolved.
+
+Puzzles are 81-character strings, one per line, with '0' or '.' for blanks.
+
+Benchmark:
+    python sudoku_batch.py --count 100000
+    python sudoku_batch.py puzzles.txt
+"""
+
+import time
+
+import numpy as np
+
+DIGITS = np.arange(1, 10, dtype=np.uint8)
+
+# status codes returned by solve()
+SOLVED_BY_PROPAGATION = 0
+SOLVED_BY_SEARCH = 1
+UNSOLVABLE = -1
+
+# byte value -> cell value ('.' and '0' are blanks)
+_DECODE = np.zeros(256, dtype=np.uint8)
+_DECODE[ord('1'):ord('9') + 1] = DIGITS
+
+
+# ---- Loading ----
+
+def load_puzzles(lines):
+    """Convert an iterable of 81-character puzzle strings to an (N, 9, 9) uint8 array."""
+    text = ''.join(line.strip() for line in lines if line.strip())
+    raw = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+    if raw.size % 81:
+        raise ValueError('every puzzle must have exactly 81 cells')
+    return _DECODE[raw].reshape(-1, 9, 9)
+
+
+def load_file(path):
+    with open(path) as f:
+        return load_puzzles(f)
+
+
+def from_grids(grids):
+    """Convert a list of Sudoku.py style list-of-lists grids to an (N, 9, 9) array."""
+    return np.asarray(grids, dtype=np.uint8).reshape(-1, 9, 9)
+
+
+def to_strings(grids):
+    """Inverse of load_puzzles (blanks as '.')."""
+    chars = np.frombuffer(b'.123456789', dtype=np.uint8)[grids.reshape(-1, 81)]
+    return [row.tobytes().decode('ascii') for row in chars]
+
+
+# ---- Validation ----
+
+def _one_hot(grids):
+    """(N, 9, 9) -> (N, 9, 9, 9) bool, last axis is the digit 1..9."""
+    return grids[..., None] == DIGITS
+
+
+def _box_view(a):
+    """(N, 9, 9, ...) -> (N, 3, 3, 3, 3, ...) with axes (band, row, stack, col)."""
+    return a.reshape((a.shape[0], 3, 3, 3, 3) + a.shape[3:])
+
+
+def validate(grids):
+    """Return a bool array: True where no row, column or box repeats a digit.
+
+    Blanks are allowed; use is_solved() to also require a full grid.
+    """
+    grids = np.asarray(grids, dtype=np.uint8).reshape(-1, 9, 9)
+    oh = _one_hot(grids).view(np.uint8)
+    ok = (grids <= 9).all(axis=(1, 2))
+    ok &= (oh.sum(axis=2) <= 1).all(axis=(1, 2))
+    ok &= (oh.sum(axis=1) <= 1).all(axis=(1, 2))
+    ok &= (_box_view(oh).sum(axis=(2, 4)) <= 1).all(axis=(1, 2, 3))
+    return ok
+
+
+def is_solved(grids):
+    grids = np.asarray(grids, dtype=np.uint8).reshape(-1, 9, 9)
+    return validate(grids) & (grids != 0).all(axis=(1, 2))
+
+
+# ---- Constraint propagation ----
+
+def candidates(grids):
+    """(N, 9, 9, 9) bool: digit d+1 is still allowed in an empty cell."""
+    oh = _one_hot(grids)
+    used = oh.any(axis=2)[:, :, None, :] | oh.any(axis=1)[:, None, :, :]
+    box_used = _box_view(oh).any(axis=(2, 4))            # (N, 3, 3, 9)
+    used = used | np.repeat(np.repeat(box_used, 3, axis=1), 3, axis=2)
+    return ~used & (grids == 0)[..., None]
+
+
+def _unit_views(cand):
+    """Yield (view, to_cell) for rows, columns and boxes.
+
+    `view` has shape (N, unit, position, digit); `to_cell(unit, position)`
+    maps back to (row, col).
+    """
+    yield cand, lambda u, p: (u, p)
+    yield cand.transpose(0, 2, 1, 3), lambda u, p: (p, u)
+    boxes = _box_view(cand).transpose(0, 1, 3, 2, 4, 5).reshape(cand.shape)
+    yield boxes, lambda u, p: ((u // 3) * 3 + p // 3, (u % 3) * 3 + p % 3)
+
+
+def propagate(grids, max_rounds=81):
+    """Apply naked and hidden singles in place until a fixed point.
+
+    Returns a bool array marking grids that are contradictory (a repeated
+    digit, or an empty cell with no candidates left).
+
+    All singles found in one round are written together. Two singles can
+    only disagree about a cell when the puzzle has no solution, and such
+    grids are caught by the contradiction checks.
+    """
+    dead = ~validate(grids)
+    active = np.nonzero(~dead)[0]
+
+    for _ in range(max_rounds):
+        if active.size == 0:
+            break
+        sub = grids[active]
+        cand = candidates(sub)
+        empty = sub == 0
+        count = cand.sum(axis=3)
+        stuck = (empty & (count == 0)).any(axis=(1, 2))
+
+        before = sub.copy()
+        single = empty & (count == 1)
+        sub[single] = cand[single].argmax(axis=1).astype(np.uint8) + 1
+
+        for view, to_cell in _unit_views(cand):
+            n, unit, digit = np.nonzero(view.sum(axis=2) == 1)
+            if n.size:
+                pos = view[n, unit, :, digit].argmax(axis=1)
+                rows, cols = to_cell(unit, pos)
+                sub[n, rows, cols] = digit + 1
+
+        changed = (sub != before).any(axis=(1, 2))
+        grids[active] = sub
+        dead[active[stuck]] = True
+        active = active[changed & ~stuck]
+
+    return dead | ~validate(grids)
+
+
+# ---- Per-puzzle fallback search ----
+
+_CELL_UNITS = [(i // 9, i % 9, (i // 27) * 3 + (i % 9) // 3) for i in range(81)]
+_POPCOUNT = [bin(m).count('1') for m in range(1024)]
+
+
+def _search(cells, rows, cols, boxes):
+    """Depth-first search with bitmasks, picking the most constrained cell first."""
+    best = None
+    best_count = 10
+    best_mask = 0
+    for i in range(81):
+        if cells[i]:
+            continue
+        r, c, b = _CELL_UNITS[i]
+        mask = ~(rows[r] | cols[c] | boxes[b]) & 0x3FE
+        count = _POPCOUNT[mask]
+        if count < best_count:
+            best, best_count, best_mask = i, count, mask
+            if count <= 1:
+                break
+    if best is None:
+        return True
+    if best_count == 0:
+        return False
+
+    r, c, b = _CELL_UNITS[best]
+    mask = best_mask
+    while mask:
+        bit = mask & -mask
+        mask ^= bit
+        cells[best] = bit.bit_length() - 1
+        rows[r] |= bit
+        cols[c] |= bit
+        boxes[b] |= bit
+        if _search(cells, rows, cols, boxes):
+            return True
+        rows[r] ^= bit
+        cols[c] ^= bit
+        boxes[b] ^= bit
+    cells[best] = 0
+    return False
+
+
+def solve_one(grid):
+    """Solve one (9, 9) grid in place. Returns True on success."""
+    cells = [int(v) for v in grid.reshape(81)]
+    rows, cols, boxes = [0] * 9, [0] * 9, [0] * 9
+    for i, v in enumerate(cells):
+        if v:
+            r, c, b = _CELL_UNITS[i]
+            bit = 1 << v
+            rows[r] |= bit
+            cols[c] |= bit
+            boxes[b] |= bit
+    if not _search(cells, rows, cols, boxes):
+        return False
+    grid[...] = np.asarray(cells, dtype=np.uint8).reshape(9, 9)
+    return True
+
+
+def solve(grids):
+    """Solve a batch. Returns (solutions, status) where status is one of
+    SOLVED_BY_PROPAGATION, SOLVED_BY_SEARCH or UNSOLVABLE per grid."""
+    grids = np.array(grids, dtype=np.uint8).reshape(-1, 9, 9)
+    status = np.full(grids.shape[0], SOLVED_BY_PROPAGATION, dtype=np.int8)
+
+    dead = propagate(grids)
+    status[dead] = UNSOLVABLE
+
+    open_ = ~dead & (grids == 0).any(axis=(1, 2))
+    for i in np.nonzero(open_)[0]:
+        status[i] = SOLVED_BY_SEARCH if solve_one(grids[i]) else UNSOLVABLE
+    return grids, status
+
+
+# ---- Benchmark ----
+
+HARD_PUZZLES = [
+    '8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..',
+    '..53.....8......2..7..1.5..4....53...1..7...6..32...8..6.5....9..4....3......97..',
+    '4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......',
+    '52...6.........7.13...........4..8..6......5...........418.........3..2...87.....',
+    '1.......2.9.4...5...6...7...5.9.3.......7.......85..4.7.....6...3...9.8...2.....1',
+]
+
+BASE_SOLUTION = '534678912672195348198342567859761423426853791713924856961537284287419635345286179'
+
+
+def random_puzzles(count, blanks=50, seed=0):
+    """Make `count` puzzles by shuffling a solved grid with Sudoku symmetries and blanking cells."""
+    rng = np.random.default_rng(seed)
+    base = load_puzzles([BASE_SOLUTION])[0]
+    out = np.empty((count, 9, 9), dtype=np.uint8)
+    for i in range(count):
+        relabel = np.concatenate(([0], rng.permutation(9) + 1)).astype(np.uint8)
+        rows = (rng.permutation(3)[:, None] * 3 + np.array([rng.permutation(3) for _ in range(3)])).reshape(9)
+        cols = (rng.permutation(3)[:, None] * 3 + np.array([rng.permutation(3) for _ in range(3)])).reshape(9)
+        grid = relabel[base[rows][:, cols]]
+        if rng.random() < 0.5:
+            grid = grid.T
+        out[i] = grid
+    mask = rng.random((count, 9, 9)) < blanks / 81
+    out[mask] = 0
+    return out
+
+
+def benchmark(grids):
+    n = grids.shape[0]
+    start = time.perf_counter()
+    validate(grids)
+    t_valid = time.perf_counter() - start
+
+    start = time.perf_counter()
+    solved, status = solve(grids)
+    t_solve = time.perf_counter() - start
+
+    ok = is_solved(solved[status >= 0]).all()
+    print(f'{n:,} puzzles')
+    print(f'  validate: {t_valid:8.3f}s  {n / t_valid:>14,.0f} grids/s')
+    print(f'  solve:    {t_solve:8.3f}s  {n / t_solve:>14,.0f} grids/s  '
+          f'(propagation {np.count_nonzero(status == SOLVED_BY_PROPAGATION):,}, '
+          f'search {np.count_nonzero(status == SOLVED_BY_SEARCH):,}, '
+          f'unsolvable {np.count_nonzero(status == UNSOLVABLE):,}, all valid: {ok})')
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Batch Sudoku validation/solving benchmark')
+    parser.add_argument('file', nargs='?', help='puzzle file, one 81-character puzzle per line')
+    parser.add_argument('--count', type=int, default=20000, help='random puzzles when no file is given')
+    parser.add_argument('--blanks', type=int, default=50)
+    args = parser.parse_args(argv)
+
+    if args.file:
+        grids = load_file(args.file)
+    else:
+        grids = np.concatenate([random_puzzles(args.count, args.blanks), load_puzzles(HARD_PUZZLES)])
+    benchmark(grids)
+
+
+if __name__ == '__main__':
+    main()
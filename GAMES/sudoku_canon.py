@@ -0,0 +1,539 @@
+"""
+Canonical forms and a dedup index for Sudoku puzzles
+
+Two grids are the same puzzle if one turns into the other by relabeling the
+digits, permuting bands, rows within a band, stacks, columns within a stack,
+or transposing (rotations and reflections are combinations of these).
+canonical_form() maps every grid to the lexicographically smallest grid in
+its class, reading row by row with blanks as 0.
+
+The search builds the output one row at a time and keeps only the partial
+transformations whose prefix ties for the minimum. Digits are relabeled in
+order of first appearance, which is the smallest labeling for a given cell
+order. The smallest first row only fixes where its blanks go, so the column
+order is not enumerated up front: a column is placed when a later row first
+needs it, each cell is compared with the best row so far as soon as it is
+known, and a branch stops at the first cell that compares greater. Columns
+that are blank in every row read so far are kept together instead of
+ordered, so mostly blank grids do not multiply the ties. A full grid takes
+about 12 ms, a puzzle, however few its clues, about 1 ms.
+
+PuzzleStore keeps canonical puzzles in an SQLite table keyed by a 16-byte
+hash of the canonical form, so duplicate checks and cached solutions are one
+primary-key lookup however many puzzles are stored.
+
+    store = PuzzleStore('puzzles.db')
+    store.add(grid)                      # False if an equivalent puzzle exists
+    store.solution(grid) or store.put_solution(grid, solve(grid))
+"""
+
+import hashlib
+import sqlite3
+
+
+def _flatten(grid):
+    """Accept an 81-character string or a 9x9 list of lists; return a tuple of 81 ints."""
+    if isinstance(grid, str):
+        cells = tuple(int(ch) if ch.isdigit() else 0 for ch in grid)
+    else:
+        cells = tuple(int(v) for row in grid for v in row)
+    if len(cells) != 81:
+        raise ValueError('a Sudoku grid has 81 cells')
+    return cells
+
+
+def _rows(cells, transpose):
+    if transpose:
+        return [tuple(cells[c * 9 + r] for c in range(9)) for r in range(9)]
+    return [cells[r * 9:r * 9 + 9] for r in range(9)]
+
+
+def _allowed_rows(used):
+    """Source rows that may come next given the rows already placed."""
+    k = len(used)
+    if k % 3:
+        band = used[-1] // 3
+        return [r for r in range(band * 3, band * 3 + 3) if r not in used]
+    bands = {r // 3 for r in used}
+    return [r for b in range(3) if b not in bands for r in range(b * 3, b * 3 + 3)]
+
+
+def _stack_blanks(row):
+    return [3 - bool(row[3 * s]) - bool(row[3 * s + 1]) - bool(row[3 * s + 2]) for s in range(3)]
+
+
+# trail entries: what an assignment changed, so _undo() can put it back
+_PLACE, _LABEL, _BIND, _GROUP = range(4)
+
+
+class _FirstRow:
+    """Searches that start the output with source row `first` of `rows`.
+
+    The first output row only depends on where its blanks go: stacks with the
+    most blanks first, blanks first within a stack, and the digits relabeled
+    1, 2, 3, ... in order. Which of its columns goes where is left open and
+    decided cell by cell while the later rows are read:
+
+      - an output column that is still open when a cell of it is read is
+        branched on, over the source columns that keep the first row's
+        pattern and the stack structure;
+      - a digit that also appears in the first row is labeled by the output
+        position of that column. If that column is still open, it is put in
+        the earliest free position it can take, the only choice that gives
+        the smallest label;
+      - the columns that are blank in the first row are not branched on one
+        by one. Those of an output stack form a group at the front of the
+        stack that holds every column still blank in all rows read so far,
+        in no particular order. Each row read splits the group: its blanks
+        stay in front, the other columns take the next positions smallest
+        label first, so only columns that tie for a cell are branched on.
+
+    A blank row reads as zeros whatever the column order and leaves the
+    state as it is; any other row places every column, or leaves it in a
+    group of columns that are blank in every row read. A search state is
+    (first row, rows used, pos, col_at, stack_at, slot_of_stack, labels,
+    next_label, groups); extend() loads one, tries every allowed next row on
+    it, and records the extensions that tie for the smallest row so far.
+
+    Rows or stacks holding the same cells give the same extensions, so only
+    the first of them is tried.
+    """
+
+    def __init__(self, t, rows, first):
+        self.t, self.rows = t, rows
+        row1 = rows[first]
+        self.blanks = _stack_blanks(row1)
+        self.slot_blanks = sorted(self.blanks, reverse=True)
+        self.blank_slot = [j % 3 < self.slot_blanks[j // 3] for j in range(9)]
+        self.blank_col = [not v for v in row1]
+        self.rank = [0] * 9
+        k = 0
+        for j in range(9):
+            if not self.blank_slot[j]:
+                k += 1
+                self.rank[j] = k
+        self.first_col = [-1] * 10
+        for c, v in enumerate(row1):
+            if v:
+                self.first_col[v] = c
+        cols = list(zip(*rows))
+        self.band_cells = [tuple(sorted(rows[3 * b:3 * b + 3])) for b in range(3)]
+        self.stack_cells = [tuple(sorted(cols[3 * s:3 * s + 3])) for s in range(3)]
+        self.first = first
+        self.out = [0] * 9
+        self.trail = []
+
+    def start(self):
+        # source column -> output column, output column -> source column,
+        # output stack -> source stack and back, labels of digits missing
+        # from the first row, the blank group of each output stack
+        return (self, (self.first,), [-1] * 9, [-1] * 9, [-1] * 3, [-1] * 3, [0] * 10, max(self.rank) + 1,
+                (None,) * 3)
+
+    def extend(self, state, found):
+        _, used, pos, col_at, stack_at, slot_of_stack, labels, next_label, groups = state
+        self.pos, self.col_at = pos[:], col_at[:]
+        self.stack_at, self.slot_of_stack = stack_at[:], slot_of_stack[:]
+        self.labels, self.next_label = labels[:], next_label
+        self.groups = list(groups)
+        # swapping two equal rows of a band, or two equal bands, maps the
+        # grid onto itself, so equal candidates extend the same way
+        new_band = len(used) % 3 == 0
+        tried = set()
+        for r in _allowed_rows(used):
+            key = (self.band_cells[r // 3], self.rows[r]) if new_band else self.rows[r]
+            if key in tried:
+                continue
+            tried.add(key)
+            self.used = used + (r,)
+            self.less = found['row'] is None
+            if any(self.rows[r]):
+                self._cell(0, self.rows[r], found)
+            else:
+                # a blank row reads the same whatever the column order
+                self.less = self.less or any(found['row'])
+                self.out = [0] * 9
+                self._done(found)
+
+    # ---- assignments, undone through the trail ----
+
+    def _place(self, c, j):
+        self.pos[c] = j
+        self.col_at[j] = c
+        stack = j // 3
+        bound = self.stack_at[stack] < 0
+        if bound:
+            self.stack_at[stack] = c // 3
+            self.slot_of_stack[c // 3] = stack
+        self.trail.append((_PLACE, c, bound))
+
+    def _undo(self, mark):
+        trail = self.trail
+        while len(trail) > mark:
+            kind, a, b = trail.pop()
+            if kind == _PLACE:
+                j = self.pos[a]
+                self.pos[a] = self.col_at[j] = -1
+                if b:
+                    self.stack_at[j // 3] = -1
+                    self.slot_of_stack[a // 3] = -1
+            elif kind == _LABEL:
+                self.labels[a] = 0
+                self.next_label -= 1
+            elif kind == _BIND:
+                self.slot_of_stack[self.stack_at[a]] = -1
+                self.stack_at[a] = -1
+            else:
+                self.groups[a] = b
+
+    def _earliest(self, c):
+        """The first free digit position source column `c` can still take."""
+        stack = self.slot_of_stack[c // 3]
+        if stack < 0:
+            blanks = self.blanks[c // 3]
+            stack = 0
+            while self.stack_at[stack] >= 0 or self.slot_blanks[stack] != blanks:
+                stack += 1
+        j = 3 * stack + self.slot_blanks[stack]
+        while self.col_at[j] >= 0:
+            j += 1
+        return j
+
+    def _label(self, v):
+        """The label digit `v` would get if it were read now."""
+        c1 = self.first_col[v]
+        if c1 >= 0:
+            return self.rank[self.pos[c1] if self.pos[c1] >= 0 else self._earliest(c1)]
+        return self.labels[v] or self.next_label
+
+    # ---- one output row ----
+
+    def _cell(self, j, row, found):
+        if j == 9:
+            self._done(found)
+            return
+        c = self.col_at[j]
+        if c >= 0:
+            self._visit(j, row, c, found)
+            return
+        if self.blank_slot[j]:
+            if j % 3:
+                self._split_off(j, row, found)
+            else:
+                self._group(j, row, found)
+            return
+        stack = self.stack_at[j // 3]
+        for c in (range(3 * stack, 3 * stack + 3) if stack >= 0 else range(9)):
+            if self.pos[c] >= 0 or self.blank_col[c]:
+                continue
+            if stack < 0 and (self.slot_of_stack[c // 3] >= 0
+                              or self.blanks[c // 3] != self.slot_blanks[j // 3]):
+                continue
+            mark = len(self.trail)
+            self._place(c, j)
+            self._visit(j, row, c, found)
+            self._undo(mark)
+
+    def _group(self, j, row, found):
+        """Read the blank group at the front of output stack j // 3."""
+        s = j // 3
+        if self.groups[s] is not None:
+            self._split(j, self.groups[s], row, found)
+            return
+        stack = self.stack_at[s]
+        if stack >= 0:
+            choices = [stack]
+        else:
+            # swapping two stacks with the same columns maps the grid onto itself
+            choices, seen = [], set()
+            for source in range(3):
+                if (self.slot_of_stack[source] < 0 and self.blanks[source] == self.slot_blanks[s]
+                        and self.stack_cells[source] not in seen):
+                    seen.add(self.stack_cells[source])
+                    choices.append(source)
+        for source in choices:
+            mark = len(self.trail)
+            if stack < 0:
+                self.stack_at[s] = source
+                self.slot_of_stack[source] = s
+                self.trail.append((_BIND, s, None))
+            self._split(j, tuple(c for c in range(3 * source, 3 * source + 3) if self.blank_col[c]), row, found)
+            self._undo(mark)
+
+    def _split(self, j, group, row, found):
+        """Keep the columns of `group` that are blank in `row` as the group, in front."""
+        s = j // 3
+        mark = len(self.trail)
+        blank = tuple(c for c in group if not row[c])
+        if blank != self.groups[s]:
+            self.trail.append((_GROUP, s, self.groups[s]))
+            self.groups[s] = blank
+        end = j + len(blank)
+        for k in range(j, end):
+            self.out[k] = 0
+        # blanks never compare greater, so the first one under a digit wins
+        diverged = not self.less and any(found['row'][j:end])
+        if diverged:
+            self.less = True
+        if len(blank) < len(group):
+            self._split_off(end, row, found)
+        else:
+            self._cell(end, row, found)
+        if diverged:
+            self.less = False
+        self._undo(mark)
+
+    def _split_off(self, j, row, found):
+        """Place at j a column split off its stack's group, smallest label first."""
+        s = j // 3
+        stack, group = self.stack_at[s], self.groups[s]
+        candidates = [c for c in range(3 * stack, 3 * stack + 3)
+                      if self.blank_col[c] and self.pos[c] < 0 and c not in group]
+        labels = [self._label(row[c]) for c in candidates]
+        low = min(labels)
+        for c, label in zip(candidates, labels):
+            if label == low:
+                mark = len(self.trail)
+                self._place(c, j)
+                self._visit(j, row, c, found)
+                self._undo(mark)
+
+    def _visit(self, j, row, c, found):
+        mark = len(self.trail)
+        v = row[c]
+        if v:
+            c1 = self.first_col[v]
+            if c1 >= 0:
+                if self.pos[c1] < 0:
+                    self._place(c1, self._earliest(c1))
+                v = self.rank[self.pos[c1]]
+            elif self.labels[v]:
+                v = self.labels[v]
+            else:
+                self.labels[v] = self.next_label
+                self.trail.append((_LABEL, v, None))
+                v = self.next_label
+                self.next_label += 1
+
+        diverged = False
+        if not self.less:
+            b = found['row'][j]
+            if v > b:
+                if len(self.trail) > mark:
+                    self._undo(mark)
+                return
+            diverged = v < b
+        self.out[j] = v
+        if diverged:
+            self.less = True
+            self._cell(j + 1, row, found)
+            self.less = False
+        else:
+            self._cell(j + 1, row, found)
+        if len(self.trail) > mark:
+            self._undo(mark)
+
+    def _done(self, found):
+        state = (self, self.used, self.pos[:], self.col_at[:], self.stack_at[:], self.slot_of_stack[:],
+                 self.labels[:], self.next_label, tuple(self.groups))
+        if self.less:
+            found['row'] = self.out[:]
+            found['states'] = [state]
+            # the other branches now compare against this row
+            self.less = False
+        else:
+            found['states'].append(state)
+
+    def transform(self, state):
+        _, used, pos, col_at, stack_at, _, labels, next_label, groups = state
+        # columns left in a group, or never read after the first row, are
+        # blank in every later row, so any order that keeps the first row's
+        # pattern will do
+        col_at, stack_at = list(col_at), list(stack_at)
+        for s in range(3):
+            if stack_at[s] < 0:
+                stack_at[s] = next(source for source in range(3)
+                                   if source not in stack_at and self.blanks[source] == self.slot_blanks[s])
+            columns = range(3 * stack_at[s], 3 * stack_at[s] + 3)
+            group = sorted(groups[s]) if groups[s] is not None else [c for c in columns if self.blank_col[c]]
+            for k, c in enumerate(group):
+                col_at[3 * s + k] = c
+            rest = [c for c in columns if c not in col_at]
+            for j in range(3 * s, 3 * s + 3):
+                if col_at[j] < 0:
+                    col_at[j] = rest.pop(0)
+        pos = [col_at.index(c) for c in range(9)]
+        labels = labels[:]
+        for digit in range(1, 10):
+            if self.first_col[digit] >= 0:
+                labels[digit] = self.rank[pos[self.first_col[digit]]]
+        # give digits that never appear the remaining labels, so the map is a bijection
+        for digit in range(1, 10):
+            if not labels[digit]:
+                labels[digit] = next_label
+                next_label += 1
+        return self.t, used, tuple(col_at), tuple(labels)
+
+
+def canonical_form(grid):
+    """Return (canonical, transform) for a grid.
+
+    `canonical` is a tuple of 81 ints (0 = blank). `transform` is
+    (transpose, rows, columns, labels) such that
+        canonical[i*9 + j] == labels[src[rows[i]][columns[j]]]
+    where src is the grid, transposed first if `transpose` is set.
+    """
+    cells = _flatten(grid)
+    sources = {t: _rows(cells, t) for t in (False, True)}
+
+    # Blanks sort first, so only rows whose stacks hold the most blanks
+    # (compared after sorting) can start the minimal grid.
+    profiles = {(t, r): sorted(_stack_blanks(rows[r]), reverse=True)
+                for t, rows in sources.items() for r in range(9)}
+    top = max(profiles.values())
+    states, tried = [], set()
+    for (t, r), profile in profiles.items():
+        rows = sources[t]
+        # equal rows in bands with the same rows start the same searches
+        key = (t, tuple(sorted(rows[r // 3 * 3:r // 3 * 3 + 3])), rows[r])
+        if profile == top and key not in tried:
+            tried.add(key)
+            states.append(_FirstRow(t, rows, r).start())
+    canonical = list(states[0][0].rank)
+
+    # remaining rows: extend only the states that tie so far
+    for _ in range(8):
+        found = {'row': None, 'states': []}
+        for state in states:
+            state[0].extend(state, found)
+        states = found['states']
+        canonical.extend(found['row'])
+    return tuple(canonical), states[0][0].transform(states[0])
+
+
+def canonical_string(grid):
+    return ''.join(map(str, canonical_form(grid)[0]))
+
+
+def apply_transform(grid, transform):
+    """Map any grid (e.g. a solution) into canonical coordinates with `transform`."""
+    t, rows, order, labels = transform
+    src = _rows(_flatten(grid), t)
+    return tuple(labels[src[r][c]] for r in rows for c in order)
+
+
+def invert_transform(cells, transform):
+    """Map a grid in canonical coordinates back to the original orientation."""
+    t, rows, order, labels = transform
+    inverse = [0] * 10
+    for digit in range(1, 10):
+        inverse[labels[digit]] = digit
+    src = [[0] * 9 for _ in range(9)]
+    for i, r in enumerate(rows):
+        for j, c in enumerate(order):
+            src[r][c] = inverse[cells[i * 9 + j]]
+    if t:
+        src = [list(col) for col in zip(*src)]
+    return src
+
+
+def puzzle_key(canonical):
+    return hashlib.blake2b(bytes(canonical), digest_size=16).digest()
+
+
+class PuzzleStore:
+    """On-disk index of canonical puzzles with optional cached solutions."""
+
+    def __init__(self, path=':memory:'):
+        self.conn = sqlite3.connect(path)
+        if path != ':memory:':
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS puzzles ('
+            ' key BLOB PRIMARY KEY,'
+            ' canonical CHAR(81) NOT NULL,'
+            ' solution CHAR(81),'
+            ' seen INT NOT NULL DEFAULT 1'
+            ') WITHOUT ROWID')
+        self.conn.commit()
+
+    def _lookup(self, grid):
+        canonical, transform = canonical_form(grid)
+        return canonical, transform, puzzle_key(canonical)
+
+    def add(self, grid):
+        """Record a puzzle. Returns True if no equivalent puzzle was stored before."""
+        canonical, _, key = self._lookup(grid)
+        with self.conn:
+            self.conn.execute(
+                'INSERT INTO puzzles (key, canonical) VALUES (?, ?) '
+                'ON CONFLICT (key) DO UPDATE SET seen = seen + 1',
+                (key, ''.join(map(str, canonical))))
+            # rowcount is 1 for both insert and update; check the counter instead
+            seen = self.conn.execute('SELECT seen FROM puzzles WHERE key = ?', (key,)).fetchone()[0]
+        return seen == 1
+
+    def add_many(self, grids):
+        """Record many puzzles in one transaction. Returns how many were new."""
+        before = len(self)
+        with self.conn:
+            self.conn.executemany(
+                'INSERT INTO puzzles (key, canonical) VALUES (?, ?) '
+                'ON CONFLICT (key) DO UPDATE SET seen = seen + 1',
+                ((puzzle_key(c), ''.join(map(str, c)))
+                 for c in (canonical_form(g)[0] for g in grids)))
+        return len(self) - before
+
+    def __contains__(self, grid):
+        _, _, key = self._lookup(grid)
+        return self.conn.execute('SELECT 1 FROM puzzles WHERE key = ?', (key,)).fetchone() is not None
+
+    def __len__(self):
+        return self.conn.execute('SELECT COUNT(*) FROM puzzles').fetchone()[0]
+
+    def solution(self, grid):
+        """Cached solution for `grid` in its own orientation and labels, or None."""
+        _, transform, key = self._lookup(grid)
+        row = self.conn.execute('SELECT solution FROM puzzles WHERE key = ?', (key,)).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return invert_transform(tuple(int(ch) for ch in row[0]), transform)
+
+    def put_solution(self, grid, solution):
+        """Store `solution` (a solved `grid`) for the whole equivalence class; returns it."""
+        canonical, transform, key = self._lookup(grid)
+        cached = ''.join(map(str, apply_transform(solution, transform)))
+        with self.conn:
+            self.conn.execute(
+                'INSERT INTO puzzles (key, canonical, solution) VALUES (?, ?, ?) '
+                'ON CONFLICT (key) DO UPDATE SET solution = excluded.solution',
+                (key, ''.join(map(str, canonical)), cached))
+        return solution
+
+    def close(self):
+        self.conn.close()
+
+
+def main(argv=None):
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description='Deduplicate Sudoku puzzles by canonical form')
+    parser.add_argument('file', help='one 81-character puzzle per line')
+    parser.add_argument('--db', default=':memory:', help='SQLite index to add the puzzles to')
+    args = parser.parse_args(argv)
+
+    store = PuzzleStore(args.db)
+    with open(args.file) as f:
+        puzzles = [line.strip() for line in f if line.strip()]
+    start = time.perf_counter()
+    new = store.add_many(puzzles)
+    elapsed = time.perf_counter() - start
+    print(f'{len(puzzles):,} puzzles, {new:,} new, {len(puzzles) - new:,} duplicates '
+          f'({elapsed / max(1, len(puzzles)) * 1000:.2f} ms per puzzle)')
+    store.close()
+
+
+if __name__ == '__main__':
+    main()
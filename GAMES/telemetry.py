@@ -0,0 +1,332 @@
+"""
+Append-only columnar telemetry for game sessions
+
+Each game has a fixed record schema. Every column is its own file of raw
+little-endian fixed-width values (the same layout as an Arrow primitive
+buffer), memory-mapped with numpy:
+
+    DIR/tetris/meta.json      schema, committed row count, session count
+    DIR/tetris/session.bin    uint32
+    DIR/tetris/t.bin          float64, seconds since the session started
+    DIR/tetris/event.bin      uint8
+    DIR/tetris/shape.bin ...  game-specific columns
+
+Each schema has a writer method with a fixed argument list (log.tetris,
+log.pong, log.snake, log.sudoku) that stores scalars straight into the
+mapped arrays, so nothing is allocated or kept per event; scores and
+counters that could outgrow their column are clamped to its maximum. Files are preallocated and doubled when full. Every
+FLUSH_INTERVAL seconds (checked every FLUSH_CHECK records) the maps are
+flushed and the row count in meta.json is replaced atomically; readers only
+look at committed rows, so a crash loses at most the last interval. Later
+sessions append to the same files. One writer per game directory at a time.
+
+    log = TelemetryWriter('runs', 'pong')
+    log.pong(PONG_SCORE, x, y, vx, vy, score_left, score_right)
+    log.close()
+
+    cols = read_columns('runs', 'pong')    # dict of read-only memmaps, no copy
+    cols['vx'][cols['event'] == PONG_FRAME].mean()
+
+The games take --telemetry DIR (see add_arguments / from_args); without it
+they get NULL_WRITER, whose writers do nothing. numpy is only imported when
+telemetry is switched on.
+
+    python telemetry.py summary runs
+    python telemetry.py bench
+"""
+
+import atexit
+import json
+import os
+import time
+
+COMMON = (('session', 'u4'), ('t', 'f8'), ('event', 'u1'))
+
+SCHEMAS = {
+    'tetris': COMMON + (('shape', 'u1'), ('x', 'i2'), ('y', 'i2'), ('rotation', 'u1'),
+                        ('lines', 'u1'), ('score', 'u4'), ('level', 'u2')),
+    'pong': COMMON + (('x', 'i2'), ('y', 'i2'), ('vx', 'f4'), ('vy', 'f4'),
+                      ('score_left', 'u1'), ('score_right', 'u1')),
+    'snake': COMMON + (('game', 'u4'), ('direction', 'u1'), ('status', 'u1')),
+    'sudoku': COMMON + (('row', 'u1'), ('col', 'u1'), ('num', 'u1')),
+}
+
+# event codes
+TETRIS_PLACE, TETRIS_CLEAR = 0, 1
+PONG_FRAME, PONG_SCORE = 0, 1
+SNAKE_STEP = 0
+SUDOKU_MOVE, SUDOKU_INVALID = 0, 1
+
+SNAKE_DIRECTIONS = {'U': 0, 'D': 1, 'L': 2, 'R': 3}
+SNAKE_STATUS = {'ok': 0, 'ate': 1, 'won': 2, 'dead': 3}
+
+INITIAL_CAPACITY = 1 << 16
+FLUSH_INTERVAL = 1.0
+FLUSH_CHECK = 256  # records between clock reads for the flush timer
+U1_MAX, U2_MAX, U4_MAX = 0xFF, 0xFFFF, 0xFFFFFFFF
+
+
+def _noop(*args):
+    pass
+
+
+def _meta_path(path):
+    return os.path.join(path, 'meta.json')
+
+
+def _read_meta(path):
+    with open(_meta_path(path)) as f:
+        return json.load(f)
+
+
+class NullWriter:
+    """Stands in for a writer when telemetry is off."""
+
+    tetris = pong = snake = sudoku = flush = close = _noop
+
+
+NULL_WRITER = NullWriter()
+
+
+class TelemetryWriter:
+    def __init__(self, directory, game, capacity=INITIAL_CAPACITY, flush_interval=FLUSH_INTERVAL):
+        import numpy as np
+
+        self._np = np
+        try:
+            self.schema = SCHEMAS[game]
+        except KeyError:
+            raise ValueError(f"no telemetry schema for {game!r}; choose from {', '.join(sorted(SCHEMAS))}") from None
+        self.path = os.path.join(directory, game)
+        self.game = game
+        self.flush_interval = flush_interval
+        os.makedirs(self.path, exist_ok=True)
+
+        if os.path.exists(_meta_path(self.path)):
+            meta = _read_meta(self.path)
+            if [tuple(c) for c in meta['columns']] != list(self.schema):
+                raise ValueError(f'{self.path} was written with a different schema')
+            self.count = meta['rows']
+            self.session = meta['sessions'] + 1
+            name, dtype = self.schema[0]
+            rows = os.path.getsize(self._column_path(name)) // np.dtype(dtype).itemsize
+            self.capacity = max(rows, capacity)
+        else:
+            self.count = 0
+            self.session = 1
+            self.capacity = capacity
+        self._map()
+        self._start = time.perf_counter()
+        self._last_flush = self._start
+        self._commit()
+
+    def _column_path(self, name):
+        return os.path.join(self.path, name + '.bin')
+
+    def _map(self):
+        np = self._np
+        self.columns = []
+        for name, dtype in self.schema:
+            dtype = np.dtype(dtype).newbyteorder('<')
+            path = self._column_path(name)
+            size = self.capacity * dtype.itemsize
+            with open(path, 'ab') as f:
+                if f.tell() < size:
+                    f.truncate(size)
+            self.columns.append(np.memmap(path, dtype=dtype, mode='r+', shape=(self.capacity,)))
+        self._session_col, self._time_col, self._event_col = self.columns[:3]
+        self._fields = self.columns[3:]
+
+    def _grow(self):
+        self.flush()
+        self.columns = self._fields = None
+        self._session_col = self._time_col = self._event_col = None
+        self.capacity *= 2
+        self._map()
+
+    def _begin(self, event):
+        """Fill the common columns of the next row and return its index."""
+        n = self.count
+        if n == self.capacity:
+            self._grow()
+        self._session_col[n] = self.session
+        self._event_col[n] = event
+        self._time_col[n] = time.perf_counter() - self._start
+        return n
+
+    def _end(self, n):
+        """Count row `n` as written; every FLUSH_CHECK rows, flush if the interval has passed."""
+        self.count = n = n + 1
+        if not n % FLUSH_CHECK and time.perf_counter() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    # One writer per schema with a fixed argument list, so a record costs no tuple; values are
+    # clamped to their column's range where a long session could overflow it.
+
+    def tetris(self, event, shape, x, y, rotation, lines, score, level):
+        n = self._begin(event)
+        c_shape, c_x, c_y, c_rotation, c_lines, c_score, c_level = self._fields
+        c_shape[n] = shape
+        c_x[n] = x
+        c_y[n] = y
+        c_rotation[n] = rotation
+        c_lines[n] = lines
+        c_score[n] = score if score <= U4_MAX else U4_MAX
+        c_level[n] = level if level <= U2_MAX else U2_MAX
+        self._end(n)
+
+    def pong(self, event, x, y, vx, vy, score_left, score_right):
+        n = self._begin(event)
+        c_x, c_y, c_vx, c_vy, c_left, c_right = self._fields
+        c_x[n] = x
+        c_y[n] = y
+        c_vx[n] = vx
+        c_vy[n] = vy
+        c_left[n] = score_left if score_left <= U1_MAX else U1_MAX
+        c_right[n] = score_right if score_right <= U1_MAX else U1_MAX
+        self._end(n)
+
+    def snake(self, event, game, direction, status):
+        n = self._begin(event)
+        c_game, c_direction, c_status = self._fields
+        c_game[n] = game if game <= U4_MAX else U4_MAX
+        c_direction[n] = direction
+        c_status[n] = status
+        self._end(n)
+
+    def sudoku(self, event, row, col, num):
+        n = self._begin(event)
+        c_row, c_col, c_num = self._fields
+        c_row[n] = row
+        c_col[n] = col
+        c_num[n] = num
+        self._end(n)
+
+    def _commit(self):
+        meta = {'game': self.game, 'columns': self.schema, 'rows': self.count,
+                'sessions': self.session, 'byteorder': 'little'}
+        tmp = _meta_path(self.path) + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp, _meta_path(self.path))
+
+    def flush(self):
+        """Write the mapped pages, then publish the row count to readers."""
+        if self.columns is None:
+            return
+        for column in self.columns:
+            column.flush()
+        self._commit()
+        self._last_flush = time.perf_counter()
+
+    def close(self):
+        self.flush()
+        self.columns = self._fields = None
+        self._session_col = self._time_col = self._event_col = None
+        self.tetris = self.pong = self.snake = self.sudoku = _noop
+
+
+def read_columns(directory, game):
+    """Open the committed rows of every column read-only, without copying."""
+    import numpy as np
+
+    path = os.path.join(directory, game)
+    meta = _read_meta(path)
+    rows = meta['rows']
+    columns = {}
+    for name, dtype in meta['columns']:
+        dtype = np.dtype(dtype).newbyteorder('<')
+        if rows == 0:
+            columns[name] = np.empty(0, dtype)
+        else:
+            columns[name] = np.memmap(os.path.join(path, name + '.bin'), dtype=dtype, mode='r',
+                                      shape=(rows,))
+    return columns
+
+
+# ---- Game integration ----
+
+def add_arguments(parser):
+    parser.add_argument('--telemetry', metavar='DIR',
+                        help='append session telemetry to column files in DIR')
+
+
+def from_args(args, game):
+    """A writer for `game` if --telemetry was given, else NULL_WRITER. Closed at exit."""
+    if not getattr(args, 'telemetry', None):
+        return NULL_WRITER
+    writer = TelemetryWriter(args.telemetry, game)
+    atexit.register(writer.close)
+    return writer
+
+
+# ---- Command line ----
+
+def summary(directory):
+    import numpy as np
+
+    for game in sorted(SCHEMAS):
+        if not os.path.exists(_meta_path(os.path.join(directory, game))):
+            continue
+        cols = read_columns(directory, game)
+        event = cols['event']
+        sessions = _read_meta(os.path.join(directory, game))['sessions']
+        print(f'{game}: {len(event):,} records, {sessions} sessions')
+        if game == 'tetris':
+            placed = int(np.count_nonzero(event == TETRIS_PLACE))
+            lines = np.bincount(cols['lines'][event == TETRIS_CLEAR], minlength=5)[1:5]
+            print(f'  {placed:,} pieces placed, line clears by size (1-4): {lines.tolist()}')
+            print(f"  pieces by shape: {np.bincount(cols['shape'][event == TETRIS_PLACE], minlength=7).tolist()}")
+        elif game == 'pong':
+            frames = event == PONG_FRAME
+            speed = np.hypot(cols['vx'][frames], cols['vy'][frames])
+            if len(speed):
+                print(f'  ball speed: mean {speed.mean():.2f}, max {speed.max():.2f} px/frame')
+            print(f'  {int(np.count_nonzero(event == PONG_SCORE)):,} points scored')
+        elif game == 'snake':
+            names = sorted(SNAKE_DIRECTIONS, key=SNAKE_DIRECTIONS.get)
+            counts = np.bincount(cols['direction'], minlength=4)
+            print('  moves: ' + ', '.join(f'{n} {c:,}' for n, c in zip(names, counts.tolist())))
+            print(f"  {int(np.count_nonzero(cols['status'] == SNAKE_STATUS['ate'])):,} food eaten")
+        elif game == 'sudoku':
+            invalid = int(np.count_nonzero(event == SUDOKU_INVALID))
+            print(f'  {len(event) - invalid:,} moves, {invalid:,} rejected')
+
+
+def bench(records=1_000_000):
+    """Per-record cost of the Pong writer, the widest per-frame record."""
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as directory:
+        writer = TelemetryWriter(directory, 'pong')
+        start = time.perf_counter()
+        for i in range(records):
+            writer.pong(PONG_FRAME, i % 900, i % 600, 5.0, -2.5, 3, 4)
+        writer.close()
+        elapsed = time.perf_counter() - start
+        cols = read_columns(directory, 'pong')
+        assert len(cols['x']) == records
+    per_record = elapsed / records
+    print(f'{records:,} records in {elapsed:.2f}s: {per_record * 1e6:.2f} us per record, '
+          f'{per_record / (1 / 60):.4%} of a 60 FPS frame')
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Game telemetry column files')
+    commands = parser.add_subparsers(dest='command', required=True)
+    summary_cmd = commands.add_parser('summary', help='aggregate the recorded sessions')
+    summary_cmd.add_argument('directory')
+    bench_cmd = commands.add_parser('bench', help='measure the cost of one record')
+    bench_cmd.add_argument('--records', type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+
+    if args.command == 'summary':
+        summary(args.directory)
+    else:
+        bench(args.records)
+
+
+if __name__ == '__main__':
+    main()
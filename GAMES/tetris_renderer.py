@@ -0,0 +1,220 @@
+"""
+Batched playfield drawing for TETRIS TIME 👾
+
+The game used to draw every grid cell, empty or not, with its own
+pygame.draw.rect call and then draw the grid lines over the board line by
+line. BoardRenderer renders what does not change between frames once:
+
+  - one shaded block tile per colour: a flat face with a light top-left and a
+    dark bottom-right bevel. Board tiles carry the grey grid line along their
+    top and left edge, so a tile never hides the grid; the empty cell is a
+    black tile with the same lines.
+  - the board itself, a surface that keeps the tiles of the last frame
+
+Each frame the grid is compared with the colours already on the board, a
+row at a time (a list comparison in C for unchanged rows), and only the
+cells that changed are blitted, in one Surface.blits batch (fblits on
+pygame-ce). The board then goes to the screen in one blit. A falling piece
+changes about eight cells per frame, so the cost per frame is one pass over
+the grid plus one large copy, however big COLS, ROWS or CELL_SIZE are.
+Surfaces are converted to the target's pixel format on first use, so all
+blits are plain copies; colours missing from the palette get a tile the
+first time they are seen.
+
+    renderer = BoardRenderer(COLS, ROWS, CELL_SIZE, (TOP_LEFT_X, TOP_LEFT_Y), SHAPE_COLORS)
+    renderer.draw_board(surface, grid)
+    renderer.draw_cells(surface, piece_cells, color, x, y)   # previews, no grid lines
+
+    python tetris_renderer.py --cols 40 --rows 80 --cell 24   # ms per frame, batched vs. per-rect
+"""
+
+import pygame
+
+EMPTY = (0, 0, 0)
+GRID_LINE = (128, 128, 128)
+
+
+def _lighter(color, amount=0.5):
+    return tuple(int(c + (255 - c) * amount) for c in color)
+
+
+def _darker(color, amount=0.45):
+    return tuple(int(c * (1 - amount)) for c in color)
+
+
+def shaded_tile(color, size, grid_line=None):
+    """A size x size block in `color` with a bevel, optionally with a grid line on its top and left edge."""
+    tile = pygame.Surface((size, size))
+    tile.fill(color)
+    bevel = max(1, size // 8)
+    light, dark = _lighter(color), _darker(color)
+    tile.fill(light, (0, 0, size, bevel))
+    tile.fill(light, (0, 0, bevel, size))
+    tile.fill(dark, (0, size - bevel, size, bevel))
+    tile.fill(dark, (size - bevel, bevel, bevel, size - bevel))
+    if grid_line is not None:
+        tile.fill(grid_line, (0, 0, size, 1))
+        tile.fill(grid_line, (0, 0, 1, size))
+    return tile
+
+
+def blit_batch(surface, pairs):
+    """Blit (source, position) pairs in one call, with fblits where pygame-ce provides it."""
+    fblits = getattr(surface, 'fblits', None)
+    if fblits is not None:
+        fblits(pairs)
+    else:
+        surface.blits(pairs, False)
+
+
+class _Tiles(dict):
+    """colour -> tile; colours not in the palette are rendered when first looked up."""
+
+    def __init__(self, make):
+        super().__init__()
+        self.make = make
+
+    def __missing__(self, color):
+        tile = self[color] = self.make(color)
+        return tile
+
+
+class BoardRenderer:
+    def __init__(self, cols, rows, cell_size, origin, colors, empty=EMPTY, grid_line=GRID_LINE):
+        self.cols, self.rows, self.cell_size = cols, rows, cell_size
+        self.origin = origin
+        self.empty = empty
+        self.grid_line = grid_line
+        self.board_tiles = _Tiles(lambda color: self._convert(shaded_tile(color, cell_size, grid_line)))
+        self.preview_tiles = _Tiles(lambda color: self._convert(shaded_tile(color, cell_size)))
+        self._format = self._format_key = None
+        self.board_tiles[empty] = self._empty_tile()
+        for color in colors:
+            self.board_tiles[color]
+            self.preview_tiles[color]
+        self.positions = [[(j * cell_size, i * cell_size) for j in range(cols)] for i in range(rows)]
+        self.board = None
+        self.shown = None
+
+    def _empty_tile(self):
+        tile = pygame.Surface((self.cell_size, self.cell_size))
+        tile.fill(self.empty)
+        tile.fill(self.grid_line, (0, 0, self.cell_size, 1))
+        tile.fill(self.grid_line, (0, 0, 1, self.cell_size))
+        return self._convert(tile)
+
+    def _make_board(self):
+        """The empty playfield with its grid lines; the colours shown in it are tracked in self.shown."""
+        width, height = self.cols * self.cell_size, self.rows * self.cell_size
+        # one extra pixel for the lines on the right and bottom edge, as the per-line drawing had them
+        board = pygame.Surface((width + 1, height + 1))
+        board.fill(self.grid_line)
+        blit_batch(board, [(self.board_tiles[self.empty], pos) for row in self.positions for pos in row])
+        self.board = self._convert(board)
+        self.shown = [[self.empty] * self.cols for _ in range(self.rows)]
+
+    def _convert(self, image):
+        if self._format is None:
+            return image
+        try:
+            return image.convert(self._format)
+        except pygame.error:
+            return image
+
+    def _match_format(self, surface):
+        """Convert the cached surfaces to the pixel format of `surface` the first time it is drawn to."""
+        key = (surface.get_bitsize(), surface.get_masks())
+        if key == self._format_key:
+            return
+        self._format, self._format_key = surface, key
+        for tiles in (self.board_tiles, self.preview_tiles):
+            for color, tile in tiles.items():
+                tiles[color] = self._convert(tile)
+        self._make_board()
+
+    def draw_board(self, surface, grid):
+        """Draw the playfield: the cells that changed since the last frame go to the board in one
+        batch, then the board is one blit onto `surface`."""
+        self._match_format(surface)
+        tiles, shown = self.board_tiles, self.shown
+        changed = []
+        for i, row in enumerate(grid):
+            shown_row = shown[i]
+            if row == shown_row:
+                continue
+            positions = self.positions[i]
+            for j, color in enumerate(row):
+                if color != shown_row[j]:
+                    shown_row[j] = color
+                    changed.append((tiles[color], positions[j]))
+        if changed:
+            blit_batch(self.board, changed)
+        surface.blit(self.board, self.origin)
+
+    def draw_cells(self, surface, cells, color, x, y):
+        """Draw preview blocks at grid offsets `cells` ((col, row) pairs) from the pixel position (x, y)."""
+        self._match_format(surface)
+        tile, size = self.preview_tiles[color], self.cell_size
+        blit_batch(surface, [(tile, (x + j * size, y + i * size)) for j, i in cells])
+
+
+def benchmark(cols=10, rows=20, cell_size=30, frames=300, fill=0.5, seed=0):
+    """Average ms per board draw (this renderer, per-rect) with a 2x2 piece moving over a board
+    with `fill` of the cells taken."""
+    import random
+    import time
+
+    colors = [(0, 240, 240), (0, 0, 240), (240, 160, 0), (240, 240, 0), (0, 240, 0), (160, 0, 240), (240, 0, 0)]
+    rng = random.Random(seed)
+    locked = [[rng.choice(colors) if rng.random() < fill else EMPTY for _ in range(cols)] for _ in range(rows)]
+    grids = []
+    for f in range(frames):
+        grid = [row[:] for row in locked]
+        x, y = (f * 7) % (cols - 1), f % (rows - 1)
+        for dx, dy in ((0, 0), (1, 0), (0, 1), (1, 1)):
+            grid[y + dy][x + dx] = colors[3]
+        grids.append(grid)
+    surface = pygame.Surface((cols * cell_size + 40, rows * cell_size + 40))
+    renderer = BoardRenderer(cols, rows, cell_size, (20, 20), colors)
+
+    start = time.perf_counter()
+    for grid in grids:
+        surface.fill(EMPTY)
+        renderer.draw_board(surface, grid)
+    batched = (time.perf_counter() - start) / frames * 1000
+
+    # the drawing the game did before: a rect per cell, then every grid line
+    start = time.perf_counter()
+    for grid in grids:
+        surface.fill(EMPTY)
+        for i in range(rows):
+            for j in range(cols):
+                pygame.draw.rect(surface, grid[i][j], (20 + j * cell_size, 20 + i * cell_size, cell_size, cell_size), 0)
+        for i in range(rows):
+            pygame.draw.line(surface, GRID_LINE, (20, 20 + i * cell_size), (20 + cols * cell_size, 20 + i * cell_size))
+            for j in range(cols):
+                pygame.draw.line(surface, GRID_LINE, (20 + j * cell_size, 20), (20 + j * cell_size, 20 + rows * cell_size))
+    per_rect = (time.perf_counter() - start) / frames * 1000
+    return batched, per_rect
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Tetris board drawing benchmark')
+    parser.add_argument('--cols', type=int, default=10)
+    parser.add_argument('--rows', type=int, default=20)
+    parser.add_argument('--cell', type=int, default=30, help='cell size in pixels')
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--fill', type=float, default=0.5, help='fraction of cells taken')
+    args = parser.parse_args(argv)
+
+    batched, per_rect = benchmark(args.cols, args.rows, args.cell, args.frames, args.fill)
+    budget = 1000 / 60
+    print(f'{args.cols}x{args.rows} cells of {args.cell}px, {args.fill:.0%} filled:')
+    print(f'  renderer {batched:.3f} ms per frame ({batched / budget:.1%} of the 60 FPS budget)')
+    print(f'  per-rect {per_rect:.3f} ms per frame ({per_rect / budget:.1%})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,306 @@
+"""
+Bulk loader for solved puzzle traces (water jug, Sudoku, game replays)
+
+PUZZLE_GAME 🧩 writes its trace with one `INSERT INTO ... VALUES` per row and
+the Snake client sends one statement per call. That is fine for six rows but
+not for millions. This module streams rows into SQLite or PostgreSQL in
+batches:
+
+  - SQLite:     `executemany` inside one transaction per batch
+  - PostgreSQL: `COPY ... FROM STDIN` (CSV) per batch via psycopg2
+
+Indexes are created after the data is in, which is much cheaper than keeping
+them up to date row by row.
+
+The loader's Buckets table is not PUZZLE_GAME's: it adds a run_id column and
+its primary key is (run_id, step) instead of step. create_tables refuses to
+reuse an existing table whose columns differ, so point the loader at a
+database without PUZZLE_GAME's Buckets. The benchmark only touches its own
+bench_buckets table, which it creates and drops itself.
+
+Run the benchmark (bulk vs row-at-a-time, then the bucket5 = 4 lookup):
+    python trace_loader.py --rows 2000000
+    python trace_loader.py --postgres "dbname=postgres user=postgres" --rows 2000000
+"""
+
+import csv
+import io
+import itertools
+import os
+import sqlite3
+import sys
+import time
+
+from water_jug import solve
+
+# table name -> (column definitions, indexed columns)
+# Buckets has the PUZZLE_GAME columns plus run_id, which separates traces so
+# many solutions can share one table; that and the (run_id, step) key make it
+# a different layout from PUZZLE_GAME's Buckets (step INT PRIMARY KEY). For
+# two-jug puzzles other than 5L/3L, bucket5/bucket3 hold the first and second
+# jug. bench_buckets is the same layout, reserved for the benchmark.
+BUCKET_COLUMNS = [('run_id', 'INT'), ('step', 'INT'), ('action', 'VARCHAR(50)'),
+                  ('bucket5', 'INT'), ('bucket3', 'INT')]
+BENCH_TABLE = 'bench_buckets'
+
+TABLES = {
+    'Buckets': (BUCKET_COLUMNS, ['bucket5']),
+    BENCH_TABLE: (BUCKET_COLUMNS, ['bucket5']),
+    'SudokuSolutions': (
+        [('puzzle_id', 'INT'), ('puzzle', 'CHAR(81)'), ('solution', 'CHAR(81)')],
+        ['puzzle'],
+    ),
+    'GameReplays': (
+        [('game', 'VARCHAR(20)'), ('session_id', 'INT'), ('tick', 'INT'),
+         ('event', 'VARCHAR(20)'), ('value', 'INT')],
+        ['game', 'session_id'],
+    ),
+}
+
+# what create_tables / create_indexes / drop_tables use by default
+TRACE_TABLES = [name for name in TABLES if name != BENCH_TABLE]
+
+PRIMARY_KEYS = {
+    'Buckets': ('run_id', 'step'),
+    BENCH_TABLE: ('run_id', 'step'),
+    'SudokuSolutions': ('puzzle_id',),
+    'GameReplays': ('game', 'session_id', 'tick'),
+}
+
+BATCH_SIZE = 50_000
+
+
+def _batches(rows, size):
+    it = iter(rows)
+    while True:
+        batch = list(itertools.islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+class TraceLoader:
+    """Create trace tables and bulk-load rows into them.
+
+    `conn` is either a sqlite3 connection or a psycopg2 connection; the
+    dialect is detected from the connection type.
+    """
+
+    def __init__(self, conn, batch_size=BATCH_SIZE):
+        self.conn = conn
+        self.batch_size = batch_size
+        self.postgres = not isinstance(conn, sqlite3.Connection)
+        self.param = '%s' if self.postgres else '?'
+
+    def columns(self, name):
+        """Column names of an existing table, lower case; empty if there is no such table."""
+        cur = self.conn.cursor()
+        if self.postgres:
+            cur.execute('SELECT column_name FROM information_schema.columns '
+                        'WHERE table_name = %s AND table_schema = ANY(current_schemas(false)) '
+                        'ORDER BY ordinal_position', (name.lower(),))
+        else:
+            cur.execute(f'PRAGMA table_info({name})')
+            return [row[1].lower() for row in cur.fetchall()]
+        return [row[0] for row in cur.fetchall()]
+
+    def create_tables(self, tables=None, primary_keys=True):
+        """Create the tables (without secondary indexes; see create_indexes).
+
+        A table that already exists is kept, but only if it has the loader's
+        columns; otherwise ValueError is raised rather than loading into it.
+        """
+        cur = self.conn.cursor()
+        for name in tables or TRACE_TABLES:
+            columns, _ = TABLES[name]
+            existing = self.columns(name)
+            if existing and existing != [col for col, _ in columns]:
+                raise ValueError(f"table {name} already exists with columns {', '.join(existing)}, "
+                                 f"not the loader's {', '.join(col for col, _ in columns)}")
+            cols = [f'{col} {typ}' for col, typ in columns]
+            if primary_keys:
+                cols.append(f"PRIMARY KEY ({', '.join(PRIMARY_KEYS[name])})")
+            cur.execute(f"CREATE TABLE IF NOT EXISTS {name} ({', '.join(cols)})")
+        self.conn.commit()
+
+    def create_indexes(self, tables=None):
+        """Create the lookup indexes. Call after bulk loading."""
+        cur = self.conn.cursor()
+        for name in tables or TRACE_TABLES:
+            _, indexed = TABLES[name]
+            cur.execute(f"CREATE INDEX IF NOT EXISTS idx_{name}_{'_'.join(indexed)} "
+                        f"ON {name} ({', '.join(indexed)})")
+        if not self.postgres:
+            cur.execute('ANALYZE')
+        self.conn.commit()
+
+    def drop_tables(self, tables=None):
+        cur = self.conn.cursor()
+        for name in tables or TRACE_TABLES:
+            cur.execute(f'DROP TABLE IF EXISTS {name}')
+        self.conn.commit()
+
+    def load(self, table, rows):
+        """Stream an iterable of tuples into `table`. Returns the row count."""
+        columns = [col for col, _ in TABLES[table][0]]
+        count = 0
+        for batch in _batches(rows, self.batch_size):
+            if self.postgres:
+                self._copy_batch(table, columns, batch)
+            else:
+                self._executemany_batch(table, columns, batch)
+            count += len(batch)
+        return count
+
+    def _executemany_batch(self, table, columns, batch):
+        marks = ', '.join([self.param] * len(columns))
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({marks})", batch)
+
+    def _copy_batch(self, table, columns, batch):
+        buf = io.StringIO()
+        csv.writer(buf).writerows(batch)
+        buf.seek(0)
+        with self.conn.cursor() as cur:
+            cur.copy_expert(
+                f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buf)
+        self.conn.commit()
+
+    def load_row_by_row(self, table, rows):
+        """Baseline: one INSERT and one commit per row, like PUZZLE_GAME does."""
+        columns = [col for col, _ in TABLES[table][0]]
+        marks = ', '.join([self.param] * len(columns))
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({marks})"
+        cur = self.conn.cursor()
+        count = 0
+        for row in rows:
+            cur.execute(sql, row)
+            self.conn.commit()
+            count += 1
+        return count
+
+
+# ---- Row sources ----
+
+def jug_trace_rows(puzzles, start_run=0):
+    """Yield Buckets rows for an iterable of (capacity_a, capacity_b, target)."""
+    for run_id, (a, b, target) in enumerate(puzzles, start=start_run):
+        for row in solve([a, b], target):
+            yield (run_id,) + row
+
+
+def sudoku_rows(pairs, start_id=0):
+    """Yield SudokuSolutions rows for (puzzle_grid, solution_grid) pairs of 9x9 lists."""
+    for puzzle_id, (puzzle, solution) in enumerate(pairs, start=start_id):
+        yield (puzzle_id,
+               ''.join(str(v) for row in puzzle for v in row),
+               ''.join(str(v) for row in solution for v in row))
+
+
+def replay_rows(game, session_id, events):
+    """Yield GameReplays rows for an iterable of (tick, event, value)."""
+    for tick, event, value in events:
+        yield (game, session_id, tick, event, value)
+
+
+def synthetic_jug_rows(n_rows):
+    """Yield about `n_rows` Buckets rows by repeating a few solved traces under new run ids."""
+    puzzles = [(5, 3, 4), (7, 4, 5), (9, 4, 6), (11, 7, 9), (13, 5, 4)]
+    traces = [solve([a, b], t) for a, b, t in puzzles]
+    run_id = 0
+    produced = 0
+    while produced < n_rows:
+        for trace in traces:
+            for row in trace:
+                yield (run_id,) + row
+            run_id += 1
+            produced += len(trace)
+            if produced >= n_rows:
+                return
+
+
+# ---- Benchmark ----
+
+def _connect(postgres_dsn, path):
+    if postgres_dsn:
+        import psycopg2
+        return psycopg2.connect(postgres_dsn)
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    return conn
+
+
+def benchmark(n_rows, baseline_rows, postgres_dsn=None, path='traces_bench.db'):
+    """Time both loaders into BENCH_TABLE; refuses to run if that table already exists."""
+    if not postgres_dsn and os.path.exists(path):
+        os.remove(path)
+    conn = _connect(postgres_dsn, path)
+    loader = TraceLoader(conn)
+    table = BENCH_TABLE
+    if loader.columns(table):
+        conn.close()
+        raise ValueError(f'table {table} already exists; drop it or use another database')
+
+    try:
+        loader.create_tables([table])
+        start = time.perf_counter()
+        loader.load_row_by_row(table, synthetic_jug_rows(baseline_rows))
+        slow = time.perf_counter() - start
+        print(f'row-at-a-time: {baseline_rows:>10,} rows in {slow:8.2f}s  '
+              f'({baseline_rows / slow:>12,.0f} rows/s)')
+
+        loader.drop_tables([table])
+        loader.create_tables([table])
+        start = time.perf_counter()
+        count = loader.load(table, synthetic_jug_rows(n_rows))
+        loaded = time.perf_counter() - start
+        start = time.perf_counter()
+        loader.create_indexes([table])
+        indexed = time.perf_counter() - start
+        print(f'bulk load:     {count:>10,} rows in {loaded:8.2f}s  '
+              f'({count / loaded:>12,.0f} rows/s), index build {indexed:.2f}s')
+
+        cur = conn.cursor()
+        start = time.perf_counter()
+        cur.execute(f'SELECT * FROM {table} WHERE bucket5 = 4')
+        hits = len(cur.fetchall())
+        lookup = time.perf_counter() - start
+        print(f'SELECT ... WHERE bucket5 = 4: {hits:,} rows in {lookup * 1000:.1f} ms')
+
+        plan_sql = f'EXPLAIN SELECT * FROM {table} WHERE bucket5 = 4' if postgres_dsn else \
+            f'EXPLAIN QUERY PLAN SELECT * FROM {table} WHERE bucket5 = 4'
+        cur.execute(plan_sql)
+        for row in cur.fetchall():
+            print('  plan:', row[-1] if not postgres_dsn else row[0])
+    finally:
+        conn.rollback()
+        loader.drop_tables([table])
+        conn.close()
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark bulk trace loading')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--baseline-rows', type=int, default=20_000,
+                        help='rows for the row-at-a-time baseline (it is slow)')
+    parser.add_argument('--postgres', metavar='DSN', help='load into PostgreSQL instead of SQLite')
+    parser.add_argument('--db', default='traces_bench.db', help='SQLite database file')
+    args = parser.parse_args(argv)
+
+    try:
+        benchmark(args.rows, args.baseline_rows, args.postgres, args.db)
+    except ImportError:
+        print('Missing dependency: psycopg2-binary')
+        print('Please run: pip install psycopg2-binary')
+        sys.exit(1)
+    except ValueError as exc:
+        print(exc)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,395 @@
+"""
+Monte Carlo Tree Search player for large Tic Tac Toe boards
+
+Exhaustive search stops being practical above 4x4. This player uses UCT
+selection with random rollouts on an N x N board where K in a row wins.
+
+  - The board is a bytearray (0 empty, 1 X, 2 O) and a win is checked only
+    around the last move.
+  - The tree lives in preallocated flat arrays (parent, move, first child,
+    child count, visits, wins) instead of node objects; the children of a
+    node are allocated as one contiguous block when it is expanded.
+  - After a move the subtree under it is compacted to the front of the
+    arrays and reused for the next search.
+  - With workers > 1 the search is root-parallel: every worker process keeps
+    its own tree with its own seed, and the visit counts of the root moves
+    are summed before the most visited move is picked.
+
+Play against it:
+    python ttt_mcts.py --size 7 --k 5 --budget 2 --workers 4
+"""
+
+import math
+import multiprocessing as mp
+import os
+import random
+import time
+from array import array
+
+EMPTY, X, O = 0, 1, 2
+SYMBOLS = {EMPTY: ' ', X: 'X', O: 'O'}
+DRAW = 3
+EXPLORATION = math.sqrt(2)
+DEFAULT_CAPACITY = 1_000_000
+
+
+def other(player):
+    return 3 - player
+
+
+def is_win(board, size, k, cell, player):
+    """True if the stone `player` just put on `cell` completes K in a row."""
+    r, c = divmod(cell, size)
+    for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+        count = 1
+        rr, cc = r + dr, c + dc
+        while 0 <= rr < size and 0 <= cc < size and board[rr * size + cc] == player:
+            count += 1
+            rr += dr
+            cc += dc
+        rr, cc = r - dr, c - dc
+        while 0 <= rr < size and 0 <= cc < size and board[rr * size + cc] == player:
+            count += 1
+            rr -= dr
+            cc -= dc
+        if count >= k:
+            return True
+    return False
+
+
+class Board:
+    """Compact N x N board with K-in-a-row rules."""
+
+    def __init__(self, size=3, k=None):
+        self.size = size
+        self.k = min(size, 5) if k is None else k
+        self.cells = bytearray(size * size)
+        self.to_move = X
+        self.winner = None     # X, O, DRAW or None while running
+        self.filled = 0
+
+    def copy(self):
+        other_board = Board(self.size, self.k)
+        other_board.cells[:] = self.cells
+        other_board.to_move = self.to_move
+        other_board.winner = self.winner
+        other_board.filled = self.filled
+        return other_board
+
+    def legal_moves(self):
+        return [i for i, v in enumerate(self.cells) if v == EMPTY]
+
+    def play(self, cell):
+        if self.winner is not None or self.cells[cell] != EMPTY:
+            raise ValueError(f'illegal move {cell}')
+        player = self.to_move
+        self.cells[cell] = player
+        self.filled += 1
+        if is_win(self.cells, self.size, self.k, cell, player):
+            self.winner = player
+        elif self.filled == len(self.cells):
+            self.winner = DRAW
+        self.to_move = other(player)
+
+    def rows(self):
+        n = self.size
+        return [[SYMBOLS[v] for v in self.cells[r * n:(r + 1) * n]] for r in range(n)]
+
+
+class MCTS:
+    """Single-threaded UCT search over a tree stored in flat arrays."""
+
+    def __init__(self, board, capacity=DEFAULT_CAPACITY, seed=None, exploration=EXPLORATION):
+        self.capacity = capacity
+        self.random = random.Random(seed)
+        self.exploration = exploration
+        (self.parent, self.move, self.first_child, self.n_children,
+         self.visits, self.wins) = self._allocate()
+        self._spare = None      # second set of arrays that _compact copies into
+        self._reset(board)
+
+    def _allocate(self):
+        """parent, move, first child, child count (-1: not expanded yet), visits and wins (for the
+        player who moved into the node) of every node."""
+        capacity = self.capacity
+        return (array('i', bytes(4 * capacity)), array('i', bytes(4 * capacity)),
+                array('i', bytes(4 * capacity)), array('i', bytes(4 * capacity)),
+                array('i', bytes(4 * capacity)), array('d', bytes(8 * capacity)))
+
+    def _reset(self, board):
+        self.board = board.copy()
+        self.size = 1
+        self.parent[0] = -1
+        self.move[0] = -1
+        self.n_children[0] = -1
+        self.visits[0] = 0
+        self.wins[0] = 0.0
+
+    def _expand(self, node, board):
+        moves = [i for i, v in enumerate(board.cells) if v == EMPTY]
+        count = len(moves)
+        if self.size + count > self.capacity:
+            return False
+        self.random.shuffle(moves)
+        start = self.size
+        for i, m in enumerate(moves):
+            child = start + i
+            self.parent[child] = node
+            self.move[child] = m
+            self.n_children[child] = -1
+            self.visits[child] = 0
+            self.wins[child] = 0.0
+        self.first_child[node] = start
+        self.n_children[node] = count
+        self.size += count
+        return True
+
+    def _select_child(self, node):
+        start = self.first_child[node]
+        visits, wins = self.visits, self.wins
+        log_n = math.log(visits[node] + 1)
+        c = self.exploration
+        best, best_score = start, -1.0
+        for child in range(start, start + self.n_children[node]):
+            v = visits[child]
+            if v == 0:
+                return child
+            score = wins[child] / v + c * math.sqrt(log_n / v)
+            if score > best_score:
+                best, best_score = child, score
+        return best
+
+    def _rollout(self, board):
+        if board.winner is not None:
+            return board.winner
+        cells = board.cells
+        size, k = board.size, board.k
+        moves = [i for i, v in enumerate(cells) if v == EMPTY]
+        self.random.shuffle(moves)
+        player = board.to_move
+        for m in moves:
+            cells[m] = player
+            if is_win(cells, size, k, m, player):
+                return player
+            player = other(player)
+        return DRAW
+
+    def iterate(self):
+        """One selection / expansion / rollout / backpropagation pass."""
+        board = self.board.copy()
+        node = 0
+        while board.winner is None:
+            if self.n_children[node] < 0:
+                if self._expand(node, board) and self.n_children[node]:
+                    node = self._select_child(node)
+                    board.play(self.move[node])
+                break
+            node = self._select_child(node)
+            board.play(self.move[node])
+
+        winner = self._rollout(board)
+
+        mover = other(board.to_move)  # the player who moved into `node`
+        while node >= 0:
+            self.visits[node] += 1
+            if winner == DRAW:
+                self.wins[node] += 0.5
+            elif winner == mover:
+                self.wins[node] += 1.0
+            mover = other(mover)
+            node = self.parent[node]
+
+    def search(self, seconds=None, iterations=None):
+        """Run until the time budget or iteration count is used up; return root visit counts."""
+        if self.board.winner is not None:
+            return {}
+        deadline = time.perf_counter() + seconds if seconds is not None else None
+        done = 0
+        while True:
+            for _ in range(64):
+                self.iterate()
+            done += 64
+            if iterations is not None and done >= iterations:
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            if deadline is None and iterations is None:
+                break
+        return self.root_visits()
+
+    def root_visits(self):
+        if self.n_children[0] <= 0:
+            return {}
+        start = self.first_child[0]
+        return {self.move[c]: self.visits[c] for c in range(start, start + self.n_children[0])}
+
+    def advance(self, move):
+        """Play `move` at the root and keep the matching subtree."""
+        self.board.play(move)
+        child = -1
+        if self.n_children[0] > 0:
+            start = self.first_child[0]
+            for c in range(start, start + self.n_children[0]):
+                if self.move[c] == move:
+                    child = c
+                    break
+        if child < 0 or self.visits[child] == 0:
+            self._reset(self.board)
+            return
+        self._compact(child)
+
+    def _compact(self, root):
+        """Copy the subtree under `root` to the front of the spare arrays (breadth first), then
+        swap the two sets.
+
+        Blocks are allocated in expansion order, not breadth first, so copying
+        within the same arrays could overwrite blocks that are still to be read.
+        """
+        src = (self.parent, self.move, self.first_child, self.n_children, self.visits, self.wins)
+        if self._spare is None:
+            self._spare = self._allocate()
+        parent, move, first, count, visits, wins = self._spare
+        _, old_move, old_first, old_count, old_visits, old_wins = src
+
+        move[0], count[0], visits[0], wins[0] = old_move[root], old_count[root], old_visits[root], old_wins[root]
+        parent[0] = -1
+        size = 1
+        queue = [root]          # old index of the node at new index head
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            n = old_count[node]
+            if n > 0:
+                old = old_first[node]
+                first[head] = size
+                for i in range(n):
+                    src_i, dst = old + i, size + i
+                    move[dst] = old_move[src_i]
+                    count[dst] = old_count[src_i]
+                    visits[dst] = old_visits[src_i]
+                    wins[dst] = old_wins[src_i]
+                    parent[dst] = head
+                    queue.append(src_i)
+                size += n
+            head += 1
+        (self.parent, self.move, self.first_child, self.n_children,
+         self.visits, self.wins) = self._spare
+        self._spare = src
+        self.size = size
+
+
+# ---- Root-parallel player ----
+
+def _worker(conn, board, capacity, seed):
+    tree = MCTS(board, capacity, seed)
+    while True:
+        command, arg = conn.recv()
+        if command == 'search':
+            conn.send(tree.search(seconds=arg))
+        elif command == 'advance':
+            tree.advance(arg)
+        else:
+            break
+    conn.close()
+
+
+class MCTSPlayer:
+    """Root-parallel MCTS: one tree per process, visit counts merged at the root."""
+
+    def __init__(self, board, workers=None, capacity=DEFAULT_CAPACITY, seed=None):
+        workers = workers or os.cpu_count() or 1
+        base = random.Random(seed).randrange(1 << 30)
+        self.tree = MCTS(board, capacity, base)
+        self.pipes = []
+        self.processes = []
+        ctx = mp.get_context('spawn')
+        for i in range(1, workers):
+            parent_conn, child_conn = ctx.Pipe()
+            proc = ctx.Process(target=_worker, args=(child_conn, board, capacity, base + i), daemon=True)
+            proc.start()
+            self.pipes.append(parent_conn)
+            self.processes.append(proc)
+
+    def choose(self, seconds=1.0):
+        """Search for `seconds` on every worker and return (move, merged visit counts)."""
+        for conn in self.pipes:
+            conn.send(('search', seconds))
+        totals = dict(self.tree.search(seconds=seconds))
+        for conn in self.pipes:
+            for move, visits in conn.recv().items():
+                totals[move] = totals.get(move, 0) + visits
+        move = max(totals, key=totals.get)
+        return move, totals
+
+    def advance(self, move):
+        """Tell every tree that `move` was played (by either side)."""
+        self.tree.advance(move)
+        for conn in self.pipes:
+            conn.send(('advance', move))
+
+    def close(self):
+        for conn in self.pipes:
+            conn.send(('stop', None))
+        for proc in self.processes:
+            proc.join(timeout=1)
+        self.pipes = []
+        self.processes = []
+
+
+# ---- Game ----
+
+def print_board(board):
+    width = 4 * board.size - 3
+    print('    ' + '   '.join(str(c % 10) for c in range(board.size)))
+    for r, row in enumerate(board.rows()):
+        print(f'{r:>2}  ' + ' | '.join(row))
+        print('    ' + '-' * width)
+
+
+def play(size=7, k=None, budget=1.0, workers=None, human=X):
+    board = Board(size, k)
+    player = MCTSPlayer(board, workers)
+    try:
+        while board.winner is None:
+            print_board(board)
+            if board.to_move == human:
+                try:
+                    row = int(input(f'Enter row (0-{size - 1}): '))
+                    col = int(input(f'Enter column (0-{size - 1}): '))
+                except ValueError:
+                    print('Please enter a valid number!')
+                    continue
+                if not (0 <= row < size and 0 <= col < size) or board.cells[row * size + col]:
+                    print('Invalid move! Try again.')
+                    continue
+                move = row * size + col
+            else:
+                move, visits = player.choose(budget)
+                print(f'Computer plays {divmod(move, size)} after {sum(visits.values()):,} playouts')
+            board.play(move)
+            player.advance(move)
+    finally:
+        player.close()
+
+    print_board(board)
+    if board.winner == DRAW:
+        print("It's a tie!")
+    else:
+        print(f'Player {SYMBOLS[board.winner]} wins!')
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Tic Tac Toe against MCTS')
+    parser.add_argument('--size', type=int, default=7)
+    parser.add_argument('--k', type=int, help='stones in a row to win (default: min(size, 5))')
+    parser.add_argument('--budget', type=float, default=1.0, help='seconds per computer move')
+    parser.add_argument('--workers', type=int, help='processes (default: CPU count)')
+    parser.add_argument('--play-as', choices=('X', 'O'), default='X')
+    args = parser.parse_args(argv)
+    play(args.size, args.k, args.budget, args.workers, X if args.play_as == 'X' else O)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+"""
+Water jug puzzle solver (generalisation of PUZZLE_GAME 🧩)
+
+Given any list of jug capacities and a target volume, find the shortest
+sequence of Fill / Empty / Transfer actions that leaves exactly `target`
+litres in one of the jugs.
+
+The search is a breadth-first search over packed integer states: the
+contents of every jug are stored as digits of one mixed-radix integer, so a
+state is a single int. The parent map doubles as the visited set; each entry
+is one int that packs the previous state with the action taken. Unreachable
+targets are rejected up front with the classic gcd check.
+
+The result uses the same row layout as the `Buckets` table:
+    (step, action, bucket5, bucket3)
+i.e. one column per jug, named after its capacity.
+
+Run:
+    python water_jug.py                  # 5L + 3L -> 4L, like PUZZLE_GAME
+    python water_jug.py 4 7 11 13 --target 9
+"""
+
+import sys
+from collections import deque
+from math import gcd
+from functools import reduce
+
+FILL, EMPTY, TRANSFER = 0, 1, 2
+
+
+def column_names(capacities):
+    """Return the Buckets-style column names, e.g. [5, 3] -> ['step', 'action', 'bucket5', 'bucket3']."""
+    names = []
+    seen = {}
+    for cap in capacities:
+        name = f'bucket{cap}'
+        seen[name] = seen.get(name, 0) + 1
+        names.append(name if capacities.count(cap) == 1 else f'{name}_{seen[name]}')
+    return ['step', 'action'] + names
+
+
+def is_reachable(capacities, target):
+    """Return True if `target` litres can ever end up in one of the jugs."""
+    if target == 0:
+        return True
+    if not capacities or target > max(capacities):
+        return False
+    return target % reduce(gcd, capacities) == 0
+
+
+def _action_name(kind, i, j, capacities):
+    if kind == FILL:
+        return f'Fill {capacities[i]}L'
+    if kind == EMPTY:
+        return f'Empty {capacities[i]}L'
+    return f'Transfer {capacities[i]}L to {capacities[j]}L'
+
+
+def solve(capacities, target):
+    """Return the shortest action trace as a list of (step, action, *volumes) rows.
+
+    Raises ValueError if the target can never be measured with these jugs.
+    An empty list means the target is already satisfied by the empty jugs.
+    """
+    capacities = [int(c) for c in capacities]
+    if any(c <= 0 for c in capacities):
+        raise ValueError('jug capacities must be positive')
+    if target < 0 or not is_reachable(capacities, target):
+        raise ValueError(f'{target}L cannot be measured with jugs {capacities}')
+    if target == 0:
+        return []
+
+    n = len(capacities)
+    radix = [c + 1 for c in capacities]
+    stride = [1] * n
+    for i in range(1, n):
+        stride[i] = stride[i - 1] * radix[i - 1]
+
+    # parent[state] = previous_state * codes + (kind * n + i) * n + j, so each
+    # visited state costs one int; the start state maps to -1
+    codes = 3 * n * n
+    parent = {0: -1}
+    queue = deque([0])
+    found = None
+    pairs = [(i, j) for i in range(n) for j in range(n) if i != j]
+
+    while queue:
+        state = queue.popleft()
+        vol = [(state // stride[i]) % radix[i] for i in range(n)]
+        if target in vol:
+            found = state
+            break
+
+        for i in range(n):
+            v = vol[i]
+            if v < capacities[i]:
+                nxt = state + (capacities[i] - v) * stride[i]
+                if nxt not in parent:
+                    parent[nxt] = state * codes + (FILL * n + i) * n + i
+                    queue.append(nxt)
+            if v > 0:
+                nxt = state - v * stride[i]
+                if nxt not in parent:
+                    parent[nxt] = state * codes + (EMPTY * n + i) * n + i
+                    queue.append(nxt)
+
+        for i, j in pairs:
+            amount = min(vol[i], capacities[j] - vol[j])
+            if amount:
+                nxt = state - amount * stride[i] + amount * stride[j]
+                if nxt not in parent:
+                    parent[nxt] = state * codes + (TRANSFER * n + i) * n + j
+                    queue.append(nxt)
+
+    if found is None:
+        raise ValueError(f'{target}L cannot be measured with jugs {capacities}')
+
+    path = []
+    state = found
+    while parent[state] >= 0:
+        prev, code = divmod(parent[state], codes)
+        path.append((state, code))
+        state = prev
+    path.reverse()
+
+    rows = []
+    for step, (state, code) in enumerate(path, start=1):
+        kind, rest = divmod(code, n * n)
+        i, j = divmod(rest, n)
+        vol = tuple((state // stride[k]) % radix[k] for k in range(n))
+        rows.append((step, _action_name(kind, i, j, capacities)) + vol)
+    return rows
+
+
+def print_trace(capacities, rows):
+    header = column_names(capacities)
+    print(' | '.join(header))
+    for row in rows:
+        print(' | '.join(str(v) for v in row))
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Shortest water jug solution')
+    parser.add_argument('capacities', nargs='*', type=int, default=[5, 3])
+    parser.add_argument('--target', type=int, default=4)
+    args = parser.parse_args(argv)
+
+    try:
+        rows = solve(args.capacities, args.target)
+    except ValueError as exc:
+        print(exc)
+        sys.exit(1)
+    print_trace(args.capacities, rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+"""
+In-database water jug search vs. the client-side solver
+
+Runs water_jug_sqlite.sql (and water_jug_postgres.sql when a DSN is given)
+on growing two-jug puzzles, checks that every answer is as short as
+water_jug.solve()'s and ends on the target, and prints both runtimes. The
+plan of the recursive query is printed once per database.
+
+A recursive CTE step only sees the rows of the previous step, so both
+queries carry one breadth-first layer per row together with every state
+seen so far, and expand each state once. Membership in the seen states is
+a string or array scan, so the SQL still grows faster than the client BFS
+on the largest jugs. Every SQL answer is replayed move by move from empty
+jugs. The run stops growing once one SQL solve takes longer than
+--max-seconds.
+
+Run:
+    python water_jug_cte.py
+    python water_jug_cte.py --postgres "dbname=postgres user=postgres"
+"""
+
+import os
+import sqlite3
+import sys
+import time
+
+from water_jug import solve
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SQLITE_SQL = os.path.join(HERE, 'water_jug_sqlite.sql')
+POSTGRES_SQL = os.path.join(HERE, 'water_jug_postgres.sql')
+
+# coprime capacities, so every target up to the larger jug is reachable;
+# the targets need long traces
+PUZZLES = [
+    (5, 3, 4),
+    (13, 7, 6),
+    (31, 17, 2),
+    (61, 37, 30),
+    (127, 71, 5),
+    (251, 149, 100),
+    (509, 307, 1),
+    (1021, 619, 500),
+]
+
+
+def _read(path):
+    with open(path) as f:
+        return f.read()
+
+
+class SQLiteSolver:
+    name = 'sqlite'
+
+    def __init__(self):
+        self.conn = sqlite3.connect(':memory:')
+        self.sql = _read(SQLITE_SQL)
+
+    def solve(self, a, b, target):
+        return self.conn.execute(self.sql, {'a': a, 'b': b, 'target': target}).fetchall()
+
+    def plan(self, a, b, target):
+        rows = self.conn.execute('EXPLAIN QUERY PLAN ' + self.sql,
+                                 {'a': a, 'b': b, 'target': target}).fetchall()
+        return [detail for _, _, _, detail in rows]
+
+    def close(self):
+        self.conn.close()
+
+
+class PostgresSolver:
+    name = 'postgres'
+
+    def __init__(self, dsn):
+        import psycopg2
+
+        self.conn = psycopg2.connect(dsn)
+        self.conn.autocommit = True
+        with self.conn.cursor() as cur:
+            cur.execute(_read(POSTGRES_SQL))
+
+    def solve(self, a, b, target):
+        with self.conn.cursor() as cur:
+            cur.execute('SELECT * FROM solve_water_jug(%s, %s, %s)', (a, b, target))
+            return cur.fetchall()
+
+    def plan(self, a, b, target):
+        with self.conn.cursor() as cur:
+            cur.execute('EXPLAIN (ANALYZE, COSTS OFF) SELECT * FROM solve_water_jug(%s, %s, %s)',
+                        (a, b, target))
+            return [row[0] for row in cur.fetchall()]
+
+    def close(self):
+        self.conn.close()
+
+
+def _check(rows, expected, a, b, target):
+    """Replay the SQL trace from empty jugs: every step must be a legal move that changes the
+    jugs and lands on the volumes in its row, and the trace must be as short as `expected`."""
+    if len(rows) != len(expected):
+        raise AssertionError(f'{len(rows)} steps in SQL, {len(expected)} client-side')
+    moves = {
+        f'Fill {a}L': lambda x, y: (a, y),
+        f'Fill {b}L': lambda x, y: (x, b),
+        f'Empty {a}L': lambda x, y: (0, y),
+        f'Empty {b}L': lambda x, y: (x, 0),
+        f'Transfer {a}L to {b}L': lambda x, y: (x - min(x, b - y), y + min(x, b - y)),
+        f'Transfer {b}L to {a}L': lambda x, y: (x + min(y, a - x), y - min(y, a - x)),
+    }
+    x = y = 0
+    for number, (step, action, bx, by) in enumerate(rows, start=1):
+        if step != number:
+            raise AssertionError(f'step {step} where step {number} was expected')
+        if action not in moves:
+            raise AssertionError(f'step {step}: unknown action {action!r}')
+        nx, ny = moves[action](x, y)
+        if (nx, ny) == (x, y):
+            raise AssertionError(f'step {step}: {action} does nothing at ({x}, {y})')
+        if (bx, by) != (nx, ny):
+            raise AssertionError(f'step {step}: {action} from ({x}, {y}) gives ({nx}, {ny}), SQL says ({bx}, {by})')
+        x, y = nx, ny
+    if rows and target not in (x, y):
+        raise AssertionError(f'the SQL trace ends at ({x}, {y}) without {target}L')
+
+
+def compare(solvers, puzzles=PUZZLES, max_seconds=10.0):
+    print(f"{'jugs':>12} {'target':>6} {'steps':>5} {'client':>10}"
+          + ''.join(f' {s.name:>10}' for s in solvers))
+    active = list(solvers)
+    for a, b, target in puzzles:
+        if not active:
+            break
+        start = time.perf_counter()
+        expected = solve([a, b], target)
+        client = time.perf_counter() - start
+        line = f'{f"{a}L+{b}L":>12} {target:>6} {len(expected):>5} {client * 1000:8.2f}ms'
+        for solver in solvers:
+            if solver not in active:
+                line += f" {'-':>10}"
+                continue
+            start = time.perf_counter()
+            rows = solver.solve(a, b, target)
+            elapsed = time.perf_counter() - start
+            _check(rows, expected, a, b, target)
+            line += f' {elapsed * 1000:8.1f}ms'
+            if elapsed > max_seconds:
+                active.remove(solver)
+        print(line)
+
+    a, b, target = puzzles[0]
+    for solver in solvers:
+        print(f'\n{solver.name} plan for {a}L+{b}L -> {target}L:')
+        for line in solver.plan(a, b, target):
+            print('  ' + line)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Recursive CTE water jug solver vs. client-side BFS')
+    parser.add_argument('--postgres', metavar='DSN', help='also run the PostgreSQL function')
+    parser.add_argument('--max-seconds', type=float, default=10.0,
+                        help='stop growing a database once one solve takes longer than this')
+    args = parser.parse_args(argv)
+
+    solvers = [SQLiteSolver()]
+    if args.postgres:
+        try:
+            solvers.append(PostgresSolver(args.postgres))
+        except ImportError:
+            print('Missing dependency: psycopg2-binary')
+            print('Please run: pip install psycopg2-binary')
+            sys.exit(1)
+    try:
+        compare(solvers, max_seconds=args.max_seconds)
+    finally:
+        for solver in solvers:
+            solver.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+-- Shortest water jug solution computed inside PostgreSQL with WITH RECURSIVE
+--
+--     SELECT * FROM solve_water_jug(5, 3, 4);
+--     INSERT INTO Buckets SELECT * FROM solve_water_jug(5, 3, 4);
+--
+-- Output has the Buckets columns (step, action, bucket5, bucket3); for jugs
+-- other than 5L/3L bucket5 and bucket3 hold the first and second jug. An
+-- unreachable target returns no rows.
+--
+-- layer is a breadth-first search with one row per depth. A recursive step
+-- only sees the row of the previous step, so that row carries the whole
+-- search state: `frontier`, the states first reached at this depth as a
+-- jsonb array of [x, y, px, py, move], and `seen`, the codes
+-- x * (capacity_b + 1) + y of every state reached so far. A state is kept
+-- only if its code is not in `seen`, so every state is expanded once, at the
+-- depth it is first reached, and the fill / empty cycles end there. (A CYCLE
+-- clause would only stop a path from revisiting its own states; the number
+-- of such paths still grows with the square of the capacities.) The search
+-- stops after the depth that reaches the target, or when no new state is
+-- found. The shortest path is then rebuilt from the goal by following one
+-- parent per state. The function is a single SQL statement and is inlined
+-- into the caller's plan, so EXPLAIN shows the recursive CTE itself.
+
+CREATE OR REPLACE FUNCTION solve_water_jug(capacity_a INT, capacity_b INT, target INT)
+RETURNS TABLE (step INT, action VARCHAR(50), bucket5 INT, bucket3 INT)
+LANGUAGE sql STABLE AS $$
+WITH RECURSIVE
+    layer(depth, frontier, seen) AS (
+        SELECT 0, '[[0, 0, null, null, 0]]'::jsonb, ARRAY[0]
+        UNION ALL
+        SELECT l.depth + 1, n.frontier, l.seen || n.codes
+        FROM layer AS l
+        CROSS JOIN LATERAL (
+            SELECT jsonb_agg(jsonb_build_array(e.nx, e.ny, e.px, e.py, e.k)) AS frontier,
+                   array_agg(e.nx * (capacity_b + 1) + e.ny) AS codes
+            FROM (
+                -- one parent per new state: the smallest move into it
+                SELECT DISTINCT ON (nx, ny) nx, ny, px, py, k
+                FROM (
+                    SELECT
+                        CASE m.k
+                            WHEN 1 THEN capacity_a
+                            WHEN 3 THEN 0
+                            WHEN 5 THEN s.x - p.a_to_b
+                            WHEN 6 THEN s.x + p.b_to_a
+                            ELSE s.x
+                        END AS nx,
+                        CASE m.k
+                            WHEN 2 THEN capacity_b
+                            WHEN 4 THEN 0
+                            WHEN 5 THEN s.y + p.a_to_b
+                            WHEN 6 THEN s.y - p.b_to_a
+                            ELSE s.y
+                        END AS ny,
+                        s.x AS px,
+                        s.y AS py,
+                        m.k
+                    FROM jsonb_array_elements(l.frontier) AS f(v)
+                    CROSS JOIN LATERAL (SELECT (f.v ->> 0)::INT AS x, (f.v ->> 1)::INT AS y) AS s
+                    CROSS JOIN LATERAL (SELECT LEAST(s.x, capacity_b - s.y) AS a_to_b,
+                                               LEAST(s.y, capacity_a - s.x) AS b_to_a) AS p
+                    CROSS JOIN (VALUES (1), (2), (3), (4), (5), (6)) AS m(k)
+                    WHERE CASE m.k
+                              WHEN 1 THEN s.x < capacity_a
+                              WHEN 2 THEN s.y < capacity_b
+                              WHEN 3 THEN s.x > 0
+                              WHEN 4 THEN s.y > 0
+                              WHEN 5 THEN s.x > 0 AND s.y < capacity_b
+                              ELSE s.y > 0 AND s.x < capacity_a
+                          END
+                ) AS moved
+                WHERE nx * (capacity_b + 1) + ny <> ALL (l.seen)
+                ORDER BY nx, ny, k
+            ) AS e
+        ) AS n
+        WHERE n.frontier IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM jsonb_array_elements(l.frontier) AS f(v)
+                          WHERE (f.v ->> 0)::INT = target OR (f.v ->> 1)::INT = target)
+    ),
+
+    parent(depth, x, y, px, py, k) AS (
+        SELECT l.depth, (f.v ->> 0)::INT, (f.v ->> 1)::INT, (f.v ->> 2)::INT, (f.v ->> 3)::INT, (f.v ->> 4)::INT
+        FROM layer AS l
+        CROSS JOIN LATERAL jsonb_array_elements(l.frontier) AS f(v)
+    ),
+
+    goal AS (
+        SELECT x, y FROM parent
+        WHERE x = target OR y = target
+        ORDER BY depth, x, y
+        LIMIT 1
+    ),
+
+    trace(depth, x, y, px, py, k) AS (
+        SELECT p.* FROM parent AS p JOIN goal AS g ON g.x = p.x AND g.y = p.y
+        UNION ALL
+        SELECT p.* FROM trace AS t JOIN parent AS p ON p.x = t.px AND p.y = t.py
+    )
+
+SELECT
+    depth,
+    (CASE k
+        WHEN 1 THEN 'Fill ' || capacity_a || 'L'
+        WHEN 2 THEN 'Fill ' || capacity_b || 'L'
+        WHEN 3 THEN 'Empty ' || capacity_a || 'L'
+        WHEN 4 THEN 'Empty ' || capacity_b || 'L'
+        WHEN 5 THEN 'Transfer ' || capacity_a || 'L to ' || capacity_b || 'L'
+        ELSE 'Transfer ' || capacity_b || 'L to ' || capacity_a || 'L'
+    END)::VARCHAR(50),
+    x,
+    y
+FROM trace
+WHERE depth > 0
+ORDER BY depth;
+$$;
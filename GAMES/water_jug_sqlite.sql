@@ -0,0 +1,106 @@
+-- Shortest water jug solution computed inside SQLite (3.25+, with the JSON1
+-- functions) with WITH RECURSIVE
+--
+-- Parameters: :a and :b are the jug capacities, :target the volume to measure.
+-- Output has the Buckets columns (step, action, bucket5, bucket3); for jugs
+-- other than 5L/3L bucket5 and bucket3 hold the first and second jug.
+--
+-- layer is a breadth-first search with one row per depth. A recursive step
+-- only sees the row of the previous step, so that row carries the whole
+-- search state: `frontier`, the states first reached at this depth as a JSON
+-- array of [x, y, px, py, move], and `seen`, the frontiers of all earlier
+-- depths concatenated. A state is kept only if neither string contains it
+-- (instr on its '[x,y,' prefix), so every state is expanded once, at the
+-- depth it is first reached, and the fill / empty cycles end there. The
+-- search stops after the depth that reaches the target, or when a frontier
+-- comes out empty. The shortest path is then rebuilt from the goal by
+-- following one parent per state.
+
+WITH RECURSIVE
+    moves(k) AS (VALUES (1), (2), (3), (4), (5), (6)),
+
+    layer(depth, frontier, seen) AS (
+        SELECT 0, '[[0,0,null,null,0]]', ''
+        UNION ALL
+        SELECT
+            l.depth + 1,
+            (SELECT json_group_array(json_array(nx, ny, px, py, k))
+             FROM (
+                 -- one parent per new state: the smallest move into it
+                 SELECT nx, ny, px, py, MIN(k) AS k
+                 FROM (
+                     SELECT
+                         CASE m.k
+                             WHEN 1 THEN :a
+                             WHEN 3 THEN 0
+                             WHEN 5 THEN s.x - min(s.x, :b - s.y)
+                             WHEN 6 THEN s.x + min(s.y, :a - s.x)
+                             ELSE s.x
+                         END AS nx,
+                         CASE m.k
+                             WHEN 2 THEN :b
+                             WHEN 4 THEN 0
+                             WHEN 5 THEN s.y + min(s.x, :b - s.y)
+                             WHEN 6 THEN s.y - min(s.y, :a - s.x)
+                             ELSE s.y
+                         END AS ny,
+                         s.x AS px,
+                         s.y AS py,
+                         m.k AS k
+                     FROM (SELECT json_extract(value, '$[0]') AS x, json_extract(value, '$[1]') AS y
+                           FROM json_each(l.frontier)) AS s, moves AS m
+                     WHERE CASE m.k
+                               WHEN 1 THEN s.x < :a
+                               WHEN 2 THEN s.y < :b
+                               WHEN 3 THEN s.x > 0
+                               WHEN 4 THEN s.y > 0
+                               WHEN 5 THEN s.x > 0 AND s.y < :b
+                               ELSE s.y > 0 AND s.x < :a
+                           END
+                 )
+                 WHERE instr(l.seen, '[' || nx || ',' || ny || ',') = 0
+                   AND instr(l.frontier, '[' || nx || ',' || ny || ',') = 0
+                 GROUP BY nx, ny
+             )),
+            l.seen || l.frontier
+        FROM layer AS l
+        WHERE l.frontier <> '[]'
+          AND NOT EXISTS (SELECT 1 FROM json_each(l.frontier)
+                          WHERE json_extract(value, '$[0]') = :target
+                             OR json_extract(value, '$[1]') = :target)
+    ),
+
+    parent(depth, x, y, px, py, k) AS (
+        SELECT l.depth, json_extract(value, '$[0]'), json_extract(value, '$[1]'),
+               json_extract(value, '$[2]'), json_extract(value, '$[3]'), json_extract(value, '$[4]')
+        FROM layer AS l, json_each(l.frontier)
+    ),
+
+    goal(x, y) AS (
+        SELECT x, y FROM parent
+        WHERE x = :target OR y = :target
+        ORDER BY depth, x, y
+        LIMIT 1
+    ),
+
+    trace(depth, x, y, px, py, k) AS (
+        SELECT p.* FROM parent AS p JOIN goal AS g ON g.x = p.x AND g.y = p.y
+        UNION ALL
+        SELECT p.* FROM trace AS t JOIN parent AS p ON p.x = t.px AND p.y = t.py
+    )
+
+SELECT
+    depth AS step,
+    CASE k
+        WHEN 1 THEN 'Fill ' || :a || 'L'
+        WHEN 2 THEN 'Fill ' || :b || 'L'
+        WHEN 3 THEN 'Empty ' || :a || 'L'
+        WHEN 4 THEN 'Empty ' || :b || 'L'
+        WHEN 5 THEN 'Transfer ' || :a || 'L to ' || :b || 'L'
+        ELSE 'Transfer ' || :b || 'L to ' || :a || 'L'
+    END AS action,
+    x AS bucket5,
+    y AS bucket3
+FROM trace
+WHERE depth > 0
+ORDER BY step;
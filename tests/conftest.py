@@ -0,0 +1,10 @@
+import os
+import sys
+
+# The game modules import each other by plain name, as when run from GAMES/.
+GAMES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'GAMES')
+sys.path.insert(0, GAMES)
+
+# pygame tests draw to offscreen surfaces; no display or sound card needed
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
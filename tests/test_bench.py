@@ -0,0 +1,59 @@
+import json
+import os
+
+import bench_hotpaths
+import game_modules
+
+# The committed baseline comes from one developer machine; CI runners differ, so
+# the check is relative to the median ratio and only fails on gross slowdowns
+# unless BENCH_THRESHOLD says otherwise.
+CI_THRESHOLD = float(os.environ.get('BENCH_THRESHOLD', '1.0'))
+
+
+def test_compare_flags_only_slowdowns_past_threshold():
+    baseline = {'a': 1.0, 'b': 1.0, 'c': 1.0}
+    results = {'a': 1.2, 'b': 1.3, 'c': 0.5, 'new': 9.0}
+    assert bench_hotpaths.compare(results, baseline, 0.25) == ['b']
+
+
+def test_relative_compare_ignores_machine_speed():
+    baseline = {'a': 1.0, 'b': 1.0, 'c': 1.0, 'd': 1.0}
+    results = {'a': 2.0, 'b': 2.1, 'c': 1.9, 'd': 3.0}
+    assert bench_hotpaths.compare(results, baseline, 0.25) == ['a', 'b', 'c', 'd']
+    assert bench_hotpaths.compare(results, baseline, 0.25, relative=True) == ['d']
+
+
+def test_missing_baseline_fails(tmp_path):
+    missing = str(tmp_path / 'none.json')
+    assert bench_hotpaths.main(['--baseline', missing, '-k', 'rps', '--repeat', '1']) == 1
+
+
+def test_save_then_compare(tmp_path):
+    path = str(tmp_path / 'baseline.json')
+    assert bench_hotpaths.main(['--baseline', path, '--save', '-k', 'rps', '--repeat', '1']) == 0
+    with open(path) as f:
+        saved = json.load(f)
+    assert set(saved['results']) == {'rps.determine_winner'}
+
+    saved['results']['rps.determine_winner'] /= 100
+    with open(path, 'w') as f:
+        json.dump(saved, f)
+    assert bench_hotpaths.main(['--baseline', path, '-k', 'rps', '--repeat', '1']) == 1
+
+
+def test_committed_baseline_covers_every_benchmark():
+    with open(bench_hotpaths.DEFAULT_BASELINE) as f:
+        baseline = json.load(f)['results']
+    assert set(baseline) == set(bench_hotpaths.BENCHMARKS) | set(bench_hotpaths.METRICS)
+
+
+def test_hard_puzzles_are_solved():
+    sudoku = game_modules.load('sudoku')
+    for text in bench_hotpaths.SUDOKU_HARD:
+        grid = bench_hotpaths._parse_sudoku(text)
+        assert sudoku.solve(grid)
+        assert all(sorted(row) == list(range(1, 10)) for row in grid)
+
+
+def test_no_regression_against_committed_baseline():
+    assert bench_hotpaths.main(['--threshold', str(CI_THRESHOLD), '--relative', '--repeat', '3']) == 0
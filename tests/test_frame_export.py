@@ -0,0 +1,99 @@
+import io
+import os
+
+import pytest
+
+pygame = pytest.importorskip('pygame')
+
+import frame_export  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def pong_frames():
+    return frame_export.demo_pong(40)
+
+
+@pytest.fixture(scope='module')
+def tetris_frames():
+    return frame_export.demo_tetris(30)
+
+
+def test_demos_are_seeded(pong_frames, tetris_frames):
+    assert frame_export.demo_pong(40) == pong_frames
+    assert frame_export.demo_tetris(30) == tetris_frames
+    assert len(pong_frames) == 40 and len(tetris_frames) == 30
+    assert set(pong_frames[0]) == {'left', 'right', 'ball', 'score'}
+    assert set(tetris_frames[0]) == {'locked', 'piece', 'next', 'hold', 'score', 'level'}
+
+
+def test_replay_round_trip(tmp_path, tetris_frames):
+    path = str(tmp_path / 'game.jsonl')
+    frame_export.save_replay(path, tetris_frames)
+    assert frame_export.load_replay(path) == tetris_frames
+
+
+def test_unknown_game_is_rejected():
+    with pytest.raises(ValueError):
+        frame_export.Renderer('snake')
+
+
+@pytest.mark.parametrize('game', frame_export.GAMES)
+def test_raw_frames_match_the_surface(game, pong_frames, tetris_frames):
+    frames = pong_frames if game == 'pong' else tetris_frames
+    renderer = frame_export.Renderer(game)
+    width, height = renderer.size
+    stream = io.BytesIO()
+    assert frame_export.export(game, frames[:3], raw_stream=stream) == 3
+    data = stream.getvalue()
+    assert len(data) == 3 * width * height * 4
+
+    renderer.render(frames[2])
+    assert data[-width * height * 4:] == bytes(renderer.raw())
+    # the buffer is B, G, R, X on little-endian machines (bgr0)
+    pixels = renderer.pixels()
+    x, y = width // 2, height // 3
+    r, g, b = (int(v) for v in pixels[x, y])
+    del pixels
+    offset = (y * width + x) * 4
+    last = data[-width * height * 4:]
+    if frame_export.PIX_FMT == 'bgr0':
+        assert tuple(last[offset:offset + 3]) == (b, g, r)
+
+
+def test_frames_differ_as_the_game_moves(pong_frames):
+    renderer = frame_export.Renderer('pong')
+    first = bytes(renderer.render(pong_frames[0]).get_view('0'))
+    last = bytes(renderer.render(pong_frames[-1]).get_view('0'))
+    assert first != last
+
+
+def test_png_export(tmp_path, tetris_frames):
+    directory = str(tmp_path / 'frames')
+    assert frame_export.export('tetris', tetris_frames[:4], png_dir=directory) == 4
+    names = sorted(os.listdir(directory))
+    assert names == [f'frame_{i:06d}.png' for i in range(4)]
+    image = pygame.image.load(os.path.join(directory, names[0]))
+    assert image.get_size() == frame_export.Renderer('tetris').size
+
+
+def test_export_needs_exactly_one_target(tmp_path):
+    with pytest.raises(ValueError):
+        frame_export.export('pong', [], png_dir=str(tmp_path), raw_stream=io.BytesIO())
+    with pytest.raises(ValueError):
+        frame_export.export('pong', [])
+
+
+def test_pool_output_matches_single_process(pong_frames):
+    single, pooled = io.BytesIO(), io.BytesIO()
+    frame_export.export('pong', pong_frames[:10], raw_stream=single)
+    assert frame_export.export('pong', pong_frames[:10], raw_stream=pooled, workers=2, chunk_size=3) == 10
+    assert pooled.getvalue() == single.getvalue()
+
+
+def test_main_writes_raw_file(tmp_path, capsys):
+    path = str(tmp_path / 'pong.raw')
+    frame_export.main(['pong', '--demo', '5', '--raw', path, '--save-replay', str(tmp_path / 'r.jsonl')])
+    width, height = frame_export.Renderer('pong').size
+    assert os.path.getsize(path) == 5 * width * height * 4
+    assert len(frame_export.load_replay(str(tmp_path / 'r.jsonl'))) == 5
+    assert '5 frames' in capsys.readouterr().err
@@ -0,0 +1,105 @@
+import argparse
+import csv
+import json
+
+import pytest
+
+import frame_profiler
+from frame_profiler import FrameProfiler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(frame_profiler.time, 'perf_counter', clock)
+    return clock
+
+
+def run_frames(profiler, clock, durations):
+    """One frame per (input, update, render) tuple of milliseconds."""
+    for phases in durations:
+        profiler.begin()
+        for phase, ms in zip(frame_profiler.PHASES, phases):
+            clock.now += ms / 1000
+            profiler.mark(phase)
+        clock.now += 0.010  # idle until the next frame
+
+
+def test_disabled_profiler_records_nothing(clock):
+    profiler = FrameProfiler(size=8)
+    assert profiler.begin is frame_profiler._noop
+    run_frames(profiler, clock, [(1, 2, 3)] * 5)
+    assert profiler.count == 0
+    assert profiler.stats()['render']['max'] == 0.0
+
+
+def test_ring_buffer_keeps_the_latest_frames(clock):
+    profiler = FrameProfiler(size=4, enabled=True)
+    run_frames(profiler, clock, [(1, n, 2) for n in range(10)])
+    assert profiler.count == 4
+    assert profiler.ordered('update') == pytest.approx([6, 7, 8, 9])
+    assert profiler.ordered('frame')[-1] == pytest.approx(1 + 8 + 2 + 10)
+
+
+def test_stats_percentiles(clock):
+    profiler = FrameProfiler(size=100, enabled=True)
+    run_frames(profiler, clock, [(0, n, 0) for n in range(1, 101)])
+    update = profiler.stats()['update']
+    assert update['p50'] == pytest.approx(51)
+    assert update['p99'] == pytest.approx(99)
+    assert update['max'] == pytest.approx(100)
+
+
+def test_toggle_overlay_switches_collection_on(clock):
+    profiler = FrameProfiler(size=4)
+    profiler.toggle_overlay()
+    assert profiler.enabled and profiler.overlay
+    run_frames(profiler, clock, [(1, 1, 1)])
+    assert profiler.count == 1
+    profiler.set_enabled(False)
+    run_frames(profiler, clock, [(1, 1, 1)])
+    assert profiler.count == 1
+
+
+@pytest.mark.parametrize('suffix', ['.csv', '.json'])
+def test_dump(tmp_path, clock, suffix):
+    profiler = FrameProfiler(size=8, enabled=True)
+    run_frames(profiler, clock, [(1, 2, 3)] * 3)
+    path = str(tmp_path / ('frames' + suffix))
+    profiler.dump(path)
+    with open(path) as f:
+        if suffix == '.json':
+            data = json.load(f)
+            assert data['unit'] == 'ms'
+            assert data['frames']['render'] == pytest.approx([3, 3, 3])
+        else:
+            rows = list(csv.reader(f))
+            assert rows[0] == ['frame', 'input_ms', 'update_ms', 'render_ms', 'frame_ms']
+            assert len(rows) == 4 and rows[1][3] == '3.000'
+
+
+def test_from_args():
+    parser = argparse.ArgumentParser()
+    frame_profiler.add_arguments(parser)
+    assert not frame_profiler.from_args(parser.parse_args([])).enabled
+    profiler = frame_profiler.from_args(parser.parse_args(['--profile']))
+    assert profiler.enabled and profiler.overlay
+
+
+def test_overlay_draws_on_a_surface(clock):
+    pygame = pytest.importorskip('pygame')
+    pygame.font.init()
+    profiler = FrameProfiler(size=8, overlay=True)
+    run_frames(profiler, clock, [(1, 2, 3)] * 3)
+    surface = pygame.Surface((400, 200))
+    profiler.draw_overlay(surface)
+    assert len(profiler._overlay_lines) == len(frame_profiler.COLUMNS)
+    assert pygame.transform.average_color(surface)[:3] != (0, 0, 0)
@@ -0,0 +1,91 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import game_modules
+import launcher
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Nothing a game needs may be imported just to show the menu.
+HEAVY = {'pygame', 'numpy', 'psycopg2', 'sqlite3', 'multiprocessing', 'telemetry', 'snake_backend'}
+# Cumulative import time of the launcher itself, interpreter start-up excluded.
+BUDGET = 0.15
+
+
+def importtime(*args):
+    """Run `python -X importtime *args` from the repository root; return (stdout, [(cumulative s, name)])."""
+    proc = subprocess.run([sys.executable, '-X', 'importtime'] + list(args), cwd=ROOT,
+                          capture_output=True, text=True, check=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        rows.append((int(cumulative) / 1e6, name))
+    return proc.stdout, rows
+
+
+def test_list_imports_no_heavy_modules():
+    out, rows = importtime('-m', 'GAMES', '--list')
+    assert all(name in out for name in game_modules.GAME_FILES)
+
+    imported = {name.strip() for _, name in rows}
+    assert not {name.split('.')[0] for name in imported} & HEAVY
+    assert not [name for name in imported if name.startswith('game_') and name != 'game_modules']
+
+
+def test_list_import_time_within_budget():
+    _, rows = importtime('-m', 'GAMES', '--list')
+    names = [name.strip() for _, name in rows]
+    start = names.index('GAMES')
+    # top-level entries (one leading space) from the package import on
+    total = sum(seconds for seconds, name in rows[start:] if not name.startswith('  '))
+    assert 0 < total < BUDGET, f'launcher imports took {total * 1000:.1f} ms'
+
+
+def test_list_and_help(capsys):
+    assert launcher.main(['--list']) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == len(game_modules.GAME_FILES)
+    assert lines[0].startswith('1. ')
+    assert launcher.main(['--help']) == 0
+    assert 'python -m GAMES' in capsys.readouterr().out
+
+
+def test_unknown_game_returns_2(capsys):
+    assert launcher.main(['no-such-game']) == 2
+
+
+def test_run_passes_arguments_and_restores_argv(monkeypatch):
+    seen = {}
+
+    class Fake:
+        def main(self):
+            seen['argv'] = list(sys.argv)
+            return 'done'
+
+    monkeypatch.setattr(game_modules, 'load', lambda name: Fake())
+    before = list(sys.argv)
+    assert launcher.run('tetris', ['--profile']) == 'done'
+    assert seen['argv'] == [game_modules.GAME_FILES['tetris'], '--profile']
+    assert sys.argv == before
+
+
+@pytest.mark.parametrize('answers, expected', [
+    (['1'], sorted(game_modules.GAME_FILES)[0]),
+    (['zzz', 'q'], None),
+    ([], None),
+])
+def test_choose(monkeypatch, capsys, answers, expected):
+    answers = iter(answers)
+
+    def fake_input(prompt):
+        try:
+            return next(answers)
+        except StopIteration:
+            raise EOFError
+    monkeypatch.setattr('builtins.input', fake_input)
+    assert launcher.choose() == expected
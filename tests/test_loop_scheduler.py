@@ -0,0 +1,93 @@
+import time
+
+import pytest
+
+pygame = pytest.importorskip('pygame')
+
+import loop_scheduler  # noqa: E402
+from loop_scheduler import LoopScheduler  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self):
+        self.calls = []
+
+    def tick(self, fps=0):
+        self.calls.append(fps)
+        return 20
+
+
+@pytest.fixture
+def scheduler():
+    pygame.display.init()
+    pygame.display.set_mode((10, 10))
+    pygame.event.clear()
+    yield LoopScheduler(FakeClock(), 60, idle_fps=20)
+    pygame.display.quit()
+
+
+def post_key(key=pygame.K_p):
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode='', scancode=0))
+
+
+def test_focused_frame_ticks_at_fps(scheduler):
+    post_key()
+    dt, events = scheduler.next_frame()
+    assert dt == 0.02
+    assert scheduler.clock.calls == [60]
+    assert [e.type for e in events] == [pygame.KEYDOWN]
+
+
+def test_idle_frame_times_out_without_events(scheduler):
+    start = time.perf_counter()
+    dt, events = scheduler.next_frame(idle=True)
+    elapsed = time.perf_counter() - start
+    assert events == []
+    assert 0.03 < elapsed < 1.0  # idle_fps=20 -> 50 ms
+    assert scheduler.clock.calls == [0]
+
+
+def test_idle_frame_wakes_on_event(scheduler):
+    post_key()
+    post_key(pygame.K_a)
+    start = time.perf_counter()
+    _, events = scheduler.next_frame(idle=True)
+    assert time.perf_counter() - start < 0.04
+    assert [e.key for e in events] == [pygame.K_p, pygame.K_a]
+
+
+def test_wait_events_has_a_timeout(scheduler):
+    start = time.perf_counter()
+    assert scheduler.wait_events() == []
+    assert scheduler.wait_events(timeout=1) == []
+    assert time.perf_counter() - start < 1.0
+    post_key()
+    assert len(scheduler.wait_events()) == 1
+
+
+@pytest.mark.skipif(loop_scheduler._FOCUS_LOST is None, reason='needs pygame 2 window events')
+def test_focus_tracking(scheduler):
+    pygame.event.post(pygame.event.Event(loop_scheduler._FOCUS_LOST))
+    scheduler.next_frame()
+    assert not scheduler.focused
+    # unfocused frames go through the timed wait
+    scheduler.next_frame()
+    assert scheduler.clock.calls[-1] == 0
+
+    post_key()
+    scheduler.next_frame()
+    assert scheduler.focused
+
+
+def test_activeevent_focus(scheduler):
+    scheduler._observe([pygame.event.Event(pygame.ACTIVEEVENT, gain=0, state=2)])
+    assert not scheduler.focused
+    scheduler._observe([pygame.event.Event(pygame.ACTIVEEVENT, gain=1, state=1)])
+    assert not scheduler.focused
+    scheduler._observe([pygame.event.Event(pygame.ACTIVEEVENT, gain=1, state=2)])
+    assert scheduler.focused
+
+
+def test_restart_ticks_clock(scheduler):
+    scheduler.restart()
+    assert scheduler.clock.calls == [0]
@@ -0,0 +1,81 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+pygame = pytest.importorskip('pygame')
+
+import pong_audio  # noqa: E402
+
+
+@pytest.fixture
+def mixer(tmp_path, monkeypatch):
+    monkeypatch.setattr(pong_audio, 'CACHE_DIR', str(tmp_path))
+    try:
+        pygame.mixer.init(frequency=22050, size=-16, channels=2)
+    except pygame.error as exc:
+        pytest.skip(f'no mixer: {exc}')
+    yield pygame.mixer.get_init()
+    pygame.mixer.quit()
+
+
+@pytest.mark.parametrize('name', sorted(pong_audio.EFFECTS))
+def test_waveform_length_and_range(name):
+    duration, f0, f1, kind = pong_audio.EFFECTS[name]
+    wave = pong_audio._waveform(duration, f0, f1, kind, 22050)
+    assert wave.shape == (int(duration * 22050),)
+    assert np.abs(wave).max() <= 1.0
+    assert wave[0] == 0  # the attack ramp starts from silence
+
+
+@pytest.mark.parametrize('dtype', [np.int16, np.uint8, np.float32])
+def test_fill_scales_to_sample_type(dtype):
+    wave = np.array([-1.0, 0.0, 1.0])
+    mono = np.zeros(3, dtype=dtype)
+    stereo = np.zeros((3, 2), dtype=dtype)
+    pong_audio._fill(mono, wave)
+    pong_audio._fill(stereo, wave)
+    assert (stereo == mono[:, None]).all()
+    assert mono[0] < mono[1] < mono[2]
+    if dtype is np.int16:
+        assert mono[2] == int(32767 * pong_audio.VOLUME)
+    elif dtype is np.uint8:
+        assert mono[1] == 128
+
+
+def test_build_sound_requires_mixer():
+    pygame.mixer.quit()
+    with pytest.raises(RuntimeError):
+        pong_audio.build_sound('paddle')
+
+
+def test_build_sounds_writes_and_reuses_cache(mixer, tmp_path):
+    sounds = pong_audio.build_sounds()
+    assert set(sounds) == set(pong_audio.EFFECTS)
+    files = sorted(p.name for p in tmp_path.iterdir())
+    assert len(files) == len(pong_audio.EFFECTS)
+    assert not any(name.endswith('.tmp') for name in files)
+
+    fresh = pong_audio.build_sound('score', mixer, use_cache=False)
+    cached = pong_audio.build_sound('score', mixer)
+    assert cached.get_raw() == fresh.get_raw() == sounds['score'].get_raw()
+    assert any(cached.get_raw())
+
+
+def test_cache_with_wrong_size_is_rebuilt(mixer, tmp_path):
+    path = pong_audio._cache_path('wall', mixer)
+    with open(path, 'wb') as f:
+        f.write(b'\x01' * 10)
+    sound = pong_audio.build_sound('wall', mixer)
+    assert sound.get_raw() == pong_audio.build_sound('wall', mixer, use_cache=False).get_raw()
+    with open(path, 'rb') as f:
+        assert f.read() == sound.get_raw()
+
+
+def test_channel_pool_round_robin(mixer):
+    pool = pong_audio.ChannelPool(size=3)
+    sound = pong_audio.build_sound('paddle', mixer, use_cache=False)
+    used = []
+    for _ in range(7):
+        used.append(pool.next)
+        pool.play(sound)
+    assert used == [0, 1, 2, 0, 1, 2, 0]
+    assert pygame.mixer.get_num_channels() >= 3
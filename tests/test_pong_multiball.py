@@ -0,0 +1,150 @@
+import itertools
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pygame = pytest.importorskip('pygame')
+
+import pong_multiball  # noqa: E402
+
+WIDTH, HEIGHT, SIZE, SPEED = 900, 600, 16, 5
+
+
+class Paddle:
+    def __init__(self, x, y, width=10, height=100):
+        self.rect = pygame.Rect(x, y, width, height)
+
+
+def far_paddles():
+    """Paddles outside the field, so no ball touches them."""
+    return Paddle(-1000, 0), Paddle(-1000, 0)
+
+
+def make(count, seed=0):
+    return pong_multiball.MultiBall(count, WIDTH, HEIGHT, SIZE, SPEED, seed)
+
+
+def place(balls, x, y, vx, vy):
+    balls.x[:], balls.y[:] = x, y
+    balls.vx[:], balls.vy[:] = vx, vy
+    balls.speed[:] = np.hypot(vx, vy)
+
+
+def test_ranges():
+    owner, values = pong_multiball._ranges(np.array([2, 5, 7]), np.array([4, 5, 10]))
+    assert owner.tolist() == [0, 0, 2, 2, 2]
+    assert values.tolist() == [2, 3, 7, 8, 9]
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_candidate_pairs_cover_every_touching_pair_once(seed):
+    balls = make(400, seed)
+    rng = np.random.default_rng(seed)
+    # crowd some of the balls so that cells hold several of them
+    balls.x[:] = rng.uniform(-SIZE, WIDTH, balls.count)
+    balls.y[:] = rng.uniform(0, HEIGHT - SIZE, balls.count)
+    balls.x[:100] = rng.uniform(400, 440, 100)
+    balls.y[:100] = rng.uniform(300, 340, 100)
+
+    i, j = balls.candidate_pairs()
+    pairs = [tuple(sorted(p)) for p in zip(i.tolist(), j.tolist())]
+    assert all(a != b for a, b in pairs)
+    assert len(pairs) == len(set(pairs))
+
+    touching = {(a, b) for a, b in itertools.combinations(range(balls.count), 2)
+                if (balls.x[a] - balls.x[b]) ** 2 + (balls.y[a] - balls.y[b]) ** 2 < SIZE * SIZE}
+    assert touching and touching <= set(pairs)
+
+
+def test_head_on_collision_swaps_velocities():
+    balls = make(2)
+    place(balls, [400.0, 410.0], [300.0, 300.0], [3.0, -2.0], [0.0, 0.0])
+    assert balls._collide() == 1
+    assert balls.vx.tolist() == [-2.0, 3.0]
+    assert balls.vy.tolist() == [0.0, 0.0]
+    # moving apart now, so the next test does not collide them again
+    assert balls._collide() == 0
+
+
+def test_oblique_collision_conserves_momentum_and_energy():
+    balls = make(2)
+    place(balls, [400.0, 410.0], [300.0, 306.0], [4.0, -3.0], [1.0, -2.0])
+    momentum = (balls.vx.sum(), balls.vy.sum())
+    energy = (balls.vx ** 2 + balls.vy ** 2).sum()
+    assert balls._collide() == 1
+    assert (balls.vx.sum(), balls.vy.sum()) == pytest.approx(momentum)
+    assert (balls.vx ** 2 + balls.vy ** 2).sum() == pytest.approx(energy)
+
+
+def test_separating_balls_do_not_collide():
+    balls = make(2)
+    place(balls, [400.0, 410.0], [300.0, 300.0], [-3.0, 2.0], [0.0, 0.0])
+    assert balls._collide() == 0
+    assert balls.vx.tolist() == [-3.0, 2.0]
+
+
+def test_walls_flip_vy():
+    balls = make(2)
+    place(balls, [200.0, 600.0], [1.0, HEIGHT - SIZE - 1.0], [2.0, 2.0], [-3.0, 3.0])
+    points_left, points_right, hits, walls = balls.update(*far_paddles())
+    assert (points_left, points_right, hits, walls) == (0, 0, 0, 2)
+    assert balls.vy.tolist() == [3.0, -3.0]
+
+
+def test_paddle_bounce_follows_ball_rules():
+    balls = make(3)
+    left = Paddle(30, 250)
+    # centre hit, a hit near the top of the paddle, and a ball moving away from it
+    place(balls, [36.0, 36.0, 36.0], [292.0, 242.0, 292.0], [-4.0, -4.0, 4.0], [0.0, 0.0, 0.0])
+    balls.speed[:] = SPEED
+    assert balls._paddle(left.rect, balls.vx < 0) == 2
+
+    assert balls.speed.tolist() == pytest.approx([SPEED * 1.05, SPEED * 1.05, SPEED])
+    assert balls.vx[0] == pytest.approx(SPEED * 1.05)
+    assert balls.vy[0] == pytest.approx(0.0)
+    rel = (242 + SIZE / 2 - 300) / 50
+    assert balls.vx[1] == pytest.approx(SPEED * 1.05 * (1 - 0.5 * abs(rel)))
+    assert balls.vy[1] == pytest.approx(SPEED * 1.05 * rel)
+    assert balls.vx[2] == 4.0
+
+
+def test_scoring_serves_from_the_centre_towards_the_loser():
+    balls = make(3)
+    place(balls, [-SIZE - 1.0, WIDTH + 1.0, 400.0], [100.0, 200.0, 300.0], [-3.0, 3.0, 1.0], [0.0, 0.0, 0.0])
+    points_left, points_right, _, _ = balls.update(*far_paddles())
+    assert (points_left, points_right) == (1, 1)
+    assert balls.x[:2].tolist() == [(WIDTH - SIZE) / 2] * 2
+    # the ball that went out on the left is served to the right, and the other way round
+    assert balls.vx[0] > 0 and balls.vx[1] < 0
+    assert balls.speed[:2].tolist() == [SPEED, SPEED]
+
+
+def test_long_run_keeps_balls_in_play():
+    balls = make(500, seed=3)
+    left, right = Paddle(30, 250), Paddle(WIDTH - 40, 250)
+    for _ in range(300):
+        left.rect.centery = int(balls.lead_y(-1))
+        right.rect.centery = int(balls.lead_y(1))
+        balls.update(left, right)
+    assert np.isfinite(balls.vx).all() and np.isfinite(balls.vy).all()
+    assert (np.abs(balls.vx) >= pong_multiball.MIN_VX).all()
+    assert (balls.x >= -SIZE - 50).all() and (balls.x <= WIDTH + 50).all()
+
+
+def test_lead_y():
+    balls = make(3)
+    place(balls, [100.0, 700.0, 800.0], [50.0, 150.0, 250.0], [-2.0, 2.0, -2.0], [0.0, 0.0, 0.0])
+    assert balls.lead_y(1) == 150.0 + SIZE / 2
+    assert balls.lead_y(-1) == 50.0 + SIZE / 2
+    balls.vx[:] = 1.0
+    assert balls.lead_y(-1) == HEIGHT / 2
+
+
+def test_draw_blits_every_ball():
+    balls = make(2)
+    place(balls, [100.0, 500.0], [100.0, 300.0], [1.0, 1.0], [0.0, 0.0])
+    surface = pygame.Surface((WIDTH, HEIGHT))
+    balls.draw(surface)
+    for x, y in ((100, 100), (500, 300)):
+        assert surface.get_at((x + SIZE // 2, y + SIZE // 2))[:3] == (255, 255, 255)
+    assert surface.get_at((300, 200))[:3] == (0, 0, 0)
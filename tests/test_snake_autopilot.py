@@ -0,0 +1,116 @@
+import pytest
+
+import snake_autopilot
+from snake_autopilot import Autopilot, drive, hamiltonian_cycle, near_hamiltonian_cycle, parse_board
+from snake_backend import make_backend
+
+
+def check_cycle(order, rows, cols):
+    assert len(order) == len(set(order))
+    for a, b in zip(order, order[1:] + order[:1]):
+        (ra, ca), (rb, cb) = divmod(a, cols), divmod(b, cols)
+        assert abs(ra - rb) + abs(ca - cb) == 1, (a, b)
+
+
+@pytest.mark.parametrize('rows, cols', [(2, 3), (4, 4), (4, 7), (7, 4), (6, 9), (10, 20)])
+def test_hamiltonian_cycle(rows, cols):
+    order = hamiltonian_cycle(rows, cols)
+    check_cycle(order, rows, cols)
+    assert sorted(order) == list(range(rows * cols))
+
+
+@pytest.mark.parametrize('rows, cols', [(3, 3), (3, 7), (5, 3), (7, 9), (99, 199)])
+def test_near_hamiltonian_cycle_skips_the_corner(rows, cols):
+    assert hamiltonian_cycle(rows, cols) is None
+    order = near_hamiltonian_cycle(rows, cols)
+    check_cycle(order, rows, cols)
+    assert sorted(order) == list(range(1, rows * cols))
+    # (1, 1) can stand in for the corner at the same position
+    swapped = [0 if cell == cols + 1 else cell for cell in order]
+    check_cycle(swapped, rows, cols)
+
+
+def test_parse_board():
+    rows, cols, body, food = parse_board('.....\n.oo@.\n*....')
+    assert (rows, cols, food) == (3, 5, 10)
+    assert body == [6, 7, 8]
+    assert parse_board('oo@')[3] is None
+
+
+@pytest.mark.parametrize('backend_name', ['native', 'sqlite'])
+@pytest.mark.parametrize('rows, cols', [(2, 3), (4, 6), (6, 5), (8, 8)])
+def test_even_boards_are_won(backend_name, rows, cols):
+    for seed in range(3):
+        backend = make_backend(backend_name, seed=seed)
+        gid = backend.init_game(rows, cols)
+        moves, meals, status = drive(backend, gid)
+        backend.close()
+        assert status == 'won', (rows, cols, seed, moves, meals)
+        assert meals == rows * cols - 3 - 1
+
+
+@pytest.mark.parametrize('rows, cols', [(3, 3), (3, 5), (5, 7), (7, 7), (9, 9), (11, 13)])
+def test_odd_boards_are_won(rows, cols):
+    for seed in range(5):
+        backend = make_backend('native', seed=seed)
+        gid = backend.init_game(rows, cols)
+        moves, meals, status = drive(backend, gid)
+        assert status == 'won', (rows, cols, seed, moves, meals)
+
+
+@pytest.mark.parametrize('cols', [3, 4, 5, 6, 9])
+def test_one_row_boards_never_walk_into_a_wall(cols):
+    for seed in range(8):
+        backend = make_backend('native', seed=seed)
+        gid = backend.init_game(1, cols)
+        _, _, status = drive(backend, gid)
+        assert status in ('won', 'trapped')
+        # a trapped snake is left alive rather than killed by the autopilot
+        if status == 'trapped':
+            assert backend.games[gid].status != 'dead'
+            assert Autopilot(backend.get_board(gid)).choose() is None
+
+
+def test_no_food_is_reported_as_a_stall():
+    backend = make_backend('native', seed=0)
+    gid = backend.init_game(4, 6)
+    backend.games[gid].food = None
+    pilot = Autopilot(backend.get_board(gid))
+    moves, meals, status = drive(backend, gid)
+    assert (meals, status) == (0, 'stalled')
+    assert moves == pilot.stall_limit == snake_autopilot.STALL_ROUNDS * 24
+    assert backend.games[gid].status == 'ok'
+
+
+def test_tail_check_only_runs_off_the_cycle(monkeypatch):
+    checked = []
+    tail_reachable = Autopilot.tail_reachable
+
+    def spy(self, cell):
+        checked.append(self.on_cycle)
+        return tail_reachable(self, cell)
+
+    monkeypatch.setattr(Autopilot, 'tail_reachable', spy)
+    for rows, cols in ((10, 20), (9, 15)):
+        backend = make_backend('native', seed=1)
+        gid = backend.init_game(rows, cols)
+        assert drive(backend, gid)[2] == 'won'
+    assert checked == []
+    # a board one row high has no cycle, so every move is checked
+    backend = make_backend('native', seed=0)
+    drive(backend, backend.init_game(1, 6))
+    assert checked and not any(checked)
+
+
+def test_spare_is_swapped_in_for_food():
+    # 3x3 with food on the spare corner; the body covers its stand-in (1, 1), so the corner waits
+    pilot = Autopilot('*..\noo@\n...')
+    assert pilot.spare == 0
+    pilot.choose()
+    assert pilot.spare == 0
+    # with (1, 1) free the corner takes its place on the cycle
+    pilot = Autopilot('*..\n...\noo@')
+    assert pilot.on_cycle
+    pilot.choose()
+    assert pilot.spare == 4 and pilot.pos[4] == -1 and pilot.pos[0] >= 0
+    assert pilot.cycle[pilot.pos[0]] == 0
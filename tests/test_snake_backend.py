@@ -0,0 +1,74 @@
+import pytest
+
+import snake_backend
+from snake_backend import SQL_SET_FOOD, SQLiteBackend, make_backend
+
+
+@pytest.fixture(params=['sqlite', 'native'])
+def backend(request):
+    backend = make_backend(request.param, seed=0)
+    yield backend
+    backend.close()
+
+
+def test_new_game_board(backend):
+    gid = backend.init_game(3, 7)
+    lines = backend.get_board(gid).split('\n')
+    assert len(lines) == 3 and all(len(line) == 7 for line in lines)
+    assert lines[1].replace('*', '.') == '.oo@...'
+    assert sum(line.count('*') for line in lines) == 1
+
+
+def test_reverse_is_ignored_and_wall_kills(backend):
+    gid = backend.init_game(3, 6)
+    # the snake faces right; 'L' would reverse into the neck and is ignored
+    assert backend.step(gid, 'L') in ('ok', 'ate')
+    statuses = [backend.step(gid, 'R') for _ in range(6)]
+    assert statuses[-1] == 'dead'
+    assert backend.step(gid, 'U') == 'dead'
+
+
+def test_filling_the_board_wins(backend):
+    gid = backend.init_game(1, 4)
+    assert backend.get_board(gid) == 'oo@*'
+    assert backend.step(gid, 'R') == 'won'
+
+
+def test_games_are_independent(backend):
+    first, second = backend.init_game(3, 6), backend.init_game(5, 9)
+    backend.step(first, 'D')
+    assert len(backend.get_board(second).split('\n')) == 5
+
+
+def test_sqlite_growth_and_tail_following():
+    backend = SQLiteBackend(seed=1)
+    gid = backend.init_game(2, 4)
+    # body (1,0) (1,1) (1,2), head at (1,2); put the food right above the head
+    backend.conn.execute(SQL_SET_FOOD, (0, 2, gid))
+    assert backend.step(gid, 'U') == 'ate'
+    board = backend.get_board(gid)
+    assert board.count('o') + board.count('@') == 4
+    # go round the left 2x2 block; the last move enters the cell the tail is
+    # leaving in the same step, which is allowed
+    backend.conn.execute(SQL_SET_FOOD, (None, None, gid))
+    assert [backend.step(gid, d) for d in 'LLDRU'] == ['ok'] * 5
+    backend.close()
+
+
+def test_sqlite_file_uses_wal(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / 'snake.db'))
+    assert backend.conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+    backend.close()
+
+
+def test_unknown_backend_and_game():
+    with pytest.raises(ValueError):
+        make_backend('mysql')
+    backend = SQLiteBackend()
+    with pytest.raises(KeyError):
+        backend.get_board(42)
+    backend.close()
+
+
+def test_render_board():
+    assert snake_backend.render_board(2, 3, [(0, 0), (0, 1)], (1, 2)) == 'o@.\n..*'
@@ -0,0 +1,61 @@
+import random
+
+from snake_engine import SnakeEngine
+
+
+def check_invariants(game):
+    size = game.rows * game.cols
+    body = set(game.body)
+    assert len(body) == len(game.body)
+    assert [i for i in range(size) if game.occupied[i]] == sorted(body)
+    assert sorted(game.free) == sorted(set(range(size)) - body)
+    for i, cell in enumerate(game.free):
+        assert game.free_pos[cell] == i
+    assert game.food is None or game.food not in body
+
+
+def test_free_index_stays_consistent_under_random_play():
+    engine = SnakeEngine(seed=3)
+    rng = random.Random(3)
+    gid = engine.init_game(6, 9)
+    for _ in range(5000):
+        status = engine.step(gid, rng.choice('UDLR'))
+        check_invariants(engine.games[gid])
+        if status in ('dead', 'won'):
+            engine.drop_game(gid)
+            gid = engine.init_game(6, 9)
+    assert len(engine.games) == 1
+
+
+def test_growth_and_tail_following():
+    engine = SnakeEngine(seed=0)
+    gid = engine.init_game(2, 4)
+    game = engine.games[gid]
+    game.food = 2  # right above the head at (1, 2)
+    assert engine.step(gid, 'U') == 'ate'
+    assert len(game.body) == 4
+    game.food = None
+    assert [engine.step(gid, d) for d in 'LLDRU'] == ['ok'] * 5
+    check_invariants(game)
+
+
+def test_running_into_the_body_kills():
+    engine = SnakeEngine(seed=0)
+    gid = engine.init_game(4, 6)
+    game = engine.games[gid]
+    # grow to length 5 without moving the tail, then turn back into the body
+    for cell in (game.body[-1] + 1, game.body[-1] + 2):
+        game.food = cell
+        assert engine.step(gid, 'R') in ('ate', 'won')
+    game.food = None
+    assert [engine.step(gid, d) for d in 'DLU'] == ['ok', 'ok', 'dead']
+
+
+def test_many_games_in_one_engine():
+    engine = SnakeEngine(seed=1)
+    gids = [engine.init_game(5, 8) for _ in range(100)]
+    assert len(set(gids)) == 100
+    for gid in gids[::2]:
+        engine.step(gid, 'U')
+    boards = {engine.get_board(gid).replace('*', '.') for gid in gids}
+    assert len(boards) == 2
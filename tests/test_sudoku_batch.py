@@ -0,0 +1,61 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+import sudoku_batch  # noqa: E402
+from sudoku_batch import SOLVED_BY_PROPAGATION, SOLVED_BY_SEARCH, UNSOLVABLE  # noqa: E402
+
+SOLUTION = sudoku_batch.BASE_SOLUTION
+
+
+def test_load_and_to_strings_round_trip():
+    puzzles = ['..53.....8......2..7..1.5..4....53...1..7...6..32...8..6.5....9..4....3......97..', SOLUTION]
+    grids = sudoku_batch.load_puzzles(puzzles)
+    assert grids.shape == (2, 9, 9) and grids.dtype == np.uint8
+    assert sudoku_batch.to_strings(grids) == puzzles
+    with pytest.raises(ValueError):
+        sudoku_batch.load_puzzles(['123'])
+
+
+def test_validate_finds_repeats_in_rows_columns_and_boxes():
+    grids = np.repeat(sudoku_batch.load_puzzles([SOLUTION]), 4, axis=0)
+    grids[1, 0, 0], grids[1, 0, 1] = grids[1, 0, 1], grids[1, 0, 0]  # column repeats
+    grids[2, 0, :] = 0
+    grids[2, 0, 0] = grids[2, 1, 0]                                    # column and box repeat
+    grids[3, 4, 4] = 0                                                 # a blank is fine
+    assert sudoku_batch.validate(grids).tolist() == [True, False, False, True]
+    assert sudoku_batch.is_solved(grids).tolist() == [True, False, False, False]
+
+
+def test_candidates_exclude_peers():
+    grid = sudoku_batch.load_puzzles([SOLUTION])
+    grid[0, 0, 0] = 0
+    cand = sudoku_batch.candidates(grid)
+    assert cand[0, 0, 0].nonzero()[0].tolist() == [int(SOLUTION[0]) - 1]
+    assert not cand[0, 1:, :].any() and not cand[0, 0, 1:].any()
+
+
+def test_solve_random_batch():
+    grids = sudoku_batch.random_puzzles(200, blanks=55, seed=1)
+    puzzles = grids.copy()
+    solutions, status = sudoku_batch.solve(grids)
+    assert (status != UNSOLVABLE).all()
+    assert sudoku_batch.is_solved(solutions).all()
+    given = puzzles != 0
+    assert (solutions[given] == puzzles[given]).all()
+
+
+def test_hard_puzzles_need_search_and_contradictions_are_reported():
+    hard = sudoku_batch.load_puzzles(sudoku_batch.HARD_PUZZLES)
+    broken = sudoku_batch.load_puzzles(['11' + '.' * 79])
+    solutions, status = sudoku_batch.solve(np.concatenate([hard, broken]))
+    assert SOLVED_BY_SEARCH in status[:-1].tolist()
+    assert set(status[:-1].tolist()) <= {SOLVED_BY_PROPAGATION, SOLVED_BY_SEARCH}
+    assert sudoku_batch.is_solved(solutions[:-1]).all()
+    assert status[-1] == UNSOLVABLE
+
+
+def test_solve_one_matches_sudoku_rules():
+    grid = sudoku_batch.load_puzzles([sudoku_batch.HARD_PUZZLES[0]])[0]
+    assert sudoku_batch.solve_one(grid)
+    assert sudoku_batch.is_solved(grid[None]).all()
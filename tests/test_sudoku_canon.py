@@ -0,0 +1,153 @@
+import random
+import time
+
+import pytest
+
+import game_modules
+import sudoku_canon
+from sudoku_canon import PuzzleStore, canonical_form
+
+SOLUTION = '534678912672195348198342567859761423426853791713924856961537284287419635345286179'
+PUZZLES = [
+    '530070000600195000098000060800060003400803001700020006060000280000419005000080079',
+    '8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..',
+    '..53.....8......2..7..1.5..4....53...1..7...6..32...8..6.5....9..4....3......97..',
+    '000000907000420180000705026100904000050000040000507009920108000034059000507000000',
+]
+# mostly blank grids, where most transformations tie for long
+SPARSE = [
+    '0' * 81,
+    '5' + '0' * 80,
+    '0' * 40 + '7' + '0' * 40,
+    '000000000000000000000000000050000000400000090000000006061030000007010030000280070',
+]
+# seconds per grid; each of these took from 0.1 s to minutes before blank columns were grouped
+TIME_LIMIT = 0.1
+
+
+def cells(grid):
+    return tuple(int(ch) if ch.isdigit() else 0 for ch in grid)
+
+
+def shuffle(grid, rng):
+    """Apply a random Sudoku symmetry and digit relabeling; returns an 81-character string."""
+    src = cells(grid)
+
+    def order():
+        return [b * 3 + i for b in rng.sample(range(3), 3) for i in rng.sample(range(3), 3)]
+    rows, cols = order(), order()
+    digits = [0] + rng.sample(range(1, 10), 9)
+    out = [digits[src[r * 9 + c]] for r in rows for c in cols]
+    if rng.random() < 0.5:
+        out = [out[c * 9 + r] for r in range(9) for c in range(9)]
+    return ''.join(map(str, out))
+
+
+def first_appearance(grid):
+    labels = {0: 0}
+    return tuple(labels.setdefault(v, len(labels)) for v in cells(grid))
+
+
+@pytest.mark.parametrize('grid', PUZZLES + [SOLUTION])
+def test_canonical_form_is_invariant_and_minimal(grid):
+    rng = random.Random(grid)
+    canonical, _ = canonical_form(grid)
+    assert canonical_form(''.join(map(str, canonical)))[0] == canonical
+    for _ in range(20):
+        other = shuffle(grid, rng)
+        assert canonical_form(other)[0] == canonical
+        # any member of the class, with its digits relabeled, is at least the canonical grid
+        assert first_appearance(other) >= canonical
+
+
+def generated(seed):
+    state = random.getstate()
+    random.seed(seed)
+    try:
+        grid = game_modules.load('sudoku').generate_sudoku()
+    finally:
+        random.setstate(state)
+    return ''.join(str(v) for row in grid for v in row)
+
+
+def timed_canonical_form(grid):
+    start = time.perf_counter()
+    canonical, _ = canonical_form(grid)
+    assert time.perf_counter() - start < TIME_LIMIT
+    return canonical
+
+
+@pytest.mark.parametrize('grid', SPARSE + [generated(seed) for seed in range(6)])
+def test_sparse_grids_are_fast_invariant_and_minimal(grid):
+    rng = random.Random(grid)
+    canonical = timed_canonical_form(grid)
+    assert canonical.count(0) == grid.count('0')
+    for _ in range(10):
+        other = shuffle(grid, rng)
+        assert timed_canonical_form(other) == canonical
+        assert first_appearance(other) >= canonical
+
+
+def test_near_empty_canonical_forms():
+    assert canonical_form(SPARSE[0])[0] == (0,) * 81
+    # a single clue ends up in the last cell
+    assert canonical_form(SPARSE[1])[0] == (0,) * 80 + (1,)
+    assert canonical_form(SPARSE[2])[0] == (0,) * 80 + (1,)
+
+
+def test_full_grid_starts_with_first_row_in_order():
+    canonical, _ = canonical_form(SOLUTION)
+    assert canonical[:9] == tuple(range(1, 10))
+    assert sorted(canonical) == sorted(cells(SOLUTION))
+
+
+@pytest.mark.parametrize('grid', PUZZLES + SPARSE + [SOLUTION])
+def test_transform_maps_grid_to_canonical_and_back(grid):
+    canonical, transform = canonical_form(grid)
+    transpose, rows, columns, labels = transform
+    assert sorted(rows) == list(range(9)) and sorted(columns) == list(range(9))
+    assert sorted(labels[1:]) == list(range(1, 10)) and labels[0] == 0
+    assert sudoku_canon.apply_transform(grid, transform) == canonical
+    back = sudoku_canon.invert_transform(canonical, transform)
+    assert tuple(v for row in back for v in row) == cells(grid)
+
+
+def test_distinct_puzzles_differ():
+    forms = {canonical_form(p)[0] for p in PUZZLES}
+    assert len(forms) == len(PUZZLES)
+
+
+def test_rejects_wrong_size():
+    with pytest.raises(ValueError):
+        canonical_form('123')
+
+
+def test_store_deduplicates_equivalent_puzzles():
+    rng = random.Random(1)
+    store = PuzzleStore()
+    assert store.add(PUZZLES[0])
+    assert not store.add(shuffle(PUZZLES[0], rng))
+    assert store.add_many([PUZZLES[1], shuffle(PUZZLES[1], rng), PUZZLES[2]]) == 2
+    assert len(store) == 3
+    assert shuffle(PUZZLES[2], rng) in store
+    assert PUZZLES[3] not in store
+    store.close()
+
+
+def test_store_shares_solutions_across_the_class(tmp_path):
+    puzzle = PUZZLES[0]
+    solution = [[int(ch) for ch in SOLUTION[r * 9:r * 9 + 9]] for r in range(9)]
+    store = PuzzleStore(str(tmp_path / 'puzzles.db'))
+    assert store.solution(puzzle) is None
+    store.put_solution(puzzle, solution)
+    assert store.solution(puzzle) == solution
+
+    # an equivalent puzzle gets the solution in its own orientation and labels
+    rng = random.Random(7)
+    state = rng.getstate()
+    other = shuffle(puzzle, rng)
+    rng.setstate(state)
+    other_solution = shuffle(SOLUTION, rng)
+    got = store.solution(other)
+    assert tuple(v for row in got for v in row) == cells(other_solution)
+    store.close()
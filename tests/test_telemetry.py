@@ -0,0 +1,130 @@
+import argparse
+import json
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+import telemetry  # noqa: E402
+
+
+def test_round_trip_every_schema(tmp_path):
+    writers = {game: telemetry.TelemetryWriter(tmp_path, game) for game in telemetry.SCHEMAS}
+    writers['tetris'].tetris(telemetry.TETRIS_PLACE, 3, -1, 18, 2, 0, 1200, 4)
+    writers['pong'].pong(telemetry.PONG_FRAME, 450, -20, 5.5, -2.25, 3, 7)
+    writers['snake'].snake(telemetry.SNAKE_STEP, 42, telemetry.SNAKE_DIRECTIONS['L'], telemetry.SNAKE_STATUS['ate'])
+    writers['sudoku'].sudoku(telemetry.SUDOKU_INVALID, 8, 0, 9)
+    for writer in writers.values():
+        writer.close()
+
+    expected = {
+        'tetris': {'event': telemetry.TETRIS_PLACE, 'shape': 3, 'x': -1, 'y': 18, 'rotation': 2,
+                   'lines': 0, 'score': 1200, 'level': 4},
+        'pong': {'event': telemetry.PONG_FRAME, 'x': 450, 'y': -20, 'vx': 5.5, 'vy': -2.25,
+                 'score_left': 3, 'score_right': 7},
+        'snake': {'event': telemetry.SNAKE_STEP, 'game': 42, 'direction': 2, 'status': 1},
+        'sudoku': {'event': telemetry.SUDOKU_INVALID, 'row': 8, 'col': 0, 'num': 9},
+    }
+    for game, values in expected.items():
+        cols = telemetry.read_columns(tmp_path, game)
+        assert cols['session'].tolist() == [1]
+        assert cols['t'][0] >= 0
+        for name, value in values.items():
+            assert cols[name].tolist() == [value], (game, name)
+
+
+def test_scores_are_clamped(tmp_path):
+    pong = telemetry.TelemetryWriter(tmp_path, 'pong')
+    pong.pong(telemetry.PONG_SCORE, 0, 0, 0.0, 0.0, 256, 1000)
+    pong.pong(telemetry.PONG_SCORE, 0, 0, 0.0, 0.0, 255, 254)
+    pong.close()
+    tetris = telemetry.TelemetryWriter(tmp_path, 'tetris')
+    tetris.tetris(telemetry.TETRIS_CLEAR, 0, 0, 0, 0, 4, 1 << 40, 70000)
+    # pieces on boards wider or taller than 127 cells
+    tetris.tetris(telemetry.TETRIS_PLACE, 1, 130, 500, 0, 0, 10, 1)
+    tetris.tetris(telemetry.TETRIS_PLACE, 1, 4, -2, 0, 0, 10, 1)
+    tetris.close()
+    snake = telemetry.TelemetryWriter(tmp_path, 'snake')
+    snake.snake(telemetry.SNAKE_STEP, 1 << 33, 0, 0)
+    snake.close()
+
+    cols = telemetry.read_columns(tmp_path, 'pong')
+    assert cols['score_left'].tolist() == [255, 255]
+    assert cols['score_right'].tolist() == [255, 254]
+    cols = telemetry.read_columns(tmp_path, 'tetris')
+    assert cols['score'].tolist() == [telemetry.U4_MAX, 10, 10]
+    assert cols['level'].tolist() == [telemetry.U2_MAX, 1, 1]
+    assert cols['x'].tolist() == [0, 130, 4]
+    assert cols['y'].tolist() == [0, 500, -2]
+    assert telemetry.read_columns(tmp_path, 'snake')['game'].tolist() == [telemetry.U4_MAX]
+
+
+def test_grows_and_appends_sessions(tmp_path):
+    writer = telemetry.TelemetryWriter(tmp_path, 'sudoku', capacity=4)
+    for i in range(10):
+        writer.sudoku(telemetry.SUDOKU_MOVE, i % 9, 0, 1)
+    writer.close()
+    writer = telemetry.TelemetryWriter(tmp_path, 'sudoku', capacity=4)
+    writer.sudoku(telemetry.SUDOKU_MOVE, 5, 5, 5)
+    writer.close()
+
+    cols = telemetry.read_columns(tmp_path, 'sudoku')
+    assert cols['row'].tolist() == [i % 9 for i in range(10)] + [5]
+    assert cols['session'].tolist() == [1] * 10 + [2]
+    with open(tmp_path / 'sudoku' / 'meta.json') as f:
+        meta = json.load(f)
+    assert meta['rows'] == 11 and meta['sessions'] == 2
+
+
+def test_readers_see_only_committed_rows(tmp_path):
+    writer = telemetry.TelemetryWriter(tmp_path, 'snake', flush_interval=3600)
+    for _ in range(10):
+        writer.snake(telemetry.SNAKE_STEP, 1, 0, 0)
+    assert len(telemetry.read_columns(tmp_path, 'snake')['game']) == 0
+    writer.flush()
+    assert len(telemetry.read_columns(tmp_path, 'snake')['game']) == 10
+    writer.close()
+
+
+def test_writers_after_close_do_nothing(tmp_path):
+    writer = telemetry.TelemetryWriter(tmp_path, 'pong')
+    writer.pong(telemetry.PONG_FRAME, 1, 2, 0.0, 0.0, 0, 0)
+    writer.close()
+    writer.pong(telemetry.PONG_FRAME, 1, 2, 0.0, 0.0, 0, 0)
+    assert len(telemetry.read_columns(tmp_path, 'pong')['x']) == 1
+
+
+def test_schema_mismatch_and_unknown_game(tmp_path):
+    telemetry.TelemetryWriter(tmp_path, 'pong').close()
+    meta_path = tmp_path / 'pong' / 'meta.json'
+    meta = json.loads(meta_path.read_text())
+    meta['columns'] = meta['columns'][:-1]
+    meta_path.write_text(json.dumps(meta))
+    with pytest.raises(ValueError, match='different schema'):
+        telemetry.TelemetryWriter(tmp_path, 'pong')
+    with pytest.raises(ValueError, match='no telemetry schema'):
+        telemetry.TelemetryWriter(tmp_path, 'chess')
+
+
+def test_from_args(tmp_path):
+    parser = argparse.ArgumentParser()
+    telemetry.add_arguments(parser)
+    assert telemetry.from_args(parser.parse_args([]), 'pong') is telemetry.NULL_WRITER
+    for write in ('tetris', 'pong', 'snake', 'sudoku', 'flush', 'close'):
+        getattr(telemetry.NULL_WRITER, write)(0, 0, 0, 0)
+
+    writer = telemetry.from_args(parser.parse_args(['--telemetry', str(tmp_path)]), 'snake')
+    assert isinstance(writer, telemetry.TelemetryWriter)
+    writer.close()
+
+
+def test_summary(tmp_path, capsys):
+    writer = telemetry.TelemetryWriter(tmp_path, 'tetris')
+    for shape in (0, 1, 1):
+        writer.tetris(telemetry.TETRIS_PLACE, shape, 4, 10, 0, 0, 0, 1)
+    writer.tetris(telemetry.TETRIS_CLEAR, 0, 0, 0, 0, 2, 100, 1)
+    writer.close()
+    telemetry.main(['summary', str(tmp_path)])
+    out = capsys.readouterr().out
+    assert 'tetris: 4 records, 1 sessions' in out
+    assert '3 pieces placed, line clears by size (1-4): [0, 1, 0, 0]' in out
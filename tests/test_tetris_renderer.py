@@ -0,0 +1,142 @@
+import random
+
+import pytest
+
+pygame = pytest.importorskip('pygame')
+
+import tetris_renderer  # noqa: E402
+from tetris_renderer import EMPTY, GRID_LINE, BoardRenderer, blit_batch, shaded_tile  # noqa: E402
+
+COLORS = [(0, 240, 240), (0, 0, 240), (240, 160, 0), (240, 240, 0), (0, 240, 0), (160, 0, 240), (240, 0, 0)]
+COLS, ROWS, CELL = 6, 8, 12
+ORIGIN = (5, 7)
+
+
+def rgb(surface, pos):
+    return tuple(surface.get_at(pos))[:3]
+
+
+def screen():
+    return pygame.Surface((COLS * CELL + 20, ROWS * CELL + 20))
+
+
+def random_grid(rng, fill=0.4):
+    return [[rng.choice(COLORS) if rng.random() < fill else EMPTY for _ in range(COLS)] for _ in range(ROWS)]
+
+
+def test_shaded_tile():
+    tile = shaded_tile((200, 100, 0), 16)
+    assert rgb(tile, (8, 8)) == (200, 100, 0)
+    assert rgb(tile, (8, 0)) == tetris_renderer._lighter((200, 100, 0))
+    assert rgb(tile, (8, 15)) == tetris_renderer._darker((200, 100, 0))
+    lined = shaded_tile((200, 100, 0), 16, GRID_LINE)
+    assert rgb(lined, (8, 0)) == rgb(lined, (0, 8)) == GRID_LINE
+    assert rgb(lined, (8, 8)) == (200, 100, 0)
+
+
+def test_empty_board_has_grid_lines():
+    surface = screen()
+    BoardRenderer(COLS, ROWS, CELL, ORIGIN, COLORS).draw_board(surface, [[EMPTY] * COLS for _ in range(ROWS)])
+    x0, y0 = ORIGIN
+    for i in range(ROWS + 1):
+        assert rgb(surface, (x0 + CELL // 2, y0 + i * CELL)) == GRID_LINE
+    for j in range(COLS + 1):
+        assert rgb(surface, (x0 + j * CELL, y0 + CELL // 2)) == GRID_LINE
+    assert rgb(surface, (x0 + CELL // 2, y0 + CELL // 2)) == EMPTY
+    # nothing is drawn outside the board and its closing lines
+    assert rgb(surface, (x0 + COLS * CELL + 1, y0)) == (0, 0, 0)
+
+
+def test_cells_show_their_colour_and_keep_the_grid():
+    surface = screen()
+    grid = [[EMPTY] * COLS for _ in range(ROWS)]
+    grid[2][3] = COLORS[4]
+    grid[7][0] = (1, 2, 3)     # not in the palette
+    BoardRenderer(COLS, ROWS, CELL, ORIGIN, COLORS).draw_board(surface, grid)
+    x0, y0 = ORIGIN
+    assert rgb(surface, (x0 + 3 * CELL + CELL // 2, y0 + 2 * CELL + CELL // 2)) == COLORS[4]
+    assert rgb(surface, (x0 + 3 * CELL + CELL // 2, y0 + 2 * CELL)) == GRID_LINE
+    assert rgb(surface, (x0 + CELL // 2, y0 + 7 * CELL + CELL // 2)) == (1, 2, 3)
+
+
+def test_incremental_updates_match_a_fresh_draw():
+    rng = random.Random(5)
+    renderer = BoardRenderer(COLS, ROWS, CELL, ORIGIN, COLORS)
+    surface = screen()
+    for _ in range(30):
+        grid = random_grid(rng)
+        surface.fill((0, 0, 0))
+        renderer.draw_board(surface, grid)
+        fresh = screen()
+        BoardRenderer(COLS, ROWS, CELL, ORIGIN, COLORS).draw_board(fresh, grid)
+        assert pygame.image.tobytes(surface, 'RGB') == pygame.image.tobytes(fresh, 'RGB')
+        assert renderer.shown == grid
+
+
+def test_only_changed_cells_are_redrawn(monkeypatch):
+    renderer = BoardRenderer(COLS, ROWS, CELL, ORIGIN, COLORS)
+    surface = screen()
+    grid = random_grid(random.Random(1))
+    renderer.draw_board(surface, grid)
+    batches = []
+    monkeypatch.setattr(tetris_renderer, 'blit_batch', lambda target, pairs: batches.append(len(pairs)))
+    renderer.draw_board(surface, grid)
+    grid[0][0] = COLORS[0] if grid[0][0] != COLORS[0] else EMPTY
+    grid[5][2] = COLORS[1] if grid[5][2] != COLORS[1] else EMPTY
+    renderer.draw_board(surface, grid)
+    assert batches == [2]
+
+
+@pytest.fixture
+def display():
+    # Surface.convert needs an initialized display, as in the game
+    pygame.display.init()
+    yield
+    pygame.display.quit()
+
+
+def test_new_pixel_format_rebuilds_the_board(display):
+    rng = random.Random(2)
+    renderer = BoardRenderer(COLS, ROWS, CELL, ORIGIN, COLORS)
+    grid = random_grid(rng)
+    renderer.draw_board(screen(), grid)
+    other = pygame.Surface((COLS * CELL + 20, ROWS * CELL + 20), 0, 24)
+    renderer.draw_board(other, grid)
+    assert renderer.board.get_bitsize() == 24
+    reference = screen()
+    BoardRenderer(COLS, ROWS, CELL, ORIGIN, COLORS).draw_board(reference, grid)
+    assert pygame.image.tobytes(other, 'RGB') == pygame.image.tobytes(reference, 'RGB')
+
+
+def test_draw_cells_has_no_grid_lines():
+    surface = screen()
+    renderer = BoardRenderer(COLS, ROWS, CELL, ORIGIN, COLORS)
+    renderer.draw_cells(surface, [(0, 0), (1, 0), (1, 1)], COLORS[2], 10, 20)
+    assert rgb(surface, (10 + CELL // 2, 20 + CELL // 2)) == COLORS[2]
+    assert rgb(surface, (10 + CELL + CELL // 2, 20 + CELL + CELL // 2)) == COLORS[2]
+    assert rgb(surface, (10 + CELL // 2, 20)) == tetris_renderer._lighter(COLORS[2])
+    assert rgb(surface, (10 + CELL // 2, 20 + CELL + CELL // 2)) == (0, 0, 0)
+
+
+def test_blit_batch_prefers_fblits():
+    class Target:
+        def __init__(self):
+            self.calls = []
+
+        def fblits(self, pairs):
+            self.calls.append(('fblits', pairs))
+
+        def blits(self, pairs, doreturn):
+            self.calls.append(('blits', pairs))
+
+    target = Target()
+    blit_batch(target, [1])
+    assert target.calls == [('fblits', [1])]
+    surface = pygame.Surface((4, 4))
+    blit_batch(surface, [(shaded_tile((9, 9, 9), 2), (1, 1))])
+    assert rgb(surface, (2, 2)) == tetris_renderer._darker((9, 9, 9))
+
+
+def test_benchmark_runs():
+    batched, per_rect = tetris_renderer.benchmark(cols=6, rows=8, cell_size=10, frames=5)
+    assert batched > 0 and per_rect > 0
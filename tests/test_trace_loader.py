@@ -0,0 +1,101 @@
+import sqlite3
+
+import pytest
+
+import trace_loader
+from trace_loader import TraceLoader
+
+
+@pytest.fixture
+def loader():
+    conn = sqlite3.connect(':memory:')
+    loader = TraceLoader(conn, batch_size=7)
+    loader.create_tables()
+    yield loader
+    conn.close()
+
+
+def test_jug_traces_round_trip(loader):
+    count = loader.load('Buckets', trace_loader.jug_trace_rows([(5, 3, 4), (7, 4, 5)]))
+    rows = loader.conn.execute('SELECT run_id, step, action, bucket5, bucket3 FROM Buckets '
+                               'ORDER BY run_id, step').fetchall()
+    assert count == len(rows)
+    assert rows[5] == (0, 6, 'Transfer 5L to 3L', 4, 3)
+    assert {r[0] for r in rows} == {0, 1}
+
+
+def test_batches_cover_every_row(loader):
+    count = loader.load('Buckets', trace_loader.synthetic_jug_rows(100))
+    assert count >= 100
+    assert loader.conn.execute('SELECT COUNT(*) FROM Buckets').fetchone()[0] == count
+
+
+def test_row_by_row_baseline_matches_bulk(loader):
+    rows = list(trace_loader.synthetic_jug_rows(30))
+    loader.load_row_by_row('Buckets', rows)
+    stored = loader.conn.execute('SELECT * FROM Buckets ORDER BY run_id, step').fetchall()
+    assert stored == sorted(rows, key=lambda r: (r[0], r[1]))
+
+
+def test_lookup_uses_bucket5_index(loader):
+    loader.load('Buckets', trace_loader.synthetic_jug_rows(500))
+    loader.create_indexes(['Buckets'])
+    plan = loader.conn.execute('EXPLAIN QUERY PLAN SELECT * FROM Buckets WHERE bucket5 = 4').fetchall()
+    assert any('idx_Buckets_bucket5' in row[-1] for row in plan)
+    hits = loader.conn.execute('SELECT COUNT(*) FROM Buckets WHERE bucket5 = 4').fetchone()[0]
+    assert hits > 0
+
+
+def test_sudoku_and_replay_rows(loader):
+    puzzle = [[0] * 9 for _ in range(9)]
+    solution = [[(r * 3 + r // 3 + c) % 9 + 1 for c in range(9)] for r in range(9)]
+    loader.load('SudokuSolutions', trace_loader.sudoku_rows([(puzzle, solution)]))
+    loader.load('GameReplays', trace_loader.replay_rows('snake', 1, [(0, 'step', 3), (1, 'ate', 1)]))
+    stored = loader.conn.execute('SELECT puzzle, solution FROM SudokuSolutions').fetchone()
+    assert stored[0] == '0' * 81 and stored[1][:9] == '123456789'
+    assert loader.conn.execute('SELECT COUNT(*) FROM GameReplays').fetchone()[0] == 2
+
+
+def test_existing_table_with_another_layout_is_refused():
+    conn = sqlite3.connect(':memory:')
+    # PUZZLE_GAME's own Buckets table
+    conn.execute('CREATE TABLE Buckets (step INT PRIMARY KEY, action VARCHAR(50), bucket5 INT, bucket3 INT)')
+    loader = TraceLoader(conn)
+    with pytest.raises(ValueError, match='already exists'):
+        loader.create_tables(['Buckets'])
+    loader.create_tables(['SudokuSolutions'])
+    assert loader.columns('Buckets') == ['step', 'action', 'bucket5', 'bucket3']
+    conn.close()
+
+
+def test_default_tables_leave_out_the_benchmark_table(loader):
+    assert loader.columns('Buckets')
+    assert loader.columns(trace_loader.BENCH_TABLE) == []
+
+
+def test_benchmark_uses_its_own_table(tmp_path, monkeypatch, capsys):
+    path = str(tmp_path / 'bench.db')
+    # keep the file around: the benchmark removes its scratch file before starting
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE Buckets (step INT PRIMARY KEY, action VARCHAR(50), bucket5 INT, bucket3 INT)')
+    conn.execute("INSERT INTO Buckets VALUES (1, 'Fill 5L', 5, 0)")
+    conn.commit()
+    conn.close()
+    monkeypatch.setattr(trace_loader.os, 'remove', lambda p: None)
+
+    trace_loader.benchmark(300, 30, path=path)
+    assert 'bulk load:' in capsys.readouterr().out
+    conn = sqlite3.connect(path)
+    assert conn.execute('SELECT * FROM Buckets').fetchall() == [(1, 'Fill 5L', 5, 0)]
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' "
+                                             "AND name NOT LIKE 'sqlite_%'")}
+    assert tables == {'Buckets'}
+
+    conn.execute('CREATE TABLE bench_buckets (x INT)')
+    conn.commit()
+    conn.close()
+    with pytest.raises(ValueError, match='already exists'):
+        trace_loader.benchmark(300, 30, path=path)
+    conn = sqlite3.connect(path)
+    assert conn.execute('SELECT COUNT(*) FROM bench_buckets').fetchone() == (0,)
+    conn.close()
@@ -0,0 +1,95 @@
+import pytest
+
+from ttt_mcts import DRAW, MCTS, O, X, Board, is_win
+
+
+def check_tree(tree):
+    """Every expanded node holds the visits of its children (plus the playout that first reached
+    it), and every stored move is legal."""
+    parent, move, first, count, visits = tree.parent, tree.move, tree.first_child, tree.n_children, tree.visits
+    assert parent[0] == -1
+    reached = 1
+    stack = [(0, tree.board.copy())]
+    while stack:
+        node, board = stack.pop()
+        n = count[node]
+        if n <= 0:
+            continue
+        children = range(first[node], first[node] + n)
+        assert visits[node] - sum(visits[c] for c in children) in (0, 1)
+        assert sorted(move[c] for c in children) == board.legal_moves()
+        for c in children:
+            assert parent[c] == node
+            child_board = board.copy()
+            child_board.play(move[c])
+            stack.append((c, child_board))
+        reached += n
+    assert reached == tree.size
+
+
+def test_is_win_checks_lines_through_the_last_move():
+    board = bytearray(16)
+    for cell in (0, 5, 10):
+        board[cell] = X
+    assert is_win(board, 4, 3, 10, X)
+    assert not is_win(board, 4, 4, 10, X)
+    board[3] = board[6] = board[9] = O
+    assert is_win(board, 4, 3, 6, O)
+
+
+def test_board_play_and_draw():
+    board = Board(3)
+    for cell in (0, 1, 2, 4, 3, 5, 7, 6, 8):
+        board.play(cell)
+    assert board.winner == DRAW
+    with pytest.raises(ValueError):
+        board.play(0)
+
+
+def test_advance_repro_keeps_a_valid_tree():
+    tree = MCTS(Board(4, 3), seed=0)
+    visits = tree.search(iterations=20000)
+    tree.advance(max(visits, key=visits.get))
+    visits = tree.search(iterations=20000)
+    assert tree.visits[0] - sum(visits.values()) in (0, 1)
+    check_tree(tree)
+
+
+@pytest.mark.parametrize('size, k', [(3, 3), (4, 3), (5, 4)])
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_search_advance_search(size, k, seed):
+    tree = MCTS(Board(size, k), seed=seed, capacity=200_000)
+    for _ in range(3):
+        visits = tree.search(iterations=4000)
+        if not visits:
+            break
+        before = max(visits.values())
+        move = max(visits, key=visits.get)
+        tree.advance(move)
+        check_tree(tree)
+        # the kept subtree is the one that was searched
+        assert tree.visits[0] == before
+    check_tree(tree)
+
+
+def test_advance_on_unvisited_move_resets():
+    tree = MCTS(Board(3), seed=0)
+    tree.advance(4)
+    assert tree.size == 1 and tree.visits[0] == 0
+    tree.search(iterations=640)
+    check_tree(tree)
+
+
+def test_takes_an_immediate_win():
+    board = Board(3)
+    for cell in (0, 3, 1, 4):
+        board.play(cell)
+    visits = MCTS(board, seed=0).search(iterations=2000)
+    assert max(visits, key=visits.get) == 2
+
+
+def test_capacity_limit_is_respected():
+    tree = MCTS(Board(5, 4), seed=0, capacity=500)
+    tree.search(iterations=2000)
+    assert tree.size <= 500
+    check_tree(tree)
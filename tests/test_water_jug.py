@@ -0,0 +1,65 @@
+import re
+
+import pytest
+
+import water_jug
+
+
+def replay(capacities, rows):
+    """Apply each row's action to the previous volumes and check it gives the row's volumes."""
+    vol = [0] * len(capacities)
+    for step, (number, action, *after) in enumerate(rows, start=1):
+        assert number == step
+        caps = [int(c) for c in re.findall(r'(\d+)L', action)]
+        if action.startswith('Fill'):
+            i = capacities.index(caps[0])
+            vol[i] = capacities[i]
+        elif action.startswith('Empty'):
+            vol[capacities.index(caps[0])] = 0
+        else:
+            i, j = capacities.index(caps[0]), capacities.index(caps[1])
+            amount = min(vol[i], capacities[j] - vol[j])
+            assert amount > 0
+            vol[i] -= amount
+            vol[j] += amount
+        assert vol == after
+    return vol
+
+
+def test_classic_puzzle_matches_puzzle_game():
+    rows = water_jug.solve([5, 3], 4)
+    assert len(rows) == 6
+    assert rows[-1][2:] == (4, 3)
+    assert water_jug.column_names([5, 3]) == ['step', 'action', 'bucket5', 'bucket3']
+
+
+@pytest.mark.parametrize('capacities, target, length', [
+    ([3, 5], 4, 6),
+    ([4, 9], 6, 8),
+    ([2, 6], 6, 1),
+    ([4, 7, 11, 13], 9, 2),
+])
+def test_trace_is_legal_and_shortest(capacities, target, length):
+    rows = water_jug.solve(capacities, target)
+    assert len(rows) == length
+    assert target in replay(capacities, rows)
+
+
+def test_large_capacities():
+    rows = water_jug.solve([127, 71], 1)
+    assert 1 in replay([127, 71], rows)
+
+
+@pytest.mark.parametrize('capacities, target', [([6, 4], 3), ([5, 3], 6), ([4], 2)])
+def test_unreachable_targets_are_rejected(capacities, target):
+    assert not water_jug.is_reachable(capacities, target)
+    with pytest.raises(ValueError):
+        water_jug.solve(capacities, target)
+
+
+def test_zero_target_needs_no_steps():
+    assert water_jug.solve([5, 3], 0) == []
+
+
+def test_duplicate_capacities_get_distinct_columns():
+    assert water_jug.column_names([3, 3]) == ['step', 'action', 'bucket3_1', 'bucket3_2']
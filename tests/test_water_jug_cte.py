@@ -0,0 +1,80 @@
+import os
+
+import pytest
+
+import water_jug_cte
+from water_jug import solve
+from water_jug_cte import SQLiteSolver, _check
+
+
+@pytest.fixture
+def sqlite_solver():
+    solver = SQLiteSolver()
+    yield solver
+    solver.close()
+
+
+@pytest.mark.parametrize('a, b, target', water_jug_cte.PUZZLES[:7] + [(4, 9, 6), (7, 5, 7)])
+def test_sqlite_matches_client_and_replays(sqlite_solver, a, b, target):
+    rows = sqlite_solver.solve(a, b, target)
+    _check(rows, solve([a, b], target), a, b, target)
+
+
+@pytest.mark.parametrize('a, b, target', [(6, 4, 3), (5, 3, 7), (2, 4, 1)])
+def test_sqlite_unreachable_target_returns_nothing(sqlite_solver, a, b, target):
+    assert sqlite_solver.solve(a, b, target) == []
+
+
+def test_sqlite_zero_target_needs_no_moves(sqlite_solver):
+    assert sqlite_solver.solve(5, 3, 0) == []
+
+
+def test_sqlite_plan_shows_the_recursive_step(sqlite_solver):
+    assert any('RECURSIVE STEP' in line for line in sqlite_solver.plan(5, 3, 4))
+
+
+GOOD = [(1, 'Fill 5L', 5, 0), (2, 'Transfer 5L to 3L', 2, 3), (3, 'Empty 3L', 2, 0),
+        (4, 'Transfer 5L to 3L', 0, 2), (5, 'Fill 5L', 5, 2), (6, 'Transfer 5L to 3L', 4, 3)]
+
+
+def test_check_accepts_a_valid_trace():
+    _check(GOOD, solve([5, 3], 4), 5, 3, 4)
+
+
+@pytest.mark.parametrize('index, row, message', [
+    (1, (2, 'Transfer 5L to 3L', 3, 2), 'gives'),        # wrong volumes
+    (2, (3, 'Empty 3L', 2, 3), 'gives'),                 # claims the empty did nothing
+    (3, (4, 'Pour 5L', 0, 2), 'unknown action'),
+    (4, (7, 'Fill 5L', 5, 2), 'step 7'),
+    (0, (1, 'Empty 5L', 0, 0), 'does nothing'),          # illegal from empty jugs
+])
+def test_check_rejects_bad_steps(index, row, message):
+    rows = list(GOOD)
+    rows[index] = row
+    with pytest.raises(AssertionError, match=message):
+        _check(rows, solve([5, 3], 4), 5, 3, 4)
+
+
+def test_check_rejects_wrong_length_and_wrong_end():
+    with pytest.raises(AssertionError, match='steps in SQL'):
+        _check(GOOD[:5], solve([5, 3], 4), 5, 3, 4)
+    with pytest.raises(AssertionError, match='without 1L'):
+        _check(GOOD, GOOD, 5, 3, 1)
+
+
+def test_compare_prints_a_table(sqlite_solver, capsys):
+    water_jug_cte.compare([sqlite_solver], puzzles=water_jug_cte.PUZZLES[:3])
+    out = capsys.readouterr().out
+    assert '13L+7L' in out and 'sqlite plan for 5L+3L' in out
+
+
+@pytest.mark.skipif(not os.environ.get('WATER_JUG_POSTGRES'), reason='set WATER_JUG_POSTGRES to a DSN')
+def test_postgres_matches_client_and_replays():
+    pytest.importorskip('psycopg2')
+    solver = water_jug_cte.PostgresSolver(os.environ['WATER_JUG_POSTGRES'])
+    try:
+        for a, b, target in water_jug_cte.PUZZLES[:6]:
+            _check(solver.solve(a, b, target), solve([a, b], target), a, b, target)
+        assert solver.solve(6, 4, 3) == []
+    finally:
+        solver.close()